@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Concurrent scanning for the requests-based scrapers: a thread pool of
+blocking requests calls, scheduled and paced from an asyncio event loop.
+
+gowild_fast.scan_routes / gowild_fast_bypass.scan_routes sleep 12-25 s before
+every request and then block on the response, one route at a time. Here every
+route is an asyncio task, but the HTTP itself is not async: each fetch is the
+scanners' own blocking get_flight_data (and with it the journeys parser and
+ROUTE_CACHE) run on a ThreadPoolExecutor via run_in_executor, so a result here
+is exactly what the serial loop would find. The event loop only decides when
+a fetch may start: a semaphore keeps at most `concurrency` on the pool, and
+all of them draw from a single RateBudget that sets the aggregate pace. The
+old loops' adaptive backoff is kept but made global: a 403/captcha on any
+route widens the shared interval by 10 s (capped at 60 s), every good
+response narrows it by 2 s back down to the base delay.
+
+requests.Session is not documented as thread-safe, so every worker thread
+gets its own session (threading.local): the first keeps the run's warmed-up
+session, the others start from a copy of its headers and cookies.
+
+    from async_scan import scan_routes
+    results = scan_routes("SFO", destinations, "Mar%2002,%202026", concurrency=4)
+
+gowild_fast.py and gowild_fast_bypass.py switch to it with GOWILD_ASYNC=1
+(in-flight limit: GOWILD_CONCURRENCY, default 4). Benchmark offline with
+    python3 benchmarks/bench_e2e.py --scanner async --concurrency 8
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from checkpoint import route_status
+from config import iso_date
+from rate_budget import RateBudget
+from retry_queue import RetryQueue
+from route_cache import ROUTE_CACHE
+from route_index import ROUTE_INDEX
+from sessions import SESSIONS
+
+ENABLED = os.environ.get("GOWILD_ASYNC", "0") == "1"
+CONCURRENCY = int(os.environ.get("GOWILD_CONCURRENCY", "4"))
+
+
+def clone_session(session):
+    """A new session of the same type with `session`'s headers and cookies."""
+    clone = type(session)()
+    clone.headers.update(session.headers)
+    clone.cookies.update(session.cookies)
+    return clone
+
+
+def thread_sessions(session):
+    """A get() for the calling worker thread's own session.
+
+    The first thread to ask uses `session` itself; later threads get a
+    clone_session() copy. Objects that aren't sessions (test doubles, None)
+    are shared as they are.
+    """
+    if not hasattr(session, "cookies"):
+        return lambda: session
+    local = threading.local()
+    lock = threading.Lock()
+    claimed = [False]
+
+    def get():
+        mine = getattr(local, "session", None)
+        if mine is None:
+            with lock:
+                mine = clone_session(session) if claimed[0] else session
+                claimed[0] = True
+            local.session = mine
+        return mine
+
+    return get
+
+
+async def scan_routes_async(origin, destinations, date, session, fetch,
+                            budget, concurrency=CONCURRENCY, base_url=None,
+                            sink=None, checkpoint=None):
+    """Scan origin -> every destination; returns the scan_routes results dict.
+
+    fetch is a get_flight_data(origin, dest, date, session, base_url=...)
+    returning (data, hit_limit), called on a worker thread with that thread's
+    own session (thread_sessions). Cached routes skip the budget entirely.
+    Finished routes are appended to `sink` (a ResultSink) and journaled in
+    `checkpoint` as they complete. Rate-limited routes, and routes that came
+    back without flight data, go round again once the batch is done
+    (retry_queue.RetryQueue).
+    """
+    from gowild_fast import gowild_entry, stream_route
+
+    loop = asyncio.get_running_loop()
+    in_flight = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    worker_session = thread_sessions(session)
+    results = {}
+    retry = RetryQueue(label=iso_date(date))
+    total = len(destinations)
+    done = 0
+
+    async def scan_one(dest_code, dest_name):
+        nonlocal done
+        async with in_flight:
+            cached = ROUTE_CACHE.contains(origin, dest_code, date, base_url)
+            if not cached:
+                await budget.acquire_async()
+            data, hit_limit = await loop.run_in_executor(
+                executor,
+                lambda: fetch(origin, dest_code, date, worker_session(), base_url=base_url),
+            )
+        done += 1
+        head = f"[{done}/{total}] {origin} → {dest_code} ({dest_name})"
+        if cached:
+            head += " (cached)"
+        if hit_limit:
+            budget.penalize()
+            print(f"{head} ❌ Rate limited - slowing every route to "
+                  f"{budget.base:.0f}s apart")
+            stream_route(sink, origin, dest_code, None, date, "rate_limited", checkpoint)
+            retry.defer(dest_code, dest_name)
+            return
+        if not cached:
+            budget.reward()
+        entry, message = gowild_entry(data, dest_name)
+        if entry:
+            results[dest_code] = entry
+        if data is None:
+            retry.defer(dest_code, dest_name)
+        print(f"{head} {message}")
+        stream_route(sink, origin, dest_code, entry, date, route_status(data, entry),
+                     checkpoint)
+
+    try:
+        for batch in retry.rounds(destinations):
+            done, total = 0, len(batch)
+            await asyncio.gather(*(scan_one(code, name) for code, name in batch.items()))
+    finally:
+        executor.shutdown(wait=False)
+    print(f"\n{retry.summary()}")
+    # Keep the serial loop's (destination list) order in the results.
+    return {code: results[code] for code in destinations if code in results}
+
+
+def scan_routes(origin, destinations, date, base_url=None, concurrency=None,
+                session=None, fetch=None, base_delay=15, jitter=10, sink=None,
+                checkpoint=None):
+    """Blocking entry point with scan_routes' signature and return value.
+
+    Defaults to gowild_fast's session and get_flight_data; base_delay/jitter
+    are the serial loop's starting delay (uniform(base, base + jitter)).
+    Routes the route index knows aren't flown are skipped. Without a session,
+    the run's shared gowild_fast session (sessions.SESSIONS) is used.
+    """
+    import gowild_fast
+
+    destinations = ROUTE_INDEX.plan(origin, destinations, base_url=base_url)
+
+    concurrency = concurrency or CONCURRENCY
+    if session is None:
+        session = SESSIONS.get(gowild_fast.create_session)
+    if fetch is None:
+        fetch = gowild_fast.get_flight_data
+    budget = RateBudget(base_delay, jitter=jitter)
+
+    print(f"\n🔍 Scanning {len(destinations)} routes from {origin} "
+          f"({concurrency} in flight, ~{base_delay + jitter / 2:.0f}s apart)...\n")
+    results = asyncio.run(
+        scan_routes_async(origin, destinations, date, session, fetch, budget,
+                          concurrency, base_url, sink, checkpoint)
+    )
+    print(f"\n{budget.summary()}")
+    return results
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Blackout-date lookup microbenchmark.
+
+Checks every day of a multi-year range (default 2025-01-01 .. 2027-12-31)
+once per route, the way a date-range scan or a round-trip matrix does, with:
+
+    legacy list   strftime() then `in` over the GOWILD_BLACKOUT_DATES list
+    set (str)     config.is_blackout_date("YYYY-MM-DD")
+    bitmap (date) config.is_blackout_date(date), ordinal index, no formatting
+    batch         config.blackout_mask(dates) once per route
+    batch (dt64)  config.blackout_mask on a numpy datetime64 array (if installed)
+
+    python3 benchmarks/bench_blackout.py
+    python3 benchmarks/bench_blackout.py --start 2025-01-01 --end 2030-12-31 --routes 100
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GOWILD_BLACKOUT_DATES, blackout_mask, is_blackout_date
+
+
+def legacy_is_blackout_date(date_obj):
+    """The pre-bitmap check the scripts each carried a copy of."""
+    return date_obj.strftime("%Y-%m-%d") in GOWILD_BLACKOUT_DATES
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Blackout-date lookup microbenchmark")
+    ap.add_argument("--start", default="2025-01-01")
+    ap.add_argument("--end", default="2027-12-31")
+    ap.add_argument("--routes", type=int, default=50, help="lookups per date")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    iso_days = [d.isoformat() for d in days]
+    n = len(days) * args.routes
+
+    cases = [
+        ("legacy list", lambda: sum(legacy_is_blackout_date(d) for _ in range(args.routes) for d in days)),
+        ("set (str)", lambda: sum(is_blackout_date(s) for _ in range(args.routes) for s in iso_days)),
+        ("bitmap (date)", lambda: sum(is_blackout_date(d) for _ in range(args.routes) for d in days)),
+        ("batch", lambda: sum(sum(blackout_mask(days)) for _ in range(args.routes))),
+    ]
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        days64 = np.array(days, dtype="datetime64[D]")
+        cases.append(("batch (dt64)",
+                      lambda: sum(sum(blackout_mask(days64)) for _ in range(args.routes))))
+
+    print(f"{len(days)} days x {args.routes} routes = {n:,} lookups "
+          f"({len(GOWILD_BLACKOUT_DATES)} blackout dates)\n")
+    print(f"{'method':<15}{'total ms':>10}{'ns/lookup':>11}{'speedup':>9}")
+    print("-" * 45)
+    baseline = None
+    expected = None
+    for name, fn in cases:
+        secs, hits = best_of(fn, args.repeat)
+        if expected is None:
+            expected = hits
+        assert hits == expected, f"{name} found {hits} blackout hits, expected {expected}"
+        baseline = baseline or secs
+        print(f"{name:<15}{secs * 1000:>10.1f}{secs / n * 1e9:>11.0f}{baseline / secs:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Bytes-first response handling vs reading response.text.
+
+get_flight_data used to touch response.text three times per page (captcha
+check, length check, extractor). requests re-decodes the whole body on every
+access, and with no charset in Content-Type it runs charset detection over
+the full page first. The bytes pipeline classifies on response.content and
+decodes only the journeys script slice.
+
+Both pipelines are timed on real requests.Response objects built from
+synthetic pages (or --pages), under three Content-Type headers, and must
+return the same data. "decoded KB" is text produced from bytes per page.
+
+    python3 benchmarks/bench_bytes.py
+    python3 benchmarks/bench_bytes.py --pages saved/ --repeat 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gowild_fast import parse_flight_response
+from journeys import _journeys_scripts, find_journeys_data
+from pages import load_pages, synthetic_captcha_page, synthetic_results_page
+
+HEADERS = {
+    "charset": "text/html; charset=utf-8",
+    "no charset": "text/html",
+    "no header": None,
+}
+
+
+def make_response(body, content_type):
+    r = requests.models.Response()
+    r.status_code = 200
+    r._content = body
+    if content_type:
+        r.headers["Content-Type"] = content_type
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    return r
+
+
+def legacy_parse(response):
+    """The pre-bytes handling: every check goes through response.text."""
+    if "px-captcha" in response.text or len(response.text) < 10000:
+        return None, True
+    data = find_journeys_data(response.text)
+    return (data, False) if data is not None else (None, False)
+
+
+def decoded_kb(body, new):
+    if not new:
+        return 3 * len(body) / 1024 if b"px-captcha" not in body else 1 * len(body) / 1024
+    return sum(end - start for start, end in _journeys_scripts(body)) / 1024
+
+
+def measure(fn, response, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(response)
+        samples.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(response)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(samples), peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bytes-first vs response.text parsing")
+    ap.add_argument("--pages", help="directory of saved InternalSelect .html pages")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = [("results_450kb", synthetic_results_page(seed=1)),
+                 ("results_900kb", synthetic_results_page(size_kb=900, n_flights=40, seed=2)),
+                 ("captcha", synthetic_captcha_page())]
+
+    print(f"{'page':<16}{'Content-Type':<14}{'text ms':>9}{'bytes ms':>10}{'speedup':>9}"
+          f"{'decoded KB':>15}{'peak KB':>15}")
+    for name, page in pages:
+        body = page.encode("utf-8")
+        for label, ctype in HEADERS.items():
+            response = make_response(body, ctype)
+            assert legacy_parse(response) == parse_flight_response(response), f"{name}: pipelines disagree"
+            (t_old, m_old), (t_new, m_new) = (measure(legacy_parse, response, args.repeat),
+                                              measure(parse_flight_response, response, args.repeat))
+            kb = f"{decoded_kb(body, False):.0f} / {decoded_kb(body, True):.0f}"
+            peak = f"{m_old / 1024:.0f} / {m_new / 1024:.0f}"
+            print(f"{name[:15]:<16}{label:<14}{t_old * 1000:>9.2f}{t_new * 1000:>10.2f}"
+                  f"{t_old / t_new:>8.1f}x{kb:>15}{peak:>15}")
+
+
+if __name__ == "__main__":
+    main()
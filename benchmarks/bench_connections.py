@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Connection finder benchmark over a synthetic full-day scan.
+
+Records --airports x (--airports - 1) routes with --per-route flights a day
+for two days (about a third with a GoWild fare) into a throwaway fare store,
+then times loading them (flights_from_store), building the ConnectionGraph
+and answering --queries random "cheapest way from A to B tomorrow" queries.
+
+    python3 benchmarks/bench_connections.py
+    python3 benchmarks/bench_connections.py --airports 80 --per-route 8 --overnight
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connections import ConnectionGraph, flights_from_store
+from fare_store import FareStore
+
+
+def synthetic_flights(rng, day, n):
+    flights = []
+    for i in range(n):
+        dep = 5 * 60 + rng.randrange(0, 17 * 60, 5)
+        arr = dep + rng.randint(60, 300)
+        gowild = rng.random() < 0.35
+        flights.append({
+            "isGoWildFareEnabled": gowild,
+            "goWildFare": round(rng.uniform(19, 129), 2) if gowild else None,
+            "discountDenFare": round(rng.uniform(39, 249), 2),
+            "legs": [{
+                "departureDate": f"{day}T{dep // 60:02d}:{dep % 60:02d}:00",
+                "arrivalDate": f"{day}T{min(arr // 60, 23):02d}:{arr % 60:02d}:00",
+                "flightNumber": f"F9 {1000 + i}",
+            }],
+        })
+    return flights
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Connection finder benchmark")
+    ap.add_argument("--airports", type=int, default=50)
+    ap.add_argument("--per-route", type=int, default=6)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--overnight", action="store_true")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    airports = [f"A{i:02d}" for i in range(args.airports)]
+    day = date(2026, 3, 2)
+    days = [day.isoformat(), (day + timedelta(days=1)).isoformat()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FareStore(os.path.join(tmp, "fares.sqlite3"), enabled=True, scanner="bench")
+        for d in days:
+            for o in airports:
+                for t in airports:
+                    if o != t:
+                        store.record(o, t, d, synthetic_flights(rng, d, args.per_route))
+        store.flush()
+        print(f"{args.airports} airports, {args.airports * (args.airports - 1)} routes, "
+              f"{store.recorded:,} fares recorded over 2 days\n")
+
+        t0 = time.perf_counter()
+        flights = flights_from_store(store, day, days=2)
+        t1 = time.perf_counter()
+        graph = ConnectionGraph(flights)
+        t2 = time.perf_counter()
+        store.close()
+
+    timings, hits = [], 0
+    for _ in range(args.queries):
+        a, b = rng.sample(airports, 2)
+        q0 = time.perf_counter()
+        found = graph.cheapest(a, b, day, k=5, overnight=args.overnight)
+        timings.append(time.perf_counter() - q0)
+        hits += bool(found)
+    timings.sort()
+
+    print(f"load from store   {(t1 - t0) * 1000:8.1f} ms   ({len(flights):,} GoWild flights)")
+    print(f"build graph       {(t2 - t1) * 1000:8.1f} ms")
+    print(f"query p50         {timings[len(timings) // 2] * 1000:8.2f} ms")
+    print(f"query p95         {timings[int(len(timings) * 0.95)] * 1000:8.2f} ms")
+    print(f"query max         {timings[-1] * 1000:8.2f} ms   ({hits}/{args.queries} answered)")
+
+
+if __name__ == "__main__":
+    main()
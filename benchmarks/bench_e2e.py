@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+End-to-end scan throughput against the local stand-in server.
+
+Starts benchmarks/standin_server.py in-process, points the scanners at it and
+reports wall clock and routes/minute for a full scan.
+
+    python3 benchmarks/bench_e2e.py                          # gowild_fast.scan_routes
+    python3 benchmarks/bench_e2e.py --scanner async --concurrency 8   # async_scan engine
+    python3 benchmarks/bench_e2e.py --scanner roundtrip      # roundtrip_fast out + return
+    python3 benchmarks/bench_e2e.py --scanner report         # search_group (needs Chrome)
+    DEAL_PIPELINE=0 python3 benchmarks/bench_e2e.py --scanner report   # serial search_group
+    python3 benchmarks/bench_e2e.py --scanner report --workers 4       # search_pool
+    python3 benchmarks/bench_e2e.py --scanner report --browser http    # no Chrome needed
+    python3 benchmarks/bench_e2e.py --latency 0.5 --rate-403 0.05 --delay-scale 0.01
+
+--delay-scale scales every politeness sleep (FRONTIER_DELAY_SCALE); the default
+0 measures pipeline cost alone. Use e.g. --delay-scale 0.01 to see the shared
+rate budget at work in pool mode.
+
+--browser http swaps Chrome for HttpDriver (plain requests, page ready as soon
+as it is fetched) so the report's scheduling can be measured on a machine
+without Chrome; it says nothing about browser render time. The route cache is off unless --cache is given,
+so repeated runs measure fetches rather than cache reads.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import StandinServer
+
+
+def run_fast(base_url, day, n_dests):
+    from gowild_fast import destinations, scan_routes
+
+    dests = dict(list(destinations.items())[:n_dests])
+    scan_routes("SFO", dests, day.strftime("%b-%d,-%Y").replace("-", "%20"), base_url=base_url)
+    return len(dests)
+
+
+def run_async(base_url, day, n_dests, concurrency=4):
+    import async_scan
+    from gowild_fast import destinations
+
+    dests = dict(list(destinations.items())[:n_dests])
+    date = day.strftime("%b-%d,-%Y").replace("-", "%20")
+    async_scan.scan_routes("SFO", dests, date, base_url=base_url, concurrency=concurrency)
+    return len(dests)
+
+
+def run_roundtrip(base_url, day, n_dests):
+    from gowild_fast import create_session
+    from roundtrip_fast import POPULAR_DESTINATIONS, search_outbound, search_return
+
+    dests = dict(list(POPULAR_DESTINATIONS.items())[:n_dests])
+    session = create_session()
+    out = search_outbound("SFO", day.strftime("%Y-%m-%d"), dests, session, base_url=base_url)
+    ret_day = (day + timedelta(days=4)).strftime("%Y-%m-%d")
+    search_return(list(out), dests, ret_day, session, base_url=base_url)
+    return len(dests) + len(out)
+
+
+class HttpDriver:
+    """The slice of the WebDriver API the deal report uses, over requests."""
+
+    def __init__(self, *args, **kwargs):
+        import requests
+
+        self._session = requests.Session()
+        self.page_source = ""
+
+    def get(self, url):
+        self.page_source = self._session.get(url, timeout=30).text
+
+    def execute_script(self, js):
+        return True
+
+    def quit(self):
+        self._session.close()
+
+
+def run_report(base_url, day, n_dests, workers=1, browser="chrome"):
+    import gowild_deal_report as report
+
+    if browser == "http":
+        report.build_driver = HttpDriver
+    dests = dict(list(report.DOMESTIC_DESTINATIONS.items())[:n_dests])
+    if workers > 1:
+        _, routes = report.search_pool([(dests, day, False)], workers, base_url=base_url)
+        return routes
+    driver = report.build_driver()
+    try:
+        _, routes, driver = report.search_group(driver, dests, day, False, base_url=base_url)
+    finally:
+        driver.quit()
+    return routes
+
+
+SCANNERS = {"fast": run_fast, "async": run_async, "roundtrip": run_roundtrip, "report": run_report}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="End-to-end scan throughput vs the stand-in server")
+    ap.add_argument("--scanner", choices=sorted(SCANNERS), default="fast")
+    ap.add_argument("--dests", type=int, default=20, help="destinations to scan")
+    ap.add_argument("--pages", help="recorded pages directory for the stand-in")
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--jitter", type=float, default=0.05)
+    ap.add_argument("--rate-403", type=float, default=0.0)
+    ap.add_argument("--rate-captcha", type=float, default=0.0)
+    ap.add_argument("--rate-truncated", type=float, default=0.0)
+    ap.add_argument("--delay-scale", default="0")
+    ap.add_argument("--cache", action="store_true", help="leave the route cache on")
+    ap.add_argument("--concurrency", type=int, default=4, help="async: requests in flight")
+    ap.add_argument("--workers", type=int, default=1, help="report: browsers in the pool")
+    ap.add_argument("--browser", choices=("chrome", "http"), default="chrome",
+                    help="report: real Chrome or HttpDriver")
+    ap.add_argument("--verbose", action="store_true", help="show scanner output")
+    args = ap.parse_args()
+
+    server = StandinServer(
+        pages_dir=args.pages, latency=args.latency, jitter=args.jitter,
+        rate_403=args.rate_403, rate_captcha=args.rate_captcha,
+        rate_truncated=args.rate_truncated,
+    )
+    base_url = server.start()
+    # config reads these at import time, so set them before any scanner import.
+    os.environ["FRONTIER_BOOKING_URL"] = base_url
+    os.environ["FRONTIER_HOME_URL"] = base_url + "/"
+    os.environ["FRONTIER_DELAY_SCALE"] = args.delay_scale
+    if not args.cache:
+        os.environ["ROUTE_CACHE"] = "0"
+    os.environ["FARE_STORE"] = "0"  # keep stand-in fares out of the history
+    os.environ["ROUTE_INDEX"] = "0"  # ... and stand-in schedules out of the route index
+    os.environ["COOKIE_JAR"] = "0"  # ... and stand-in cookies out of results/cookies
+
+    day = datetime.now() + timedelta(days=1)
+    out = sys.stdout if args.verbose else io.StringIO()
+    t0 = time.perf_counter()
+    try:
+        with redirect_stdout(out):
+            if args.scanner == "report":
+                routes = run_report(base_url, day, args.dests, args.workers, args.browser)
+            elif args.scanner == "async":
+                routes = run_async(base_url, day, args.dests, args.concurrency)
+            else:
+                routes = SCANNERS[args.scanner](base_url, day, args.dests)
+    finally:
+        elapsed = time.perf_counter() - t0
+        server.stop()
+
+    print(f"Scanner:      {args.scanner}  (stand-in {base_url}, delay scale {args.delay_scale})")
+    print(f"Routes:       {routes}")
+    print(f"Wall clock:   {elapsed:.2f}s")
+    print(f"Routes/min:   {routes / elapsed * 60:.1f}")
+    print(f"Server:       {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
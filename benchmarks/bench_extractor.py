@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Per-page cost of the journeys extractor, before and after journeys.py.
+
+"before" is the BeautifulSoup + char-by-char brace loop the scrapers used to
+carry; "after" is journeys.parse_flights. Both must return the same flights
+(after the projection parse_flights applies, see bench_projection.py).
+
+    python3 benchmarks/bench_extractor.py                 # synthetic pages
+    python3 benchmarks/bench_extractor.py --pages saved/  # your saved pages
+"""
+
+import argparse
+import html as html_lib
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from journeys import parse_flights, project_journeys
+from pages import load_pages, synthetic_results_page
+
+
+def legacy_parse_flights(page_source):
+    """The pre-journeys.py parser, kept verbatim as the baseline."""
+    if "px-captcha" in page_source:
+        return []
+    soup = BeautifulSoup(page_source, "html.parser")
+    for script in soup.find_all("script"):
+        t = script.string
+        if t and "journeys" in t and "flights" in t:
+            decoded = html_lib.unescape(t)
+            start = decoded.find("{")
+            if start == -1:
+                continue
+            depth = 0
+            end = start
+            for i in range(start, len(decoded)):
+                if decoded[i] == "{":
+                    depth += 1
+                elif decoded[i] == "}":
+                    depth -= 1
+                    if depth == 0:
+                        end = i + 1
+                        break
+            try:
+                data = json.loads(decoded[start:end])
+            except json.JSONDecodeError:
+                continue
+            if "journeys" in data and data["journeys"]:
+                return data["journeys"][0].get("flights") or []
+    return []
+
+
+def time_per_page(fn, page, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(page)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pages", help="directory of saved InternalSelect .html pages")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = [
+            (f"synthetic_{kb}kb", synthetic_results_page(size_kb=kb, n_flights=n, seed=kb))
+            for kb, n in ((300, 8), (450, 12), (600, 20))
+        ]
+    if not pages:
+        print("No pages found.")
+        return
+
+    print(f"{'page':<28}{'KB':>7}{'before ms':>12}{'after ms':>11}{'speedup':>9}")
+    total_before = total_after = 0.0
+    for name, page in pages:
+        old, new = legacy_parse_flights(page), parse_flights(page)
+        old = project_journeys({"journeys": [{"flights": old}]})["journeys"][0]["flights"]
+        if old != new:
+            print(f"  ⚠️  {name}: extractors disagree ({len(old)} vs {len(new)} flights)")
+        before = time_per_page(legacy_parse_flights, page, args.repeat)
+        after = time_per_page(parse_flights, page, args.repeat)
+        total_before += before
+        total_after += after
+        print(
+            f"{name[:27]:<28}{len(page) / 1024:>7.0f}{before * 1000:>12.2f}"
+            f"{after * 1000:>11.2f}{before / after:>8.1f}x"
+        )
+    print(
+        f"{'total':<28}{'':>7}{total_before * 1000:>12.2f}{total_after * 1000:>11.2f}"
+        f"{total_before / total_after:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
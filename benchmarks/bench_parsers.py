@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Offline parser benchmark suite.
+
+Times every parser the scanners run per page against a corpus of saved pages
+(see benchmarks/pages.py for the layout) and reports pages/sec, p50/p99
+latency and peak RSS. Each parser runs in its own child process so peak RSS
+belongs to that parser alone.
+
+    python3 benchmarks/bench_parsers.py                       # synthetic corpus
+    python3 benchmarks/bench_parsers.py --pages bench_pages/  # saved pages
+    python3 benchmarks/bench_parsers.py --save-baseline base.json
+    python3 benchmarks/bench_parsers.py --baseline base.json  # exit 1 on regression
+
+Run it before touching a parser (or before the 00:01 launchd job picks up a
+change) so a slowdown shows up here rather than in the nightly wall clock.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages import load_corpus, synthetic_corpus, write_corpus
+
+# What gowild_fast.parse_flight_response needs from a requests.Response.
+SavedResponse = namedtuple("SavedResponse", "status_code content headers")
+HTML_HEADERS = {"Content-Type": "text/html; charset=utf-8"}
+
+
+def _parse_flights_case(pages):
+    from journeys import parse_flights
+
+    return [(name, parse_flights, (page,)) for name, page in pages]
+
+
+def _extract_deals_case(pages):
+    from gowild_deal_report import extract_deals
+    from journeys import parse_flights
+
+    return [
+        (name, extract_deals, (parse_flights(page), "SFO", "DEN", "Denver, CO", "Mar 2, 2026", False))
+        for name, page in pages
+    ]
+
+
+def _get_flight_data_case(pages):
+    from gowild_fast import parse_flight_response
+
+    return [
+        (name, parse_flight_response, (SavedResponse(200, page.encode("utf-8"), HTML_HEADERS),))
+        for name, page in pages
+    ]
+
+
+def _parse_ticker_case(pages):
+    from cruise_deals import parse_ticker
+
+    return [(name, parse_ticker, (page,)) for name, page in pages]
+
+
+def _parse_itinerary_case(pages):
+    from cruise_deals import parse_itinerary
+
+    return [(name, parse_itinerary, (page,)) for name, page in pages]
+
+
+# name -> (corpus kinds it runs on, case builder)
+PARSERS = {
+    "parse_flights": (("results", "captcha", "empty"), _parse_flights_case),
+    "extract_deals": (("results",), _extract_deals_case),
+    "get_flight_data": (("results", "captcha", "empty"), _get_flight_data_case),
+    "parse_ticker": (("ticker",), _parse_ticker_case),
+    "parse_itinerary": (("itinerary",), _parse_itinerary_case),
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def peak_rss_mb():
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_parser(name, corpus_dir, rounds):
+    """Benchmark one parser in this process; returns a result dict."""
+    kinds, build = PARSERS[name]
+    corpus = load_corpus(corpus_dir)
+    pages = [p for kind in kinds for p in corpus.get(kind, [])]
+    if not pages:
+        return {"parser": name, "pages": 0}
+    cases = build(pages)
+    for _, fn, args in cases:  # warm imports and caches
+        fn(*args)
+
+    samples = []
+    t_start = time.perf_counter()
+    for _ in range(rounds):
+        for _, fn, args in cases:
+            t0 = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - t_start
+    return {
+        "parser": name,
+        "pages": len(samples),
+        "pages_per_sec": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(name, corpus_dir, rounds):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--only", name,
+         "--pages", corpus_dir, "--rounds", str(rounds)],
+        capture_output=True,
+        text=True,
+    )
+    for line in reversed(out.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"parser": name, "pages": 0, "error": (out.stderr.strip().splitlines() or ["?"])[-1]}
+
+
+def print_table(results):
+    print(f"{'parser':<18}{'pages':>7}{'pages/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'peak RSS':>11}")
+    print("-" * 64)
+    for r in results:
+        if not r.get("pages"):
+            print(f"{r['parser']:<18}{'-':>7}  {r.get('error', 'no pages in corpus')}")
+            continue
+        print(
+            f"{r['parser']:<18}{r['pages']:>7}{r['pages_per_sec']:>10.1f}"
+            f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['peak_rss_mb']:>8.1f} MB"
+        )
+
+
+def compare(results, baseline_path, tolerance):
+    """Print p50 changes vs a saved baseline; return True if any parser regressed."""
+    with open(baseline_path) as f:
+        baseline = {r["parser"]: r for r in json.load(f)}
+    regressed = False
+    print(f"\nvs baseline {baseline_path} (tolerance {tolerance:.0%}):")
+    for r in results:
+        old = baseline.get(r["parser"])
+        if not r.get("pages") or not old or not old.get("pages"):
+            continue
+        change = r["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  ❌ REGRESSION"
+            regressed = True
+        print(f"  {r['parser']:<18}{old['p50_ms']:>9.2f} -> {r['p50_ms']:>9.2f} ms ({change:+.0%}){flag}")
+    return regressed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline parser benchmark suite")
+    ap.add_argument("--pages", help="corpus directory (default: synthetic pages)")
+    ap.add_argument("--rounds", type=int, default=5, help="passes over the corpus")
+    ap.add_argument("--only", choices=sorted(PARSERS), help=argparse.SUPPRESS)
+    ap.add_argument("--save-baseline", metavar="FILE")
+    ap.add_argument("--baseline", metavar="FILE")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown")
+    args = ap.parse_args()
+
+    if args.only:
+        print(json.dumps(run_parser(args.only, args.pages, args.rounds)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.pages
+        if not corpus_dir:
+            corpus_dir = tmp
+            write_corpus(corpus_dir, synthetic_corpus())
+        print(f"Corpus: {args.pages or 'synthetic'}  |  rounds: {args.rounds}\n")
+        results = [run_isolated(name, corpus_dir, args.rounds) for name in PARSERS]
+
+    print_table(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Saved baseline to {args.save_baseline}")
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Projecting journeys decode vs the full json decode, per results page.
+
+"full" is find_journeys_data(page, project=False): unescape the whole script
+and json-decode every field. "projected" is the default find_journeys_data:
+only FLIGHT_FIELDS / LEG_FIELDS are unescaped and decoded. Both must agree
+after project_journeys. Reports time per page, peak bytes allocated while
+decoding (tracemalloc) and bytes kept in the returned object.
+
+    python3 benchmarks/bench_projection.py                 # synthetic pages
+    python3 benchmarks/bench_projection.py --pages saved/  # recorded pages
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journeys import find_journeys_data, project_journeys
+from pages import load_pages, synthetic_results_page
+
+
+def full(page):
+    return find_journeys_data(page, project=False)
+
+
+def projected(page):
+    return find_journeys_data(page)
+
+
+def time_per_page(fn, page, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(page)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def memory(fn, page):
+    """(peak bytes allocated during the call, bytes still held by the result)."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn(page)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, held
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Projecting vs full journeys decode")
+    ap.add_argument("--pages", help="directory of saved InternalSelect .html pages")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = [
+            (f"synthetic_{n}_flights", synthetic_results_page(size_kb=kb, n_flights=n, seed=n))
+            for kb, n in ((300, 8), (450, 12), (600, 20), (900, 40))
+        ]
+    if not pages:
+        print("No pages found.")
+        return
+
+    print(f"{'page':<22}{'full ms':>9}{'proj ms':>9}{'speedup':>9}"
+          f"{'peak KB full/proj':>20}{'kept KB full/proj':>20}")
+    t_full = t_proj = 0.0
+    for name, page in pages:
+        a, b = full(page), projected(page)
+        if a is None and b is None:
+            continue
+        assert project_journeys(a) == b, f"{name}: projection disagrees with full decode"
+        tf = time_per_page(full, page, args.repeat)
+        tp = time_per_page(projected, page, args.repeat)
+        (pf, hf), (pp, hp) = memory(full, page), memory(projected, page)
+        t_full += tf
+        t_proj += tp
+        print(f"{name[:21]:<22}{tf * 1000:>9.2f}{tp * 1000:>9.2f}{tf / tp:>8.1f}x"
+              f"{f'{pf / 1024:.0f} / {pp / 1024:.0f}':>20}{f'{hf / 1024:.0f} / {hp / 1024:.0f}':>20}")
+    print(f"{'total':<22}{t_full * 1000:>9.2f}{t_proj * 1000:>9.2f}{t_full / t_proj:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
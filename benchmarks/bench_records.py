@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Memory held by a range scan's results: raw flight dicts vs records.
+
+Simulates a --days x --dests scan (default 30 x 95) with --flights synthetic
+flights per route (benchmarks/pages.synthetic_flight, about half GoWild),
+each route decoded fresh from JSON as get_flight_data does, and keeps:
+
+    raw      results[date][dest]["flights"] = the GoWild flight dicts (old)
+    records  the same flights as records.FlightRecord
+    dicts    extract_deals-style 11-key dicts for every GoWild / Discount Den fare
+    deals    the same as records.Deal
+
+Each mode runs in its own subprocess and reports bytes per flight (or deal)
+from tracemalloc and the process's peak RSS (which includes the pre-generated
+JSON texts, the same in every mode).
+
+    python3 benchmarks/bench_records.py
+    python3 benchmarks/bench_records.py --days 60 --dests 95 --flights 20
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tracemalloc
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pages import synthetic_flight
+from records import Deal, FareType, gowild_records
+
+MODES = ("raw", "records", "dicts", "deals")
+
+
+def route_payloads(days, dests, n_flights, seed=0):
+    """(day, dest, JSON text) for every route of the scan."""
+    rng = random.Random(seed)
+    start = date(2026, 3, 1)
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        for i in range(dests):
+            dest = f"D{i:02d}"
+            flights = [synthetic_flight(rng, "SFO", dest, day, j) for j in range(n_flights)]
+            yield day, dest, json.dumps({"journeys": [{"flights": flights}]})
+
+
+def legacy_deal_dicts(flights, origin, dest, dest_name, flight_date, is_intl):
+    deals = []
+    for f in flights:
+        common = {
+            "origin": origin, "dest": dest, "dest_name": dest_name,
+            "stops": f.get("stopsText", "N/A"), "duration": f.get("duration", "N/A"),
+            "departs": f["legs"][0].get("departureDateFormatted", "N/A"),
+            "flight_date": flight_date, "is_intl": is_intl,
+        }
+        if f.get("isGoWildFareEnabled") and f.get("goWildFare"):
+            deals.append({"type": "GoWild", "price": float(f["goWildFare"]),
+                          "seats": f.get("goWildFareSeatsRemaining"), **common})
+        if f.get("discountDenFare"):
+            deals.append({"type": "Discount Den", "price": float(f["discountDenFare"]),
+                          "seats": f.get("discountDenFareSeatsRemaining"), **common})
+    return deals
+
+
+def new_deals(flights, origin, dest, dest_name, flight_date, is_intl):
+    deals = []
+    for f in flights:
+        args = (f.get("stopsText", "N/A"), f.get("duration", "N/A"),
+                f["legs"][0].get("departureDateFormatted", "N/A"))
+        if f.get("isGoWildFareEnabled") and f.get("goWildFare"):
+            deals.append(Deal(FareType.GOWILD, origin, dest, dest_name, float(f["goWildFare"]),
+                              *args, f.get("goWildFareSeatsRemaining"), flight_date, is_intl))
+        if f.get("discountDenFare"):
+            deals.append(Deal(FareType.DISCOUNT_DEN, origin, dest, dest_name,
+                              float(f["discountDenFare"]), *args,
+                              f.get("discountDenFareSeatsRemaining"), flight_date, is_intl))
+    return deals
+
+
+def run_mode(mode, days, dests, n_flights):
+    """Build the scan's results in `mode`; returns (items kept, bytes held)."""
+    payloads = list(route_payloads(days, dests, n_flights))
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    kept, items = {}, 0
+    for day, dest, text in payloads:
+        # Built per route like get_flight_data / the report do; names and
+        # dates come from a str.format so they are not shared literals.
+        flights = json.loads(text)["journeys"][0]["flights"]
+        name, when = "Dest {}, XX".format(dest), "{}".format(day)
+        if mode == "raw":
+            value = [f for f in flights if f.get("isGoWildFareEnabled")]
+        elif mode == "records":
+            value = gowild_records(flights)
+        elif mode == "dicts":
+            value = legacy_deal_dicts(flights, "SFO", dest, name, when, False)
+        else:
+            value = new_deals(flights, "SFO", dest, name, when, False)
+        kept[day, dest] = value
+        items += len(value)
+        del flights
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return items, held
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Flight / deal record memory benchmark")
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--dests", type=int, default=95)
+    ap.add_argument("--flights", type=int, default=12, help="flights per route")
+    ap.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.mode:
+        items, held = run_mode(args.mode, args.days, args.dests, args.flights)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB -> MB on Linux
+        print(json.dumps({"items": items, "held": held, "rss": rss}))
+        return
+
+    print(f"{args.days} days x {args.dests} destinations x {args.flights} flights/route\n")
+    print(f"{'mode':<9}{'kept':>9}{'held MB':>10}{'B/item':>9}{'peak RSS MB':>13}")
+    print("-" * 50)
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--days", str(args.days),
+             "--dests", str(args.dests), "--flights", str(args.flights)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        r = json.loads(out)
+        print(f"{mode:<9}{r['items']:>9,}{r['held'] / 2**20:>10.1f}"
+              f"{r['held'] / max(r['items'], 1):>9.0f}{r['rss']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
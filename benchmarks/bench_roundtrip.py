@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Round-trip engine benchmark at synthetic scale.
+
+Builds random best-fare grids (default 1000 destinations x 365 days, ~40% of
+cells with a GoWild fare) and times the top-k round trips with:
+
+    numpy     roundtrip_engine.top_k_pairs on float arrays
+    heapq     the engine's pure-Python fallback (no NumPy)
+    legacy    the old compile_roundtrips (dict per pair + full sort), run on a
+              --legacy-dests x --legacy-days slice since it cannot finish the
+              full grid in reasonable time
+
+and checks all of them agree on the slice. It then counts how many return-leg
+page loads roundtrip_engine.lazy_return_search needs for the same top-k on the
+slice against the full search (every destination on every return date).
+
+    python3 benchmarks/bench_roundtrip.py
+    python3 benchmarks/bench_roundtrip.py --dests 1000 --days 365 --k 15 --min-stay 2 --max-stay 14
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import roundtrip_engine
+from roundtrip_engine import _top_k_pairs_py, top_k_pairs
+
+
+def synthetic_grid(rng, n_dests, n_days, density):
+    return [
+        [round(rng.uniform(19, 199), 2) if rng.random() < density else math.inf for _ in range(n_days)]
+        for _ in range(n_dests)
+    ]
+
+
+def grid_to_results(grid, first):
+    """Grid -> the scripts' {"YYYY-MM-DD": {dest: info}} shape."""
+    by_date = {}
+    for r, row in enumerate(grid):
+        for d, price in enumerate(row):
+            if price != math.inf:
+                day = (first + timedelta(days=d)).isoformat()
+                by_date.setdefault(day, {})[f"D{r:03d}"] = {
+                    "name": f"Dest {r}", "best_price": price, "count": 1,
+                }
+    return by_date
+
+
+def legacy_compile_roundtrips(outbound_by_date, return_by_date, min_stay, max_stay):
+    """The pre-engine nested loops, plus the stay filter for a fair comparison."""
+    roundtrips = []
+    for out_date, out_dests in outbound_by_date.items():
+        for dest_code, out_info in out_dests.items():
+            for ret_date, ret_dests in return_by_date.items():
+                if dest_code in ret_dests:
+                    stay = (date.fromisoformat(ret_date) - date.fromisoformat(out_date)).days
+                    if stay < min_stay or stay > max_stay:
+                        continue
+                    ret_info = ret_dests[dest_code]
+                    roundtrips.append(
+                        {
+                            "destination_code": dest_code,
+                            "outbound_date": out_date,
+                            "return_date": ret_date,
+                            "total_price": out_info["best_price"] + ret_info["best_price"],
+                        }
+                    )
+    return sorted(roundtrips, key=lambda x: x["total_price"])
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Round-trip engine benchmark")
+    ap.add_argument("--dests", type=int, default=1000)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--density", type=float, default=0.4)
+    ap.add_argument("--k", type=int, default=15)
+    ap.add_argument("--min-stay", type=int, default=2)
+    ap.add_argument("--max-stay", type=int, default=14)
+    ap.add_argument("--legacy-dests", type=int, default=100)
+    ap.add_argument("--legacy-days", type=int, default=60)
+    ap.add_argument("--floor", type=float, default=19.0, help="lowest possible return fare")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    if roundtrip_engine.np is None:
+        print("NumPy is not installed; only the heapq fallback can be timed.")
+        sys.exit(1)
+    np = roundtrip_engine.np
+
+    rng = random.Random(args.seed)
+    out = synthetic_grid(rng, args.dests, args.days, args.density)
+    ret = synthetic_grid(rng, args.dests, args.days, args.density)
+    stays = (args.min_stay, args.max_stay)
+    print(f"{args.dests} destinations x {args.days} days, density {args.density:.0%}, "
+          f"stay {args.min_stay}-{args.max_stay} days, top {args.k}\n")
+
+    t_arr, (out_a, ret_a) = timed(lambda: (np.array(out), np.array(ret)))
+    t_np, top_np = timed(lambda: top_k_pairs(out_a, ret_a, args.k, *stays))
+    t_py, top_py = timed(lambda: _top_k_pairs_py(out, ret, args.k, *stays))
+    assert [t[0] for t in top_np] == [t[0] for t in top_py], "numpy and heapq disagree"
+    print(f"{'numpy':<8}{t_np * 1000:>10.1f} ms   (+{t_arr * 1000:.1f} ms list -> array)")
+    print(f"{'heapq':<8}{t_py * 1000:>10.1f} ms")
+    print(f"cheapest: ${top_np[0][0]:.2f}, k-th: ${top_np[-1][0]:.2f}")
+
+    # Legacy comparison on a slice the old code can handle.
+    first = date(2026, 1, 1)
+    sl_out = [row[: args.legacy_days] for row in out[: args.legacy_dests]]
+    sl_ret = [row[: args.legacy_days] for row in ret[: args.legacy_dests]]
+    out_res, ret_res = grid_to_results(sl_out, first), grid_to_results(sl_ret, first)
+    t_legacy, legacy = timed(lambda: legacy_compile_roundtrips(out_res, ret_res, *stays)[: args.k])
+    t_engine, engine = timed(lambda: roundtrip_engine.top_roundtrips(out_res, ret_res, args.k, *stays))
+    assert [t["total_price"] for t in legacy] == [t.total_price for t in engine], "legacy disagrees"
+    print(f"\nslice {args.legacy_dests} x {args.legacy_days} from result dicts:")
+    print(f"{'legacy':<8}{t_legacy * 1000:>10.1f} ms")
+    print(f"{'engine':<8}{t_engine * 1000:>10.1f} ms   ({t_legacy / t_engine:.0f}x)")
+
+    # Return legs a top-k query has to fetch with branch and bound.
+    lazy, fetched, candidates, _ = roundtrip_engine.lazy_return_search(
+        out_res, list(ret_res), lambda code, day: ret_res[day].get(code),
+        args.k, args.floor, *stays,
+    )
+    lazy_top = roundtrip_engine.top_roundtrips(out_res, lazy, args.k, *stays)
+    assert lazy_top == engine, "lazy return search disagrees"
+    print(f"\nlazy return search, top {args.k}, floor ${args.floor:.2f}:")
+    print(f"fetched {fetched:,} of {candidates:,} return legs "
+          f"({1 - fetched / candidates:.1%} avoided)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Flight-level round-trip matcher benchmark.
+
+Generates --flights outbound and return flights per destination over a
+--days window and times roundtrip_match.match_legs (sort + sweep with a
+monotonic deque) against the naive all-pairs join, which is only run up to
+--naive-max flights per side, and checks both agree.
+
+    python3 benchmarks/bench_roundtrip_match.py
+    python3 benchmarks/bench_roundtrip_match.py --flights 20000 --min-hours 36 --max-hours 96
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roundtrip_match import Leg, match_legs
+
+START = datetime(2026, 1, 1)
+
+
+def synthetic_legs(rng, n, days):
+    legs = []
+    for _ in range(n):
+        departs = START + timedelta(minutes=rng.randrange(0, days * 24 * 60, 5))
+        arrives = departs + timedelta(minutes=rng.randint(60, 360))
+        legs.append(Leg(departs, arrives, round(rng.uniform(19, 199), 2), None))
+    return legs
+
+
+def naive_match(outbound, inbound, min_ground, max_ground):
+    """Every outbound against every return: the quadratic baseline."""
+    for back in inbound:
+        best = None
+        for out in outbound:
+            ground = back.departs - out.arrives
+            if ground >= min_ground and (max_ground is None or ground <= max_ground):
+                if best is None or out.price < best.price:
+                    best = out
+        if best is not None:
+            yield best, back
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Flight-level round-trip matcher benchmark")
+    ap.add_argument("--flights", type=int, default=5000, help="flights per side")
+    ap.add_argument("--days", type=int, default=90)
+    ap.add_argument("--min-hours", type=float, default=36)
+    ap.add_argument("--max-hours", type=float, default=14 * 24)
+    ap.add_argument("--naive-max", type=int, default=5000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    lo, hi = timedelta(hours=args.min_hours), timedelta(hours=args.max_hours)
+    print(f"one destination, {args.days} days, ground time {args.min_hours:g}-{args.max_hours:g} h\n")
+    print(f"{'flights':>9}{'sweep ms':>11}{'naive ms':>11}{'speedup':>9}{'matches':>9}")
+    print("-" * 49)
+    sizes = [n for n in (500, 1000, 2000, 5000, 10000, 20000, 50000) if n < args.flights]
+    for n in sizes + [args.flights]:
+        out, back = synthetic_legs(rng, n, args.days), synthetic_legs(rng, n, args.days)
+        t_sweep, pairs = timed(lambda: [(o.price, b) for o, b in match_legs(out, back, lo, hi)])
+        naive = speed = "-"
+        if n <= args.naive_max:
+            t_naive, expected = timed(lambda: [(o.price, b) for o, b in naive_match(out, back, lo, hi)])
+            assert sorted(pairs) == sorted(expected), "sweep and naive join disagree"
+            naive, speed = f"{t_naive * 1000:.1f}", f"{t_naive / t_sweep:.0f}x"
+        print(f"{n:>9}{t_sweep * 1000:>11.1f}{naive:>11}{speed:>9}{len(pairs):>9}")
+
+
+if __name__ == "__main__":
+    main()
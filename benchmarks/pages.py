@@ -0,0 +1,247 @@
+"""
+Page corpus for the offline benchmarks.
+
+Real pages can be saved from a browser (or from debug_page.html, which
+gowild_undetected.check_flight writes) into a corpus directory laid out as
+
+    <corpus>/results/    InternalSelect result pages
+    <corpus>/captcha/    PerimeterX challenge pages
+    <corpus>/empty/      result pages with no flights / no journeys script
+    <corpus>/ticker/     VacationsToGo ticker pages (cruise_deals.parse_ticker)
+    <corpus>/itinerary/  VacationsToGo fastdeal pages (cruise_deals.parse_itinerary)
+
+and passed with --pages. Without one, deterministic synthetic pages are
+generated with the shape the parsers care about: a few hundred KB of markup and
+vendor scripts with the HTML-escaped journeys object in one <script>.
+
+    python3 benchmarks/pages.py bench_pages/   # write the synthetic corpus
+"""
+
+import html
+import json
+import os
+import random
+import sys
+
+RESULTS_PAGE_KB = 450
+KINDS = ("results", "captcha", "empty", "ticker", "itinerary")
+
+
+def load_pages(directory):
+    """Return [(name, text)] for every .html/.htm file in `directory`."""
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith((".html", ".htm")):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+            pages.append((name, f.read()))
+    return pages
+
+
+def load_corpus(directory):
+    """Return {kind: [(name, text)]} for each KINDS subdirectory that exists."""
+    corpus = {}
+    for kind in KINDS:
+        sub = os.path.join(directory, kind)
+        if os.path.isdir(sub):
+            corpus[kind] = load_pages(sub)
+    return corpus
+
+
+def synthetic_corpus(n_results=6, seed=0):
+    """{kind: [(name, text)]} with every kind the parser benchmarks cover."""
+    corpus = {
+        "results": [
+            (
+                f"results_{i}.html",
+                synthetic_results_page(
+                    dest=dest, n_flights=6 + 3 * i, size_kb=300 + 60 * i, seed=seed + i
+                ),
+            )
+            for i, dest in enumerate(["DEN", "LAS", "CUN", "MIA", "SJU", "ORD"][:n_results])
+        ],
+        "captcha": [("captcha_0.html", synthetic_captcha_page(seed))],
+        "empty": [
+            ("empty_journeys.html", synthetic_results_page(n_flights=0, seed=seed)),
+            ("empty_no_script.html", synthetic_no_flights_page(seed)),
+        ],
+        "ticker": [("ticker_0.html", synthetic_ticker_page(seed=seed))],
+        "itinerary": [
+            (f"itinerary_{i}.html", synthetic_itinerary_page(n_ports=4 + i, seed=seed + i))
+            for i in range(4)
+        ],
+    }
+    return corpus
+
+
+def write_corpus(directory, corpus):
+    for kind, pages in corpus.items():
+        os.makedirs(os.path.join(directory, kind), exist_ok=True)
+        for name, text in pages:
+            with open(os.path.join(directory, kind, name), "w", encoding="utf-8") as f:
+                f.write(text)
+
+
+def synthetic_flight(rng, origin, dest, day, idx):
+    """One flight dict with the fields the scrapers read plus the fare-class bulk
+    they ignore."""
+    dep_hour = 6 + (idx * 3) % 16
+    gowild = rng.random() < 0.5
+    return {
+        "isGoWildFareEnabled": gowild,
+        "goWildFare": round(rng.uniform(19, 129), 2) if gowild else None,
+        "goWildFareSeatsRemaining": f"{rng.randint(1, 9)} Seats Left!" if gowild else None,
+        "discountDenFare": round(rng.uniform(39, 249), 2),
+        "discountDenFareSeatsRemaining": rng.randint(1, 9),
+        "standardFare": round(rng.uniform(59, 399), 2),
+        "stopsText": "Nonstop" if idx % 3 else "1 Stop",
+        "duration": f"{2 + idx % 6}h {rng.randint(0, 59)}m",
+        "legs": [
+            {
+                "origin": origin,
+                "destination": dest,
+                "departureDate": f"{day}T{dep_hour:02d}:{rng.choice(['00', '15', '30', '45'])}:00",
+                "arrivalDate": f"{day}T{min(dep_hour + 3, 23):02d}:10:00",
+                "departureDateFormatted": f"{dep_hour % 12 or 12}:00 {'AM' if dep_hour < 12 else 'PM'}",
+                "flightNumber": f"F9 {1000 + idx}",
+                "equipment": "A321neo",
+            }
+        ],
+        "fareClasses": [
+            {
+                "code": code,
+                "price": round(rng.uniform(40, 500), 2),
+                "rules": "Non-refundable. Changes permitted for a fee. " * 3,
+                "bundles": [{"name": b, "price": rng.randint(10, 90)} for b in ("carry-on", "seat", "bag")],
+            }
+            for code in ("ST", "WK", "PR", "EL", "DD", "GW")
+        ],
+    }
+
+
+def synthetic_results_page(origin="SFO", dest="DEN", day="2026-03-02", n_flights=12,
+                           size_kb=RESULTS_PAGE_KB, seed=0):
+    """A results page of roughly `size_kb` KB carrying `n_flights` flights."""
+    rng = random.Random(seed)
+    payload = {
+        "journeys": [
+            {
+                "origin": origin,
+                "destination": dest,
+                "flights": [synthetic_flight(rng, origin, dest, day, i) for i in range(n_flights)],
+            }
+        ],
+        "currency": "USD",
+        "passengers": {"ADT": 1},
+    }
+    journeys_script = (
+        "<script>var FlightData = '"
+        + html.escape(json.dumps(payload), quote=True)
+        + "';</script>"
+    )
+    return _wrap(rng, journeys_script, size_kb)
+
+
+def _wrap(rng, body_script, size_kb):
+    """Surround `body_script` with filler markup and vendor scripts up to size_kb."""
+    head = [
+        "<!DOCTYPE html><html><head><title>Select Flights | Frontier Airlines</title>",
+        '<script>window.dataLayer = window.dataLayer || [];function gtag(){dataLayer.push(arguments);}</script>',
+    ]
+    filler = []
+    size = 0
+    n = 0
+    while size < size_kb * 1024 * 0.85:
+        n += 1
+        if n % 5 == 0:
+            blob = "".join(rng.choices("abcdefghij{}();=", k=4000))
+            chunk = f"<script>/* vendor chunk {n} */ var _c{n} = function(){{ {blob} }};</script>"
+        else:
+            cells = "".join(f"<td class=\"cell c{i}\">{rng.randint(0, 999)}</td>" for i in range(40))
+            chunk = f'<div class="row r{n}"><table><tr>{cells}</tr></table></div>'
+        filler.append(chunk)
+        size += len(chunk)
+    half = len(filler) // 2
+    return (
+        "".join(head)
+        + "</head><body>"
+        + "".join(filler[:half])
+        + body_script
+        + "".join(filler[half:])
+        + "</body></html>"
+    )
+
+
+def synthetic_captcha_page(seed=0):
+    """PerimeterX "Press & Hold" challenge page."""
+    rng = random.Random(seed)
+    return (
+        "<html><head><title>Access to this page has been denied</title>"
+        '<script>window._pxAppId = "PXabc123";</script></head><body>'
+        '<div id="px-captcha"></div>'
+        f"<p>Reference ID {rng.getrandbits(64):x}</p></body></html>"
+    )
+
+
+def synthetic_no_flights_page(seed=0):
+    """A full-size results page whose search returned nothing."""
+    rng = random.Random(seed)
+    return _wrap(rng, "<div class=\"no-flights\">No flights available</div>", RESULTS_PAGE_KB)
+
+
+PORTS = [
+    "Los Angeles, CA", "San Diego, CA", "San Francisco, CA", "Miami, FL",
+    "Fort Lauderdale, FL", "Tampa, FL", "Seattle, WA", "Galveston, TX",
+    "Ensenada, Mexico", "Cabo San Lucas, Mexico", "Nassau, Bahamas", "Cozumel, Mexico",
+]
+
+
+def synthetic_ticker_page(n_rows=400, seed=0):
+    """VacationsToGo ticker: one deal per row, 11 cells (see parse_ticker)."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        was = rng.randint(400, 4000)
+        now = int(was * rng.uniform(0.3, 0.9))
+        rows.append(
+            "<tr>"
+            f'<td><a href="fastdeal.cfm?deal={100000 + i}">#{100000 + i}</a></td>'
+            f"<td>{rng.choice([3, 4, 5, 7, 10, 12, 14])}</td>"
+            f"<td>{rng.choice(['Nov', 'Dec', 'Jan'])} {rng.randint(1, 28)}, 2026</td>"
+            f"<td>{rng.choice(PORTS)}</td><td>{rng.choice(PORTS)}</td>"
+            f"<td>{rng.choice(['Carnival', 'Royal Caribbean', 'Princess'])} / Ship {i % 40}</td>"
+            f"<td>{rng.choice(['3.5', '4.0', '4.5', '5.0'])}</td>"
+            f"<td>${was:,}</td><td>${now:,}</td><td>{int(100 * (1 - now / was))}%</td>"
+            "<td>Ocean view</td></tr>"
+        )
+    return (
+        "<html><body><table><tr><th>Deal</th></tr>"
+        + "".join(rows)
+        + "</table></body></html>"
+    )
+
+
+def synthetic_itinerary_page(n_ports=5, seed=0):
+    """Fastdeal page with the FastdealItinerary table (see parse_itinerary)."""
+    rng = random.Random(seed)
+    ports = [rng.choice(PORTS)] + [
+        "At Sea" if i % 3 == 2 else rng.choice(PORTS) for i in range(n_ports)
+    ] + [rng.choice(PORTS)]
+    rows = "".join(
+        f"<tr><td>Day {d + 1}</td><td>{p}</td><td>8:00 AM</td><td>5:00 PM</td></tr>"
+        for d, p in enumerate(ports)
+    )
+    return _wrap(
+        rng,
+        '<table id="FastdealItinerary"><tr><th>Day</th><th>Port</th>'
+        f"<th>Arrive</th><th>Depart</th></tr>{rows}</table>",
+        120,
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python3 benchmarks/pages.py <corpus-dir>")
+        sys.exit(1)
+    write_corpus(sys.argv[1], synthetic_corpus())
+    print(f"Wrote synthetic corpus to {sys.argv[1]}")
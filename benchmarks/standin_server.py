@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for booking.flyfrontier.com.
+
+Serves recorded InternalSelect pages keyed by o1/d1/dd1 so the scanners can be
+run end to end (and profiled) without the network. Recorded pages live in a
+directory as
+
+    <pages>/SFO-DEN-2026-03-02.html   exact route + date
+    <pages>/SFO-DEN.html              route, any date
+
+and any route without a recording gets a deterministic synthetic page
+(benchmarks/pages.py). Every other path (/, /travel/, ...) answers with a small
+homepage so session warm-ups succeed.
+
+Failure injection, all per request:
+    --latency / --jitter   seconds added before responding
+    --rate-403             fraction answered 403 (PerimeterX block)
+    --rate-captcha         fraction answered 200 with the captcha page
+    --rate-truncated       fraction whose body is cut off mid-transfer
+
+Point the scanners at it with
+
+    FRONTIER_BOOKING_URL=http://127.0.0.1:8765 FRONTIER_HOME_URL=http://127.0.0.1:8765/ \\
+    FRONTIER_DELAY_SCALE=0 python3 gowild_fast.py
+
+or pass base_url= to scan_routes / search_group / search_outbound / search_return.
+GET /__stats returns request counters as JSON.
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from pages import synthetic_captcha_page, synthetic_results_page
+
+HOME_PAGE = b"<html><head><title>Frontier Airlines</title></head><body>Low fares done right</body></html>"
+
+
+def _iso_date(dd1):
+    """'Mar 2, 2026' / 'Mar 02, 2026' -> '2026-03-02' (dd1 as the scanners send it)."""
+    try:
+        return datetime.strptime(dd1.strip(), "%b %d, %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return dd1.strip()
+
+
+class StandinServer:
+    """Threaded stand-in booking server; start() returns its base URL."""
+
+    def __init__(self, pages_dir=None, latency=0.0, jitter=0.0, rate_403=0.0,
+                 rate_captcha=0.0, rate_truncated=0.0, seed=0, host="127.0.0.1", port=0):
+        self.pages_dir = pages_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_403 = rate_403
+        self.rate_captcha = rate_captcha
+        self.rate_truncated = rate_truncated
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._synthetic = {}
+        self.stats = {"requests": 0, "results": 0, "home": 0, "403": 0, "captcha": 0, "truncated": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    # -- page lookup -------------------------------------------------------
+    def page_for(self, origin, dest, dd1):
+        iso = _iso_date(dd1)
+        if self.pages_dir:
+            for name in (f"{origin}-{dest}-{iso}.html", f"{origin}-{dest}.html"):
+                path = os.path.join(self.pages_dir, name)
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        return f.read()
+        key = (origin, dest, iso)
+        with self._lock:
+            page = self._synthetic.get(key)
+        if page is None:
+            seed = zlib.crc32("|".join(key).encode())
+            page = synthetic_results_page(
+                origin=origin, dest=dest, day=iso, n_flights=4 + seed % 12, seed=seed
+            ).encode("utf-8")
+            with self._lock:
+                self._synthetic[key] = page
+        return page
+
+    def _roll(self):
+        """Pick this request's fate: None, '403', 'captcha' or 'truncated'."""
+        with self._lock:
+            r = self._rng.random()
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        for fate, rate in (("403", self.rate_403), ("captcha", self.rate_captcha),
+                           ("truncated", self.rate_truncated)):
+            if r < rate:
+                return fate, delay
+            r -= rate
+        return None, delay
+
+    def _count(self, *keys):
+        with self._lock:
+            for k in keys:
+                self.stats[k] += 1
+
+    # -- HTTP --------------------------------------------------------------
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, declared=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(declared or len(body)))
+                if declared:
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.write(body)
+                if declared:
+                    self.close_connection = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == "/__stats":
+                    with server._lock:
+                        body = json.dumps(server.stats).encode()
+                    return self._send(200, body)
+                server._count("requests")
+                if url.path != "/Flight/InternalSelect":
+                    server._count("home")
+                    return self._send(200, HOME_PAGE)
+
+                server._count("results")
+                q = parse_qs(url.query)
+                origin = q.get("o1", [""])[0].upper()
+                dest = q.get("d1", [""])[0].upper()
+                dd1 = q.get("dd1", [""])[0]
+                fate, delay = server._roll()
+                if delay:
+                    time.sleep(delay)
+                if fate == "403":
+                    server._count("403")
+                    return self._send(403, b"<html><body>Access denied</body></html>")
+                if fate == "captcha":
+                    server._count("captcha")
+                    return self._send(200, synthetic_captcha_page().encode("utf-8"))
+                page = server.page_for(origin, dest, dd1)
+                if fate == "truncated":
+                    server._count("truncated")
+                    return self._send(200, page[: len(page) // 2], declared=len(page))
+                return self._send(200, page)
+
+        return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local stand-in booking server")
+    ap.add_argument("--pages", help="directory of recorded ORIGIN-DEST[-YYYY-MM-DD].html pages")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--rate-403", type=float, default=0.0)
+    ap.add_argument("--rate-captcha", type=float, default=0.0)
+    ap.add_argument("--rate-truncated", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    server = StandinServer(
+        pages_dir=args.pages, latency=args.latency, jitter=args.jitter,
+        rate_403=args.rate_403, rate_captcha=args.rate_captcha,
+        rate_truncated=args.rate_truncated, seed=args.seed,
+        host=args.host, port=args.port,
+    )
+    print(f"Stand-in booking server on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Browser profile and HTTP cookies that survive from one run to the next.
+
+Every launchd run of the deal report started Chrome on a brand-new profile
+and warmed it up on flyfrontier.com, so the static assets, the HTTP cache and
+the session state were downloaded again each night; the requests-based
+scanners likewise started from an empty cookie jar.
+
+Chrome profile (opt-in, CHROME_PROFILE_DIR): build_driver launches through
+launch_with_profile(), which points Chrome at a persistent user-data dir, one
+subdirectory per concurrent browser (the thread that builds it keeps its
+slot, so pool worker N reuses profile N every night). Lock files left by a
+Chrome that was killed (e.g. the Mac went to sleep) are cleared first. If
+Chrome still won't start on the stored profile, the profile is moved aside
+(<slot>.corrupt) and Chrome starts again on a fresh one.
+
+Cookie jar (on by default): create_session restores the scanner's cookies
+from results/cookies/<name>@<booking host>.txt (Mozilla format) and they are
+written back at exit. Each booking host gets its own jar, so a run against
+the stand-in server never overwrites the flyfrontier.com cookies. Cookies
+past their expiry are dropped on load; session cookies (no expiry) are only
+reused while the jar is younger than COOKIE_SESSION_HOURS. A jar that can't
+be read is discarded.
+
+The jar is on by default and the profile is not. The jar is a few KB under
+results/, like the route cache and the fare store, and a bad one costs one
+cold session. A Chrome profile is hundreds of MB wherever the user puts it,
+and Chrome can refuse to start on it, so it stays opt-in.
+
+    restored = restore_cookies(session, "gowild_fast")   # also saves at exit
+    driver = launch_with_profile(lambda profile: uc.Chrome(..., user_data_dir=profile))
+
+Settings (env vars):
+    CHROME_PROFILE_DIR=~/.frontier-chrome   persistent Chrome profile (unset: fresh each run)
+    COOKIE_JAR=0                             disable the on-disk cookie jar
+    COOKIE_SESSION_HOURS=12                  max age for reusing session cookies
+"""
+
+import atexit
+import http.cookiejar
+import os
+import shutil
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import BOOKING_BASE_URL
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_DIR = os.environ.get("CHROME_PROFILE_DIR")
+COOKIE_DIR = os.path.join(BASE_DIR, "results", "cookies")
+COOKIE_JAR_ENABLED = os.environ.get("COOKIE_JAR", "1") == "1"
+COOKIE_SESSION_HOURS = float(os.environ.get("COOKIE_SESSION_HOURS", "12"))
+
+# Chrome's single-instance locks; stale ones stop it starting on the profile.
+LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+
+_slots = threading.local()
+_next_slot = [0]
+_slot_lock = threading.Lock()
+
+
+# -- Chrome profile -------------------------------------------------------
+def profile_dir(base=None):
+    """This thread's persistent profile directory, or None when not enabled."""
+    base = PROFILE_DIR if base is None else base
+    if not base:
+        return None
+    if getattr(_slots, "slot", None) is None:
+        with _slot_lock:
+            _slots.slot = _next_slot[0]
+            _next_slot[0] += 1
+    return os.path.join(os.path.expanduser(base), str(_slots.slot))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def clear_stale_locks(path):
+    """Remove Chrome's lock files if the Chrome that held them is gone."""
+    lock = os.path.join(path, "SingletonLock")
+    try:
+        owner = os.readlink(lock)  # "<hostname>-<pid>"
+    except OSError:
+        owner = None
+    if owner is not None:
+        try:
+            if _pid_alive(int(owner.rsplit("-", 1)[-1])):
+                return False
+        except ValueError:
+            pass
+    removed = False
+    for name in LOCK_FILES:
+        try:
+            os.remove(os.path.join(path, name))
+            removed = True
+        except OSError:
+            pass
+    return removed
+
+
+def launch_with_profile(launch, base=None):
+    """launch(user_data_dir) -> driver, on the persistent profile if enabled.
+
+    Falls back to a fresh profile in the same place when Chrome fails to
+    start on the stored one.
+    """
+    path = profile_dir(base)
+    if path is None:
+        return launch(None)
+    os.makedirs(path, exist_ok=True)
+    clear_stale_locks(path)
+    try:
+        return launch(path)
+    except Exception as e:
+        if not os.listdir(path):
+            raise  # nothing stored to blame: not a profile problem
+        aside = path + ".corrupt"
+        print(f"⚠️  Chrome profile {path} failed to start ({type(e).__name__}); "
+              f"starting fresh (old profile kept at {aside})")
+        shutil.rmtree(aside, ignore_errors=True)
+        os.replace(path, aside)
+        os.makedirs(path, exist_ok=True)
+        return launch(path)
+
+
+# -- cookie jar -----------------------------------------------------------
+def cookie_path(name, directory=COOKIE_DIR, site=None):
+    """The jar for scanner `name` on booking host `site` (default: the booking host)."""
+    host = urlsplit(site or BOOKING_BASE_URL).netloc.replace(":", "_")
+    return os.path.join(directory, f"{name}@{host}.txt")
+
+
+def _jar(session):
+    # requests' cookies are a CookieJar; curl_cffi wraps one in .jar
+    return getattr(session.cookies, "jar", session.cookies)
+
+
+def save_cookies(session, name, directory=COOKIE_DIR, site=None):
+    """Write the session's cookies (session cookies included) to disk."""
+    path = cookie_path(name, directory, site)
+    jar = http.cookiejar.MozillaCookieJar(path)
+    for cookie in _jar(session):
+        jar.set_cookie(cookie)
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    jar.save(tmp, ignore_discard=True)
+    os.replace(tmp, path)
+
+
+def restore_cookies(session, name, directory=COOKIE_DIR, enabled=None,
+                    session_hours=None, save_at_exit=True, site=None):
+    """Load unexpired cookies for `name` into the session; returns the count.
+
+    With save_at_exit the session's cookies are written back when the
+    process exits, so the next run starts where this one left off.
+    """
+    if not (COOKIE_JAR_ENABLED if enabled is None else enabled):
+        return 0
+    session_hours = COOKIE_SESSION_HOURS if session_hours is None else session_hours
+    if save_at_exit:
+        atexit.register(save_cookies, session, name, directory, site)
+    path = cookie_path(name, directory, site)
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return 0
+    jar = http.cookiejar.MozillaCookieJar(path)
+    try:
+        jar.load(ignore_discard=age < session_hours * 3600, ignore_expires=False)
+    except (OSError, ValueError, http.cookiejar.LoadError) as e:
+        print(f"⚠️  Cookie jar {path} unreadable ({type(e).__name__}); starting empty")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return 0
+    target = _jar(session)
+    restored = 0
+    for cookie in jar:  # load() already dropped the expired ones
+        target.set_cookie(cookie)
+        restored += 1
+    return restored
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for long scans, so a crash doesn't mean starting over.
+
+A date-range scan in gowild_fast.py or a roundtrip_search.py run is hundreds
+of routes at 15-25 s each. Every finished (origin, dest, date) is appended to
+a JSON-lines journal under results/checkpoints/ with its outcome and, when it
+had GoWild fares, its results entry (flights as compact records). Run the
+same scan again with --resume and completed routes come back from the
+journal without a page load; only the rest is fetched:
+
+    python3 gowild_fast.py --resume
+    python3 roundtrip_search.py --resume
+
+Outcomes:
+    ok            GoWild fares found (entry stored)
+    none          page parsed, no GoWild fares
+    rate_limited  captcha / 403: re-queued on resume
+    no_data       no journeys payload (network error, bad page): re-queued
+
+The journal is named after the scan's parameters (script, origin, dates,
+destinations), so --resume picks up the matching scan and a different scan
+starts its own. Without --resume an existing journal for the same scan is
+started afresh. The last line of a journal cut short by a crash is ignored.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config import iso_date
+from records import FlightRecord
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_DIR = os.path.join(BASE_DIR, "results", "checkpoints")
+
+DONE = frozenset({"ok", "none"})
+FAILED = frozenset({"rate_limited", "no_data"})
+
+
+def route_status(data, entry):
+    """Journal outcome for a fetched route that wasn't rate limited."""
+    if entry:
+        return "ok"
+    return "none" if data else "no_data"
+
+
+def _pack(entry):
+    packed = {k: v for k, v in entry.items() if k != "flights"}
+    packed["flights"] = [
+        [getattr(f, name) for name in FlightRecord.__slots__] for f in entry["flights"]
+    ]
+    return packed
+
+
+def _unpack(packed):
+    entry = dict(packed)
+    entry["flights"] = [FlightRecord(*values) for values in packed["flights"]]
+    return entry
+
+
+class Checkpoint:
+    """Append-only journal of finished routes for one scan; thread-safe."""
+
+    def __init__(self, name, params, resume=False, meta=None,
+                 directory=CHECKPOINT_DIR):
+        ident = json.dumps(params, sort_keys=True, default=str)
+        key = hashlib.sha256(ident.encode("utf-8")).hexdigest()[:12]
+        self.path = os.path.join(directory, f"{name}_{key}.jsonl")
+        self.meta = dict(meta or {})
+        self.resumed = 0
+        self._routes = {}  # (origin, dest, date) -> (status, packed entry)
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        if resume and os.path.exists(self.path):
+            self._load()
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write({"params": params, "meta": self.meta, "started": time.time()})
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.readlines()
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line from a crash
+            if "meta" in rec:
+                self.meta = {**self.meta, **rec["meta"]}
+            elif "status" in rec:
+                route = (rec["origin"], rec["dest"], rec["date"])
+                self._routes[route] = (rec["status"], rec.get("entry"))
+        self.resumed = sum(1 for status, _ in self._routes.values() if status in DONE)
+        if lines and not lines[-1].endswith("\n"):
+            # Start the next record on a fresh line after a torn write.
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+    def _write(self, rec):
+        self._file.write(json.dumps(rec, default=str) + "\n")
+        self._file.flush()
+
+    @staticmethod
+    def _route(origin, dest, date):
+        return origin.upper(), dest.upper(), iso_date(date)
+
+    def record(self, origin, dest, date, status, entry=None):
+        """Journal one finished route (entry: its results dict, if any)."""
+        route = self._route(origin, dest, date)
+        packed = _pack(entry) if entry else None
+        rec = {"origin": route[0], "dest": route[1], "date": route[2], "status": status}
+        if packed:
+            rec["entry"] = packed
+        with self._lock:
+            self._routes[route] = (status, packed)
+            self._write(rec)
+
+    def done(self, origin, dest, date):
+        """True when the route finished (ok or none) in this scan."""
+        status = self._routes.get(self._route(origin, dest, date), (None,))[0]
+        return status in DONE
+
+    def entry(self, origin, dest, date):
+        """The journaled results entry for a finished route, or None."""
+        status, packed = self._routes.get(self._route(origin, dest, date), (None, None))
+        return _unpack(packed) if status == "ok" and packed else None
+
+    def restore(self, origin, destinations, date):
+        """Split {dest: name} into (still to scan, {dest: entry} from the journal)."""
+        pending, restored = {}, {}
+        for code, name in destinations.items():
+            if not self.done(origin, code, date):
+                pending[code] = name
+            else:
+                entry = self.entry(origin, code, date)
+                if entry:
+                    restored[code] = entry
+        return pending, restored
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def summary(self):
+        counts = {}
+        for status, _ in self._routes.values():
+            counts[status] = counts.get(status, 0) + 1
+        done = sum(counts.get(s, 0) for s in DONE)
+        failed = sum(counts.get(s, 0) for s in FAILED)
+        text = f"Checkpoint: {done} routes done, {failed} failed"
+        if self.resumed:
+            text += f" ({self.resumed} resumed without a page load)"
+        return f"{text} → {self.path}"
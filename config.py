@@ -6,6 +6,10 @@ Blackout dates source: https://www.flyfrontier.com/deals/gowild-pass/
 Last updated: November 2025
 """
 
+import os
+import time
+from datetime import date, datetime
+
 # ============================================================
 # GOWILD BLACKOUT DATES
 # ============================================================
@@ -146,6 +150,19 @@ GOWILD_BLACKOUT_DATES = (
     GOWILD_BLACKOUT_DATES_2025 + GOWILD_BLACKOUT_DATES_2026 + GOWILD_BLACKOUT_DATES_2027
 )
 
+# Precomputed lookups, built once at import so a check costs the same however
+# long the lists grow: a frozenset of the ISO strings, and a one-byte-per-day
+# bitmap indexed by date ordinal (date.toordinal() - BLACKOUT_FIRST_ORDINAL)
+# for date/datetime objects, which then never need formatting to a string.
+BLACKOUT_DATE_SET = frozenset(GOWILD_BLACKOUT_DATES)
+_blackout_ordinals = {date.fromisoformat(d).toordinal() for d in BLACKOUT_DATE_SET}
+BLACKOUT_FIRST_ORDINAL = min(_blackout_ordinals)
+BLACKOUT_BITMAP = bytes(
+    1 if o in _blackout_ordinals else 0
+    for o in range(BLACKOUT_FIRST_ORDINAL, max(_blackout_ordinals) + 1)
+)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()  # datetime64 day 0
+
 # ============================================================
 # ORIGIN AIRPORTS
 # ============================================================
@@ -202,22 +219,145 @@ DOMESTIC_DESTINATIONS = {
 # Combined list (international first), used by the single-shot browser scripts.
 SFO_DIRECT_DESTINATIONS = {**INTERNATIONAL_DESTINATIONS, **DOMESTIC_DESTINATIONS}
 
+# ============================================================
+# BOOKING SITE
+# ============================================================
+# Every scanner builds its URLs from these. Point them at a local stand-in
+# (benchmarks/standin_server.py) with FRONTIER_BOOKING_URL / FRONTIER_HOME_URL
+# to run the full pipeline without the network. FRONTIER_DELAY_SCALE scales
+# every politeness sleep (0 = no sleeping; only sensible against a stand-in).
+
+PRODUCTION_BOOKING_URL = "https://booking.flyfrontier.com"
+BOOKING_BASE_URL = os.environ.get("FRONTIER_BOOKING_URL", PRODUCTION_BOOKING_URL).rstrip("/")
+HOME_URL = os.environ.get("FRONTIER_HOME_URL", "https://www.flyfrontier.com/")
+DELAY_SCALE = float(os.environ.get("FRONTIER_DELAY_SCALE", "1"))
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
 
-def is_blackout_date(date_str):
+def is_blackout_date(value):
     """
-    Check if a date is a GoWild blackout date.
+    Check if a date is a GoWild blackout date (O(1), see BLACKOUT_BITMAP).
 
     Args:
-        date_str: Date string in YYYY-MM-DD format
+        value: Date string in YYYY-MM-DD format, or a date/datetime
 
     Returns:
         bool: True if date is a blackout date, False otherwise
     """
-    return date_str in GOWILD_BLACKOUT_DATES
+    if isinstance(value, str):
+        return value in BLACKOUT_DATE_SET
+    i = value.toordinal() - BLACKOUT_FIRST_ORDINAL
+    return 0 <= i < len(BLACKOUT_BITMAP) and BLACKOUT_BITMAP[i] == 1
+
+
+def blackout_mask(dates):
+    """
+    Check many dates at once: one vectorised BLACKOUT_BITMAP lookup.
+
+    Each date becomes an ordinal once (ISO strings that aren't blackout
+    dates skip the parse), then the whole batch indexes the bitmap in one
+    NumPy step. A numpy datetime64 array skips the per-date step entirely.
+    Without NumPy the same answer comes from a loop.
+
+    Args:
+        dates: Iterable of YYYY-MM-DD strings and/or date/datetime objects,
+            or a numpy datetime64 array
+
+    Returns:
+        list: One bool per date, True where it is a blackout date
+    """
+    try:
+        import numpy as np  # optional, like roundtrip_engine; imported on first use
+    except ImportError:
+        np = None
+    if np is None:
+        return [is_blackout_date(value) for value in dates]
+
+    if isinstance(dates, np.ndarray) and dates.dtype.kind == "M":
+        ordinals = dates.astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+    else:
+        dates = list(dates)
+        try:  # all date/datetime: the common case, no per-date type check
+            ordinals = np.fromiter(map(date.toordinal, dates), np.int64, len(dates))
+        except TypeError:
+            ordinals = np.fromiter(
+                (
+                    (date.fromisoformat(value).toordinal() if value in BLACKOUT_DATE_SET else -1)
+                    if isinstance(value, str)
+                    else value.toordinal()
+                    for value in dates
+                ),
+                np.int64,
+                len(dates),
+            )
+    bitmap = np.frombuffer(BLACKOUT_BITMAP, dtype=np.uint8)
+    index = ordinals - BLACKOUT_FIRST_ORDINAL
+    inside = (index >= 0) & (index < bitmap.size)
+    mask = np.zeros(index.size, dtype=bool)
+    mask[inside] = bitmap[index[inside]] == 1
+    return mask.tolist()
+
+
+def split_blackout_dates(dates):
+    """
+    Partition dates into searchable and blackout dates, keeping their order.
+
+    Args:
+        dates: Iterable of YYYY-MM-DD strings and/or date/datetime objects
+
+    Returns:
+        tuple: (searchable, blackout) lists
+    """
+    dates = list(dates)
+    searchable, blackout = [], []
+    for value, blocked in zip(dates, blackout_mask(dates)):
+        (blackout if blocked else searchable).append(value)
+    return searchable, blackout
+
+
+def blackout_dates_between(start, end):
+    """
+    List the blackout dates in an inclusive date range.
+
+    Args:
+        start: First date (date/datetime)
+        end: Last date (date/datetime)
+
+    Returns:
+        list: date objects that are blackout dates, in order
+    """
+    lo = max(start.toordinal() - BLACKOUT_FIRST_ORDINAL, 0)
+    hi = min(end.toordinal() - BLACKOUT_FIRST_ORDINAL, len(BLACKOUT_BITMAP) - 1)
+    return [
+        date.fromordinal(BLACKOUT_FIRST_ORDINAL + i)
+        for i in range(lo, hi + 1)
+        if BLACKOUT_BITMAP[i]
+    ]
+
+
+def iso_date(value):
+    """
+    Normalize any date form the scripts pass around to YYYY-MM-DD.
+
+    Args:
+        value: date/datetime, 'YYYY-MM-DD', display form 'Dec 11, 2025' or the
+            URL form used in dd1 ('Dec%2011,%202025')
+
+    Returns:
+        str: Date in YYYY-MM-DD format (the input unchanged if unrecognized)
+    """
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    text = value.replace("%20", " ").replace("%2C", ",").strip()
+    for fmt in ("%Y-%m-%d", "%b %d, %Y"):
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return value
 
 
 def get_destination_name(code):
@@ -241,3 +381,34 @@ def get_all_destination_codes():
         list: List of 3-letter airport codes
     """
     return list(SFO_DIRECT_DESTINATIONS.keys())
+
+
+def booking_url(origin, dest, date_url, base_url=None):
+    """
+    Build the InternalSelect results URL for one route and date.
+
+    Args:
+        origin: 3-letter origin airport code
+        dest: 3-letter destination airport code
+        date_url: URL-encoded date as the site expects it (e.g. 'Dec%2011,%202025')
+        base_url: Booking host to use instead of BOOKING_BASE_URL
+
+    Returns:
+        str: Full results-page URL
+    """
+    base = (base_url or BOOKING_BASE_URL).rstrip("/")
+    return (
+        f"{base}/Flight/InternalSelect?"
+        f"o1={origin}&d1={dest}&dd1={date_url}&ADT=1&mon=true&promo="
+    )
+
+
+def polite_sleep(seconds):
+    """
+    Sleep for a politeness/page-load delay, scaled by FRONTIER_DELAY_SCALE.
+
+    Args:
+        seconds: Delay the live site needs
+    """
+    if seconds > 0 and DELAY_SCALE > 0:
+        time.sleep(seconds * DELAY_SCALE)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+GoWild connections through a hub, built from flights already scanned.
+
+Every scanner looks at one origin -> destination route at a time. When there
+is no GoWild fare on SFO -> CUN but there is one on SFO -> DEN and another on
+DEN -> CUN that leaves after the first lands, the data to book it is already
+in the fare store. This module chains those one-ways.
+
+The graph is time-expanded: every flight is a node, and a flight landing at
+a hub connects to each departure from that hub inside the connection window
+(at least --min-connect minutes later; same calendar day unless overnight
+connections are allowed; at most --max-connect hours). Departures per
+airport are kept sorted, so a flight's onward connections are one bisect
+away. Fares are non-negative, so a best-first search pops itineraries at the
+destination cheapest first, pruned by max_price and the leg limit. It is
+the k-shortest-paths variant of Dijkstra: a state (flight, legs used,
+airports visited) is expanded up to k times, once per distinct prefix
+reaching it, because the k cheapest itineraries can share a flight and
+differ only before it. Everything after a flight depends on that state
+alone, so the k cheapest prefixes per state are all the search needs.
+Both times at a hub are local to that hub (the page's departureDate /
+arrivalDate), so connection times need no time zones.
+
+    python3 connections.py SFO CUN --date 2026-03-02
+    python3 connections.py SFO CUN --date 2026-03-02 --overnight --max-price 120
+
+Flights come from the fare store's latest run per route and date
+(flights_from_store), or straight from get_flight_data output
+(flights_from_journeys).
+"""
+
+import argparse
+import heapq
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date as date_cls, datetime, timedelta
+
+from config import iso_date
+from fare_store import DB_PATH, GOWILD, FareStore
+
+Flight = namedtuple("Flight", "origin dest departs arrives price flight_no")
+Itinerary = namedtuple("Itinerary", "price flights")
+
+MIN_CONNECT = timedelta(minutes=60)
+MAX_CONNECT = timedelta(hours=24)
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flights_from_journeys(origin, dest, data):
+    """GoWild Flights from one route's get_flight_data journeys payload."""
+    journeys = (data or {}).get("journeys") or [{}]
+    flights = []
+    for f in journeys[0].get("flights") or []:
+        gw = f.get("goWildFare")
+        legs = f.get("legs") or []
+        if not f.get("isGoWildFareEnabled") or not gw or not legs:
+            continue
+        departs = _parse_time(legs[0].get("departureDate"))
+        arrives = _parse_time(legs[-1].get("arrivalDate"))
+        if departs and arrives:
+            flights.append(Flight(origin, dest, departs, arrives, float(gw),
+                                  legs[0].get("flightNumber")))
+    return flights
+
+
+def flights_from_store(store, day, days=2, fare_type=GOWILD):
+    """Flights dated `day` .. day + days - 1 from the fare store.
+
+    Each route and date contributes only the flights seen by the latest run
+    that scanned it, whatever that run found. A route whose last scan had no
+    fare_type fare (or no fare at all) contributes nothing, so a stale fare
+    from an older run never shadows a fresh one.
+    """
+    start = date_cls.fromisoformat(iso_date(day))
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+    in_dates = f"flight_date IN ({', '.join('?' * len(dates))})"
+    store.flush()
+    # fares rows stand in for scans rows recorded before the scans table.
+    rows = store.connect().execute(
+        f"""
+        WITH latest AS (
+            SELECT origin, dest, flight_date, MAX(run_id) AS run_id
+            FROM (SELECT origin, dest, flight_date, run_id FROM scans WHERE {in_dates}
+                  UNION ALL
+                  SELECT origin, dest, flight_date, run_id FROM fares WHERE {in_dates})
+            GROUP BY origin, dest, flight_date
+        )
+        SELECT f.origin, f.dest, f.departs_at, f.arrives_at, MIN(f.price), f.flight_no
+        FROM fares f JOIN latest l
+          ON f.origin = l.origin AND f.dest = l.dest
+         AND f.flight_date = l.flight_date AND f.run_id = l.run_id
+        WHERE f.fare_type = ?
+        GROUP BY f.origin, f.dest, f.departs_at, f.arrives_at, f.flight_no
+        """,
+        (*dates, *dates, fare_type),
+    ).fetchall()
+    flights = []
+    for origin, dest, dep, arr, price, flight_no in rows:
+        departs, arrives = _parse_time(dep), _parse_time(arr)
+        if departs and arrives:
+            flights.append(Flight(origin, dest, departs, arrives, price, flight_no))
+    return flights
+
+
+class ConnectionGraph:
+    """Time-expanded flight graph: departures per airport, sorted by time."""
+
+    def __init__(self, flights):
+        by_airport = {}
+        for f in flights:
+            by_airport.setdefault(f.origin, []).append(f)
+        self.departures = {}
+        self.times = {}
+        for airport, deps in by_airport.items():
+            deps.sort(key=lambda f: (f.departs, f.price))
+            self.departures[airport] = deps
+            self.times[airport] = [f.departs for f in deps]
+        self.n_flights = sum(len(d) for d in self.departures.values())
+
+    def _window(self, airport, earliest, latest):
+        times = self.times.get(airport)
+        if not times:
+            return ()
+        lo = bisect_left(times, earliest)
+        hi = bisect_right(times, latest)
+        return self.departures[airport][lo:hi]
+
+    def cheapest(self, origin, dest, day, k=5, max_legs=2, min_connect=MIN_CONNECT,
+                 max_connect=MAX_CONNECT, overnight=False, max_price=None):
+        """The k cheapest itineraries origin -> dest leaving on `day`.
+
+        Connections leave at least min_connect and at most max_connect after
+        the previous leg lands, on the same calendar day unless overnight.
+        Itineraries never revisit an airport; direct flights count as one leg.
+        """
+        start = datetime.fromisoformat(iso_date(day))
+        first = self._window(origin, start, start + timedelta(days=1) - timedelta(microseconds=1))
+        heap = []
+        seq = 0
+        for f in first:
+            if max_price is None or f.price <= max_price:
+                heap.append((f.price, seq, f, 1, None))
+                seq += 1
+        heapq.heapify(heap)
+
+        expanded = {}  # (flight, legs, airports visited) -> prefixes expanded
+        found = []
+        while heap and len(found) < k:
+            cost, _, f, legs, parent = heapq.heappop(heap)
+            node = (f, parent)
+            if f.dest == dest:
+                # Every push is a distinct path, so arrivals are never merged.
+                found.append(Itinerary(cost, _path(node)))
+                continue
+            if legs >= max_legs:
+                continue
+            visited = _airports(node)
+            state = (f, legs, frozenset(visited))
+            if expanded.get(state, 0) >= k:
+                continue  # k cheaper prefixes already continue from here
+            expanded[state] = expanded.get(state, 0) + 1
+            earliest = f.arrives + min_connect
+            latest = f.arrives + max_connect
+            if not overnight:
+                latest = min(latest, datetime.combine(f.arrives.date(), datetime.max.time()))
+            for nxt in self._window(f.dest, earliest, latest):
+                total = cost + nxt.price
+                if nxt.dest in visited or (max_price is not None and total > max_price):
+                    continue
+                heapq.heappush(heap, (total, seq, nxt, legs + 1, node))
+                seq += 1
+        return found
+
+
+def _path(node):
+    flights = []
+    while node is not None:
+        flights.append(node[0])
+        node = node[1]
+    return flights[::-1]
+
+
+def _airports(node):
+    airports = set()
+    while node is not None:
+        airports.add(node[0].origin)
+        airports.add(node[0].dest)
+        node = node[1]
+    return airports
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cheapest GoWild connections from scanned flights")
+    ap.add_argument("origin")
+    ap.add_argument("dest")
+    ap.add_argument("--date", default=(date_cls.today() + timedelta(days=1)).isoformat(),
+                    help="departure date (default: tomorrow)")
+    ap.add_argument("--db", default=DB_PATH)
+    ap.add_argument("--min-connect", type=int, default=60, help="minutes")
+    ap.add_argument("--max-connect", type=float, default=24, help="hours")
+    ap.add_argument("--overnight", action="store_true", help="allow overnight connections")
+    ap.add_argument("--max-price", type=float)
+    ap.add_argument("--legs", type=int, default=2)
+    ap.add_argument("-k", type=int, default=5)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    flights = flights_from_store(FareStore(args.db), args.date, days=1 + args.overnight)
+    graph = ConnectionGraph(flights)
+    t1 = time.perf_counter()
+    origin, dest = args.origin.upper(), args.dest.upper()
+    found = graph.cheapest(
+        origin, dest, args.date, k=args.k, max_legs=args.legs,
+        min_connect=timedelta(minutes=args.min_connect),
+        max_connect=timedelta(hours=args.max_connect),
+        overnight=args.overnight, max_price=args.max_price,
+    )
+    t2 = time.perf_counter()
+
+    print(f"✈️  {origin} → {dest} on {args.date} "
+          f"({graph.n_flights} GoWild flights loaded in {(t1 - t0) * 1000:.0f} ms, "
+          f"searched in {(t2 - t1) * 1000:.1f} ms)")
+    if not found:
+        print("   No GoWild itinerary found 😔")
+    for idx, it in enumerate(found, 1):
+        via = " → ".join([it.flights[0].origin] + [f.dest for f in it.flights])
+        print(f"{idx}. ${it.price:.2f}  {via}")
+        for f in it.flights:
+            print(f"     {f.flight_no or 'F9'}  {f.origin} {f.departs:%a %H:%M} → "
+                  f"{f.dest} {f.arrives:%a %H:%M}  ${f.price:.2f}")
+
+
+if __name__ == "__main__":
+    main()
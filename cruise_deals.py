@@ -33,6 +33,7 @@ from selenium.webdriver.support.ui import Select
 
 # Reuse the arch-safe Chrome driver builder from the flight checker.
 from gowild_deal_report import build_driver
+from page_wait import ITINERARY_READY_JS, READY_STATS, wait_until_ready
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CACHE_PATH = os.path.join(BASE_DIR, "results", "cruise_deals.json")
@@ -174,14 +175,17 @@ def parse_itinerary(html):
 
 
 def fetch_itineraries(driver, deals, wait=6):
-    """Visit each deal's fastdeal page and attach its ports of call as d['ports']."""
+    """Visit each deal's fastdeal page and attach its ports of call as d['ports'].
+
+    `wait` caps how long to wait for the itinerary table on each page.
+    """
     for d in deals:
         d.setdefault("ports", [])
         if not d.get("link"):
             continue
         try:
             driver.get(d["link"])
-            time.sleep(wait)
+            wait_until_ready(driver, ITINERARY_READY_JS, wait, kind="itinerary")
             d["ports"] = parse_itinerary(driver.page_source)
             print(f"  itinerary {d['id']}: {len(d['ports'])} stops")
         except Exception as e:
@@ -357,6 +361,8 @@ def main():
     deals, checked_at, from_cache = get_cruise_deals(force=force)
     section = build_cruise_section(deals, checked_at, from_cache)
     print("\n" + section)
+    if not from_cache:
+        print(READY_STATS.summary())
 
 
 if __name__ == "__main__":
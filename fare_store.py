@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Persistent fare history in one SQLite file (results/fares.sqlite3).
+
+Every scanner records each freshly fetched route into the store (route-cache
+hits are not re-recorded): one row per flight per fare type offered (GoWild,
+Discount Den), tagged with the run that saw it, plus one scans row per route
+and date with the run's fare count, written even when that count is 0, so
+"scanned, no fare" is told apart from "never scanned". Runs are opened lazily on the
+first record and named after the running script, so a scanner only has to
+call FARE_STORE.record(...). Rows are buffered and written with executemany
+in batches; the database runs in WAL mode so a query from another terminal
+never blocks a scan.
+
+    python3 fare_store.py cheapest SFO CUN                 # GoWild, last 30 runs
+    python3 fare_store.py cheapest SFO CUN --type "Discount Den" --runs 10
+    python3 fare_store.py runs                              # recent runs
+
+Set FARE_STORE=0 to disable recording.
+"""
+
+import argparse
+import atexit
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+from config import iso_date
+from records import FareType
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "results", "fares.sqlite3")
+STORE_ENABLED = os.environ.get("FARE_STORE", "1") == "1"
+BATCH_SIZE = 500
+
+GOWILD = FareType.GOWILD.value
+DISCOUNT_DEN = FareType.DISCOUNT_DEN.value
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    scanner     TEXT NOT NULL,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS fares (
+    id          INTEGER PRIMARY KEY,
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    origin      TEXT NOT NULL,
+    dest        TEXT NOT NULL,
+    flight_date TEXT NOT NULL,      -- YYYY-MM-DD
+    fare_type   TEXT NOT NULL,      -- GoWild / Discount Den
+    price       REAL NOT NULL,
+    seats       INTEGER,
+    stops       TEXT,
+    duration    TEXT,
+    flight_no   TEXT,
+    departs_at  TEXT,               -- local ISO timestamps from the page
+    arrives_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS scans (
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    origin      TEXT NOT NULL,
+    dest        TEXT NOT NULL,
+    flight_date TEXT NOT NULL,      -- YYYY-MM-DD
+    fares       INTEGER NOT NULL,   -- fares rows this run recorded for it
+    PRIMARY KEY (origin, dest, flight_date, run_id)
+);
+CREATE INDEX IF NOT EXISTS scans_run ON scans (run_id);
+CREATE INDEX IF NOT EXISTS fares_route_type_run
+    ON fares (origin, dest, fare_type, run_id);
+CREATE INDEX IF NOT EXISTS fares_route_date
+    ON fares (origin, dest, flight_date, fare_type);
+CREATE INDEX IF NOT EXISTS fares_date_type_price
+    ON fares (flight_date, fare_type, price);
+"""
+
+_INSERT = (
+    "INSERT INTO fares (run_id, origin, dest, flight_date, fare_type, price, seats,"
+    " stops, duration, flight_no, departs_at, arrives_at)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# A route scanned twice in one run (e.g. by two passes) adds up its fares.
+_INSERT_SCAN = (
+    "INSERT INTO scans (run_id, origin, dest, flight_date, fares) VALUES (?, ?, ?, ?, ?)"
+    " ON CONFLICT (origin, dest, flight_date, run_id) DO UPDATE"
+    " SET fares = fares + excluded.fares"
+)
+
+
+def _seats(val):
+    """Seats remaining come as an int or as text ("2 Seats Left!")."""
+    if isinstance(val, (int, float)):
+        return int(val)
+    m = re.search(r"\d+", str(val or ""))
+    return int(m.group()) if m else None
+
+
+def fare_rows(origin, dest, flight_date, flights):
+    """(fare_type, price, seats, stops, duration, flight_no, departs_at,
+    arrives_at) for every fare offered in a route's flight list."""
+    rows = []
+    for f in flights or []:
+        legs = f.get("legs") or [{}]
+        common = (
+            f.get("stopsText"),
+            f.get("duration"),
+            legs[0].get("flightNumber"),
+            legs[0].get("departureDate"),
+            legs[-1].get("arrivalDate"),
+        )
+        gw = f.get("goWildFare")
+        if f.get("isGoWildFareEnabled") and gw:
+            rows.append((GOWILD, float(gw), _seats(f.get("goWildFareSeatsRemaining")), *common))
+        dd = f.get("discountDenFare")
+        if dd:
+            rows.append((DISCOUNT_DEN, float(dd), _seats(f.get("discountDenFareSeatsRemaining")), *common))
+    return rows
+
+
+class FareStore:
+    """Append-only fare history; thread-safe, batched, one run per process."""
+
+    def __init__(self, path=DB_PATH, enabled=STORE_ENABLED, scanner=None):
+        self.path = path
+        self.enabled = enabled
+        self.scanner = scanner
+        self.run_id = None
+        self.recorded = 0
+        self._conn = None
+        self._pending = []
+        self._pending_scans = []
+        self._lock = threading.Lock()
+
+    # -- connection --------------------------------------------------------
+    def connect(self):
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @property
+    def scanner_name(self):
+        """The runs.scanner this process records under (the script's name)."""
+        return self.scanner or os.path.splitext(os.path.basename(sys.argv[0]))[0] or "python"
+
+    def _begin_run(self):
+        conn = self.connect()
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO runs (scanner, started_at) VALUES (?, ?)",
+                (self.scanner_name, datetime.now().isoformat(timespec="seconds")),
+            )
+        self.run_id = cur.lastrowid
+        atexit.register(self.close)
+
+    # -- writing -----------------------------------------------------------
+    def record(self, origin, dest, date, data):
+        """Record a route's journeys data (or a bare flight list) for this run.
+
+        A route with no fares still gets its scans row; data=None (nothing
+        fetched) records nothing.
+        """
+        if not self.enabled or data is None:
+            return
+        flights = data
+        if isinstance(data, dict):
+            journeys = data.get("journeys") or [{}]
+            flights = journeys[0].get("flights") or []
+        rows = fare_rows(origin, dest, iso_date(date), flights)
+        with self._lock:
+            if self.run_id is None:
+                self._begin_run()
+            head = (self.run_id, origin, dest, iso_date(date))
+            self._pending.extend(head + row for row in rows)
+            self._pending_scans.append(head + (len(rows),))
+            self.recorded += len(rows)
+            if len(self._pending) + len(self._pending_scans) >= BATCH_SIZE:
+                self._flush()
+
+    def _flush(self):
+        if self._pending or self._pending_scans:
+            with self._conn:
+                self._conn.executemany(_INSERT, self._pending)
+                self._conn.executemany(_INSERT_SCAN, self._pending_scans)
+            self._pending = []
+            self._pending_scans = []
+
+    def flush(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+
+    def close(self):
+        """Write what is buffered and stamp the run as finished."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush()
+            if self.run_id is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE runs SET finished_at = ? WHERE id = ?",
+                        (datetime.now().isoformat(timespec="seconds"), self.run_id),
+                    )
+            self._conn.close()
+            self._conn = None
+            self.run_id = None
+
+    # -- queries -----------------------------------------------------------
+    def cheapest(self, origin, dest, fare_type=GOWILD, last_runs=30, limit=10):
+        """Cheapest fares for a route over the last `last_runs` runs that saw it.
+
+        Returns dicts with flight_date, price, seats, stops, departs_at and
+        seen_at (the run's start time), cheapest first.
+        """
+        self.flush()
+        conn = self.connect()
+        rows = conn.execute(
+            """
+            SELECT f.flight_date, f.price, f.seats, f.stops, f.departs_at, r.started_at
+            FROM fares f JOIN runs r ON r.id = f.run_id
+            WHERE f.origin = ? AND f.dest = ? AND f.fare_type = ?
+              AND f.run_id IN (
+                  SELECT DISTINCT run_id FROM fares
+                  WHERE origin = ? AND dest = ? AND fare_type = ?
+                  ORDER BY run_id DESC LIMIT ?)
+            ORDER BY f.price, f.flight_date
+            LIMIT ?
+            """,
+            (origin, dest, fare_type, origin, dest, fare_type, last_runs, limit),
+        ).fetchall()
+        keys = ("flight_date", "price", "seats", "stops", "departs_at", "seen_at")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def route_stats(self, scanner=None, fare_type=GOWILD, last_runs=30):
+        """Per-route history over the scanner's last `last_runs` runs.
+
+        Returns (runs, {(origin, dest): (runs with a fare_type fare, cheapest
+        fare_type fare or None)}) for every route scanned in the window, with
+        or without fares; runs is how many runs the window holds.
+        """
+        self.flush()
+        conn = self.connect()
+        scanner = scanner or self.scanner_name
+        recent = "SELECT id FROM runs WHERE scanner = ? ORDER BY id DESC LIMIT ?"
+        (runs,) = conn.execute(
+            f"SELECT COUNT(*) FROM ({recent})", (scanner, last_runs)
+        ).fetchone()
+        rows = conn.execute(
+            f"""
+            SELECT origin, dest,
+                   COUNT(DISTINCT CASE WHEN fare_type = ? THEN run_id END),
+                   MIN(CASE WHEN fare_type = ? THEN price END)
+            FROM (SELECT origin, dest, fare_type, price, run_id FROM fares
+                  WHERE run_id IN ({recent})
+                  UNION ALL
+                  SELECT origin, dest, NULL, NULL, run_id FROM scans
+                  WHERE run_id IN ({recent}))
+            GROUP BY origin, dest
+            """,
+            (fare_type, fare_type, scanner, last_runs, scanner, last_runs),
+        ).fetchall()
+        return runs, {(o, d): (hits, cheapest) for o, d, hits, cheapest in rows}
+
+    def runs(self, limit=20):
+        self.flush()
+        conn = self.connect()
+        return conn.execute(
+            """
+            SELECT r.id, r.scanner, r.started_at, r.finished_at, COUNT(f.id)
+            FROM runs r LEFT JOIN fares f ON f.run_id = r.id
+            GROUP BY r.id ORDER BY r.id DESC LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+
+    def summary(self):
+        if not self.enabled:
+            return "Fare store: disabled"
+        run = f"run {self.run_id}, " if self.run_id is not None else ""
+        return f"Fare store: {self.recorded} fares recorded ({run}{self.path})"
+
+
+# Shared by every scanner in the process, like route_cache.ROUTE_CACHE.
+FARE_STORE = FareStore()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Query the fare history store")
+    ap.add_argument("--db", default=DB_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    q = sub.add_parser("cheapest", help="cheapest fares for a route")
+    q.add_argument("origin")
+    q.add_argument("dest")
+    q.add_argument("--type", default=GOWILD, choices=(GOWILD, DISCOUNT_DEN))
+    q.add_argument("--runs", type=int, default=30, help="look at the last N runs")
+    q.add_argument("--limit", type=int, default=10)
+    sub.add_parser("runs", help="recent runs")
+    args = ap.parse_args()
+
+    store = FareStore(args.db)
+    if args.cmd == "runs":
+        for run_id, scanner, started, finished, n in store.runs():
+            print(f"{run_id:>5}  {scanner:<20} {started}  ->  {finished or '(running)'}  {n} fares")
+        return
+
+    origin, dest = args.origin.upper(), args.dest.upper()
+    rows = store.cheapest(origin, dest, args.type, args.runs, args.limit)
+    print(f"Cheapest {args.type} {origin} → {dest} over the last {args.runs} runs:")
+    if not rows:
+        print("   (none recorded)")
+    for r in rows:
+        seats = f" | {r['seats']} seats" if r["seats"] is not None else ""
+        print(
+            f"   ${r['price']:.2f}  {r['flight_date']}  departs {r['departs_at'] or 'N/A'}"
+            f" | {r['stops'] or 'N/A'}{seats}  (seen {r['seen_at']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
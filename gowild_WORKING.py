@@ -4,19 +4,24 @@ WORKING SOLUTION: Manual CAPTCHA solving + Automation
 You solve ONE CAPTCHA, then the script automates the rest
 """
 
-import csv
-import json
 import os
 import shutil
 import subprocess
-import time
 from datetime import datetime, timedelta
 
 import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
+
+from browser_state import launch_with_profile
 
 # Import centralized configuration
-from config import ORIGINS, SFO_DIRECT_DESTINATIONS, is_blackout_date
+from config import ORIGINS, SFO_DIRECT_DESTINATIONS, booking_url, is_blackout_date
+from fare_store import FARE_STORE
+from journeys import find_journeys_data
+from page_wait import READY_STATS, RESULTS_READY_JS, wait_until_ready
+from result_sink import ResultSink
+from route_index import ROUTE_INDEX
+
+CSV_FIELDS = ["Date", "Origin", "Destination", "Price", "Duration", "Stops", "Seats"]
 
 
 def build_driver():
@@ -52,11 +57,33 @@ def build_driver():
         subprocess.run(["codesign", "--force", "--sign", "-", signed], check=False)
 
     uc.Patcher.auto = lambda self, *a, **k: None
-    return uc.Chrome(
-        use_subprocess=True, driver_executable_path=signed, version_main=version_main
+    # CHROME_PROFILE_DIR keeps cache and site state between runs (browser_state)
+    return launch_with_profile(
+        lambda profile: uc.Chrome(
+            use_subprocess=True,
+            driver_executable_path=signed,
+            version_main=version_main,
+            user_data_dir=profile,
+        )
     )
 
 
+def csv_rows(date, info):
+    """The CSV_FIELDS rows for one route's GoWild flights."""
+    return [
+        {
+            "Date": date,
+            "Origin": info["origin"],
+            "Destination": f"{info['dest']} ({info['name']})",
+            "Price": flight.get("goWildFare", "N/A"),
+            "Duration": flight.get("duration", "N/A"),
+            "Stops": flight.get("stopsText", "N/A"),
+            "Seats": flight.get("goWildFareSeatsRemaining", "N/A"),
+        }
+        for flight in info["flights"]
+    ]
+
+
 def main():
     # Search for flights leaving TOMORROW (GoWild booking window)
     travel_day = datetime.today() + timedelta(days=1)
@@ -96,15 +123,14 @@ def main():
         print("\n🔐 Loading first search - YOU MUST SOLVE THE CAPTCHA!")
         print(f"   Route: SFO → DEN on {date_display}")
 
-        driver.get(
-            f"https://booking.flyfrontier.com/Flight/InternalSelect?o1=SFO&d1=DEN&dd1={date_url}&ADT=1&mon=true&promo="
-        )
+        driver.get(booking_url("SFO", "DEN", date_url))
 
         print("\n⏳ Waiting for page to load...")
         print("   👉 If you see a CAPTCHA, solve it (Press & Hold)")
         print("   👉 If page loads normally, just wait...")
 
-        time.sleep(8)  # Wait for page to fully load
+        # Wait for the flights (or the captcha) to show up, at most 8s
+        wait_until_ready(driver, RESULTS_READY_JS, 8, kind="results")
 
         # Check if CAPTCHA appeared
         if "px-captcha" in driver.page_source:
@@ -118,24 +144,27 @@ def main():
         # Now search all routes - OUTBOUND FROM EACH ORIGIN (SFO, SJC)
         all_results = {}
         results = {}  # keyed by "ORIGIN-DEST"
+        # Each route is on disk as soon as it is parsed
+        sink = ResultSink(
+            f"gowild_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}", CSV_FIELDS
+        )
 
         for origin in ORIGINS:
             print(f"\n{'='*70}")
             print(f"Searching OUTBOUND flights FROM {origin}: {date_display}")
             print(f"{'='*70}\n")
 
-            for idx, (dest_code, dest_name) in enumerate(
-                SFO_DIRECT_DESTINATIONS.items(), 1
-            ):
+            planned = ROUTE_INDEX.plan(origin, SFO_DIRECT_DESTINATIONS)
+            for idx, (dest_code, dest_name) in enumerate(planned.items(), 1):
                 print(
-                    f"[{idx}/{len(SFO_DIRECT_DESTINATIONS)}] {origin} → {dest_code} ({dest_name})...",
+                    f"[{idx}/{len(planned)}] {origin} → {dest_code} ({dest_name})...",
                     end=" ",
                     flush=True,
                 )
 
-                url = f"https://booking.flyfrontier.com/Flight/InternalSelect?o1={origin}&d1={dest_code}&dd1={date_url}&ADT=1&mon=true&promo="
+                url = booking_url(origin, dest_code, date_url)
                 driver.get(url)
-                time.sleep(8)  # Wait for page load
+                wait_until_ready(driver, RESULTS_READY_JS, 8, kind="results")
 
                 page_source = driver.page_source
 
@@ -146,70 +175,46 @@ def main():
                     page_source = driver.page_source
 
                 # Parse flight data
+                rows = []
                 try:
-                    soup = BeautifulSoup(page_source, "html.parser")
-
-                    for script in soup.find_all("script"):
-                        script_text = script.string
-                        if (
-                            script_text
-                            and "journeys" in script_text
-                            and "flights" in script_text
-                        ):
-                            import html as html_lib
-
-                            decoded = html_lib.unescape(script_text)
-
-                            start = decoded.find("{")
-                            if start == -1:
-                                continue
-
-                            brace_count = 0
-                            end = start
-                            for i in range(start, len(decoded)):
-                                if decoded[i] == "{":
-                                    brace_count += 1
-                                elif decoded[i] == "}":
-                                    brace_count -= 1
-                                    if brace_count == 0:
-                                        end = i + 1
-                                        break
-
-                            data = json.loads(decoded[start:end])
-
-                            if "journeys" in data:
-                                flights = data["journeys"][0].get("flights", [])
-                                gowild = [
-                                    f for f in flights if f.get("isGoWildFareEnabled")
-                                ]
-
-                                if gowild:
-                                    results[f"{origin}-{dest_code}"] = {
-                                        "origin": origin,
-                                        "dest": dest_code,
-                                        "name": dest_name,
-                                        "flights": gowild,
-                                    }
-                                    print(f"✅ {len(gowild)} GoWild!")
-                                    break
-                                else:
-                                    print("○ No GoWild")
-                                    break
+                    data = find_journeys_data(page_source)
+                    if data is not None:
+                        FARE_STORE.record(origin, dest_code, date_url, data)
+                        ROUTE_INDEX.observe(origin, dest_code, data)
+                        flights = data["journeys"][0].get("flights", [])
+                        gowild = [f for f in flights if f.get("isGoWildFareEnabled")]
+
+                        if gowild:
+                            info = {
+                                "origin": origin,
+                                "dest": dest_code,
+                                "name": dest_name,
+                                "flights": gowild,
+                            }
+                            results[f"{origin}-{dest_code}"] = info
+                            rows = csv_rows(date_display, info)
+                            print(f"✅ {len(gowild)} GoWild!")
+                        else:
+                            print("○ No GoWild")
                     else:
                         print("○ No data")
 
                 except Exception as e:
                     print(f"❌ Error: {e}")
+                sink.write_route(rows, origin=origin, dest=dest_code, date=travel_iso)
 
         all_results[date_display] = results
+        sink.close()
         print(f"\nFound {len(results)} routes with GoWild on {date_display}")
+        print(READY_STATS.summary())
+        print(FARE_STORE.summary())
+        print(ROUTE_INDEX.summary())
 
         # Export results
         print(f"\n{'='*70}")
         print("FINAL RESULTS")
         print("=" * 70)
 
-        csv_data = []
         for date, results in all_results.items():
             print(f"\n{date}:")
             for _key, info in results.items():
@@ -223,37 +228,7 @@ def main():
                         f"  {info['origin']} → {info['dest']} ({info['name']}): ${price} - {stops} - {duration} - {seats} seats"
                     )
 
-                    csv_data.append(
-                        {
-                            "Date": date,
-                            "Origin": info["origin"],
-                            "Destination": f"{info['dest']} ({info['name']})",
-                            "Price": price,
-                            "Duration": duration,
-                            "Stops": stops,
-                            "Seats": seats,
-                        }
-                    )
-
-        # Save CSV
-        filename = f"gowild_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        with open(filename, "w", newline="") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "Date",
-                    "Origin",
-                    "Destination",
-                    "Price",
-                    "Duration",
-                    "Stops",
-                    "Seats",
-                ],
-            )
-            writer.writeheader()
-            writer.writerows(csv_data)
-
-        print(f"\n✅ Results saved to: {filename}")
+        print(f"\n{sink.summary()}")
 
     finally:
         print("\nKeeping browser open for your review...")
@@ -25,26 +25,42 @@ If credentials are missing the report is still printed and saved to results/, ju
 not emailed.
 """
 
-import html as html_lib
-import json
 import os
+import queue
 import re
 import shutil
 import smtplib
 import subprocess
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 
 import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
 
+from browser_state import launch_with_profile
 from config import (
+    DELAY_SCALE,
     DOMESTIC_DESTINATIONS,
+    HOME_URL,
     INTERNATIONAL_DESTINATIONS,
     ORIGINS,
+    booking_url,
     is_blackout_date,
+    polite_sleep,
 )
+from fare_store import FARE_STORE
+from journeys import CAPTCHA_MARKER, find_journeys_data, journey_flights
+from page_wait import READY_STATS, RESULTS_READY_JS, wait_until_ready
+from query_planner import expand, plan_query
+from rate_budget import RateBudget
+from records import Deal, FareType
+from route_cache import ROUTE_CACHE
+from route_index import ROUTE_INDEX
+from scheduler import Scheduler
 
 # --- Settings -------------------------------------------------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -52,8 +68,20 @@ DEFAULT_EMAIL_TO = "muhammadalinajfi1@gmail.com"
 # Run the browser without a visible window. Headful is more reliable against
 # PerimeterX, but a scheduled 00:01 job usually wants no window -> default headless.
 HEADLESS = os.environ.get("DEAL_HEADLESS", "1") == "1"
-PAGE_WAIT = 9          # seconds to let each results page load
+PAGE_WAIT = 9          # max seconds to wait for a results page to be ready
 BETWEEN_REQUESTS = 5   # extra polite delay between routes
+PAGE_SECONDS = 12      # typical load + ready wait, for the ETA before one is measured
+# The serial loop's pace: one page load plus the polite delay per route. The
+# pool's shared RateBudget hands out slots no faster than this (all of it
+# scaled by FRONTIER_DELAY_SCALE, like every politeness delay).
+SERIAL_INTERVAL = PAGE_SECONDS + BETWEEN_REQUESTS
+# Parse/extract each page on a worker thread while the browser moves on
+# (DEAL_PIPELINE=0 for the old strictly serial loop).
+PIPELINE = os.environ.get("DEAL_PIPELINE", "1") == "1"
+# Independent browsers to split the routes across (1 = the single-driver loop).
+# They share one request budget sized to the serial loop's pace, so more workers
+# never means more requests/min; they only overlap slow page loads.
+WORKERS = int(os.environ.get("DEAL_WORKERS", "1"))
 
 
 # --- Browser --------------------------------------------------------------
@@ -83,50 +111,27 @@ def build_driver(headless=None):
 
     uc.Patcher.auto = lambda self, *a, **k: None
 
-    options = uc.ChromeOptions()
-    if headless:
-        options.add_argument("--headless=new")
-        options.add_argument("--window-size=1400,1000")
-    return uc.Chrome(
-        options=options,
-        use_subprocess=True,
-        driver_executable_path=signed,
-        version_main=version_main,
-    )
+    def launch(profile):
+        # uc won't take the same ChromeOptions twice (profile fallback relaunch)
+        options = uc.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1400,1000")
+        return uc.Chrome(
+            options=options,
+            use_subprocess=True,
+            driver_executable_path=signed,
+            version_main=version_main,
+            user_data_dir=profile,
+        )
 
-
-# --- Parsing --------------------------------------------------------------
-def parse_flights(page_source):
-    """Return the list of flight dicts from a results page, or [] if none/blocked."""
-    if "px-captcha" in page_source:
-        return []
-    soup = BeautifulSoup(page_source, "html.parser")
-    for script in soup.find_all("script"):
-        t = script.string
-        if t and "journeys" in t and "flights" in t:
-            decoded = html_lib.unescape(t)
-            start = decoded.find("{")
-            if start == -1:
-                continue
-            depth = 0
-            end = start
-            for i in range(start, len(decoded)):
-                if decoded[i] == "{":
-                    depth += 1
-                elif decoded[i] == "}":
-                    depth -= 1
-                    if depth == 0:
-                        end = i + 1
-                        break
-            try:
-                data = json.loads(decoded[start:end])
-            except json.JSONDecodeError:
-                continue
-            if "journeys" in data and data["journeys"]:
-                return data["journeys"][0].get("flights") or []
-    return []
+    # CHROME_PROFILE_DIR keeps cache and site state between runs (browser_state)
+    return launch_with_profile(launch)
 
 
+# --- Parsing --------------------------------------------------------------
+# parse_flights (page -> flight list) lives in journeys.py, shared with the
+# requests-based scanners.
 def _departs(flight):
     try:
         return flight.get("legs", [{}])[0].get("departureDateFormatted") or "N/A"
@@ -135,7 +140,7 @@ def _departs(flight):
 
 
 def extract_deals(flights, origin, dest, dest_name, flight_date_display, is_intl):
-    """Pull GoWild and Discount Den deals out of a route's flight list."""
+    """Pull GoWild and Discount Den deals (records.Deal) out of a route's flight list."""
     deals = []
     for f in flights:
         stops = f.get("stopsText", "N/A")
@@ -146,38 +151,22 @@ def extract_deals(flights, origin, dest, dest_name, flight_date_display, is_intl
         gw = f.get("goWildFare")
         if f.get("isGoWildFareEnabled") and gw is not None and gw > 0:
             deals.append(
-                {
-                    "type": "GoWild",
-                    "origin": origin,
-                    "dest": dest,
-                    "dest_name": dest_name,
-                    "price": float(gw),
-                    "stops": stops,
-                    "duration": duration,
-                    "departs": departs,
-                    "seats": f.get("goWildFareSeatsRemaining"),
-                    "flight_date": flight_date_display,
-                    "is_intl": is_intl,
-                }
+                Deal(
+                    FareType.GOWILD, origin, dest, dest_name, float(gw), stops,
+                    duration, departs, f.get("goWildFareSeatsRemaining"),
+                    flight_date_display, is_intl,
+                )
             )
 
         # Discount Den
         dd = f.get("discountDenFare")
         if dd is not None and dd > 0:
             deals.append(
-                {
-                    "type": "Discount Den",
-                    "origin": origin,
-                    "dest": dest,
-                    "dest_name": dest_name,
-                    "price": float(dd),
-                    "stops": stops,
-                    "duration": duration,
-                    "departs": departs,
-                    "seats": f.get("discountDenFareSeatsRemaining"),
-                    "flight_date": flight_date_display,
-                    "is_intl": is_intl,
-                }
+                Deal(
+                    FareType.DISCOUNT_DEN, origin, dest, dest_name, float(dd), stops,
+                    duration, departs, f.get("discountDenFareSeatsRemaining"),
+                    flight_date_display, is_intl,
+                )
             )
     return deals
 
@@ -196,15 +185,15 @@ def _seats_left(val):
 
 
 def _deal_lines(deal, rank, tag=""):
-    city = _short_name(deal["dest_name"])
-    header = f"{rank:>4}. {deal['origin']} > {deal['dest']} ({city}) — ${deal['price']:.2f}"
+    city = _short_name(deal.dest_name)
+    header = f"{rank:>4}. {deal.origin} > {deal.dest} ({city}) — ${deal.price:.2f}"
     if tag:
         header += f"  [{tag}]"
-    detail = f"      {deal['stops']} | {deal['duration']} | Departs {deal['departs']}"
-    seats = _seats_left(deal.get("seats")) if deal["type"] == "GoWild" else None
+    detail = f"      {deal.stops} | {deal.duration} | Departs {deal.departs}"
+    seats = _seats_left(deal.seats) if deal.fare_type is FareType.GOWILD else None
     if seats is not None:
         detail += f" | {seats} seats left"
-    date_line = f"      Flight date: {deal['flight_date']}"
+    date_line = f"      Flight date: {deal.flight_date}"
     return "\n".join([header, detail, date_line])
 
 
@@ -217,8 +206,8 @@ def _top_deals(deals, n=10):
     destinations outside OVERSERVED_DESTS. Only when there aren't that many
     non-LAS/SLC/DEN deals may those three fill more than n - MIN_OTHER_DESTS
     slots."""
-    ranked = sorted(deals, key=lambda d: d["price"])
-    others = [d for d in ranked if d["dest"] not in OVERSERVED_DESTS]
+    ranked = sorted(deals, key=lambda d: d.price)
+    others = [d for d in ranked if d.dest not in OVERSERVED_DESTS]
     picked = others[:MIN_OTHER_DESTS]
     picked_ids = {id(d) for d in picked}
     for d in ranked:
@@ -227,14 +216,14 @@ def _top_deals(deals, n=10):
         if id(d) not in picked_ids:
             picked.append(d)
             picked_ids.add(id(d))
-    return sorted(picked, key=lambda d: d["price"])
+    return sorted(picked, key=lambda d: d.price)
 
 
 def build_report(deals, meta, cruise_section=None):
-    by_price = lambda d: d["price"]
-    gowild = _top_deals([d for d in deals if d["type"] == "GoWild"])
-    discden = _top_deals([d for d in deals if d["type"] == "Discount Den"])
-    intl = sorted((d for d in deals if d["is_intl"]), key=by_price)[:5]
+    by_price = lambda d: d.price
+    gowild = _top_deals([d for d in deals if d.fare_type is FareType.GOWILD])
+    discden = _top_deals([d for d in deals if d.fare_type is FareType.DISCOUNT_DEN])
+    intl = sorted((d for d in deals if d.is_intl), key=by_price)[:5]
 
     out = []
     out.append("=" * 50)
@@ -261,8 +250,7 @@ def build_report(deals, meta, cruise_section=None):
     out.append("-" * 40)
     if intl:
         for i, d in enumerate(intl, 1):
-            tag = "GoWild" if d["type"] == "GoWild" else "Discount Den"
-            out.append(_deal_lines(d, i, tag=tag) + "\n")
+            out.append(_deal_lines(d, i, tag=d.fare_type.value) + "\n")
     else:
         out.append("   (none found)\n")
 
@@ -274,6 +262,8 @@ def build_report(deals, meta, cruise_section=None):
     out.append(f"Int'l search date:  {meta['intl_date']}")
     out.append(f"Origins:            {', '.join(ORIGINS)}")
     out.append(f"Destinations checked:       {meta['routes_checked']}")
+    if meta.get("coverage"):
+        out.append(meta["coverage"])
     out.append(f"Blackout skipped:   {meta['blackout_note']}")
     out.append(f"Generated:          {meta['generated']}")
     return "\n".join(out)
@@ -335,83 +325,344 @@ def send_email(subject, body, env):
 MAX_DRIVER_RESTARTS = 3  # consecutive dead-session restarts before giving up
 
 
+# build_driver signs a copy of chromedriver on first use; don't race on it.
+_BUILD_LOCK = threading.Lock()
+
+
 def _restart_driver(driver):
     """Replace a dead browser session with a fresh, warmed-up one."""
     try:
         driver.quit()
     except Exception:
         pass
-    driver = build_driver()
-    driver.get("https://www.flyfrontier.com/")
-    time.sleep(5)
+    with _BUILD_LOCK:
+        driver = build_driver()
+    driver.get(HOME_URL)
+    polite_sleep(5)
     return driver
 
 
-def _fetch_route(driver, url):
-    driver.get(url)
-    time.sleep(PAGE_WAIT)
-    return parse_flights(driver.page_source)
+class StageTimer:
+    """Thread-safe wall-clock totals per stage (load, wait, parse, ...)."""
 
+    def __init__(self):
+        self.totals = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
 
-def search_group(driver, destinations, target_dt, is_intl):
-    """Search every origin -> dest in `destinations` for target_dt.
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self.totals[name] = self.totals.get(name, 0.0) + elapsed
 
-    Returns (deals, routes_checked, driver). The driver is returned because a
-    mid-run Chrome crash (InvalidSessionIdException etc.) triggers a rebuild;
-    the caller must keep using the returned instance.
+    def summary(self):
+        wall = time.perf_counter() - self._started
+        parts = [f"{name} {secs:.1f}s" for name, secs in self.totals.items()]
+        return " | ".join(parts + [f"wall {wall:.1f}s"])
+
+
+# One origin -> dest lookup on one date. label is "CONUS" / "INT'L".
+RouteTask = namedtuple(
+    "RouteTask", "origin dest dest_name date_url display is_intl label"
+)
+
+
+def _route_tasks(destinations, target_dt, is_intl):
+    """Every origin -> dest task for target_dt, or [] on a blackout date.
+
+    Routes the route index knows aren't flown (and origin == dest) are left out.
     """
     iso = target_dt.strftime("%Y-%m-%d")
     display = target_dt.strftime("%b %-d, %Y")
-    date_url = display.replace(" ", "%20")
     label = "INT'L" if is_intl else "CONUS"
-
-    if is_blackout_date(iso):
+    if is_blackout_date(target_dt):
         print(f"🚫 {label} date {display} ({iso}) is a blackout date - skipping group.")
+        return []
+    date_url = display.replace(" ", "%20")
+    return [
+        RouteTask(origin, dest_code, dest_name, date_url, display, is_intl, label)
+        for origin in ORIGINS
+        for dest_code, dest_name in ROUTE_INDEX.plan(origin, destinations).items()
+    ]
+
+
+def _load_route(driver, task, base_url, timings, budget=None):
+    """Load one route/date in the browser, unless ROUTE_CACHE has it.
+
+    Returns (data, page): the cached journeys data and None on a cache hit,
+    otherwise None and the captured page source (parsed by _parse_route).
+    Only this touches the driver, so it always runs on the driver's thread.
+    A budget (pool mode) is only charged for real page loads.
+    """
+    data = ROUTE_CACHE.get(task.origin, task.dest, task.date_url, base_url)
+    if data is not None:
+        return data, None
+    if budget is not None:
+        with timings.stage("budget"):
+            budget.acquire()
+    with timings.stage("load"):
+        driver.get(booking_url(task.origin, task.dest, task.date_url, base_url))
+    with timings.stage("wait"):
+        wait_until_ready(driver, RESULTS_READY_JS, PAGE_WAIT, kind="results")
+    with timings.stage("capture"):
+        page = driver.page_source
+    return None, page
+
+
+class _Browser:
+    """A driver plus its count of consecutive crash restarts."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.restarts = 0
+
+
+def _load_with_restart(browser, task, base_url, timings, line, budget=None):
+    """_load_route with crash recovery; returns (data, page).
+
+    A dead session surfaces as InvalidSessionIdException, MaxRetryError, etc.
+    depending on how Chrome died — treat any fetch failure as session-suspect:
+    restart Chrome and retry the route once, otherwise every remaining route
+    errors out too. Gives up (re-raises) after MAX_DRIVER_RESTARTS in a row;
+    browser.driver is always left holding the latest instance.
+    `line` is the route prefix still to print ("" if already printed inline).
+    """
+    try:
+        result = _load_route(browser.driver, task, base_url, timings, budget)
+    except Exception as e:
+        if browser.restarts >= MAX_DRIVER_RESTARTS:
+            raise
+        browser.restarts += 1
+        print(
+            f"{line}{type(e).__name__}; restarting Chrome "
+            f"({browser.restarts}/{MAX_DRIVER_RESTARTS})...",
+            end="\n" if line else " ",
+            flush=True,
+        )
+        browser.driver = _restart_driver(browser.driver)
+        result = _load_route(browser.driver, task, base_url, timings, budget)
+    browser.restarts = 0
+    return result
+
+
+def _parse_route(page, task, base_url, timings):
+    """Journeys data from a captured results page (None if blocked/empty)."""
+    with timings.stage("parse"):
+        if CAPTCHA_MARKER in page:
+            return None
+        data = find_journeys_data(page)
+    if data is not None:
+        ROUTE_CACHE.put(task.origin, task.dest, task.date_url, data, base_url)
+        FARE_STORE.record(task.origin, task.dest, task.date_url, data)
+        ROUTE_INDEX.observe(task.origin, task.dest, data, base_url)
+    return data
+
+
+def _finish_route(task, data, page, base_url, timings, line):
+    """Parse + extract one route and print its result line; returns its deals."""
+    try:
+        if page is not None:
+            data = _parse_route(page, task, base_url, timings)
+        flights = journey_flights(data)
+        with timings.stage("extract"):
+            found = extract_deals(
+                flights, task.origin, task.dest, task.dest_name, task.display,
+                task.is_intl,
+            )
+    except Exception as e:
+        print(f"{line}error: {type(e).__name__}")
+        return []
+    gw = sum(1 for d in found if d.fare_type is FareType.GOWILD)
+    dd = len(found) - gw
+    note = " [cached]" if page is None else ""
+    print(f"{line}{len(flights)} flights (GW:{gw} DD:{dd}){note}")
+    return found
+
+
+def _route_prefix(task):
+    return f"  {task.label} {task.origin}->{task.dest} ({task.display})... "
+
+
+def search_group(driver, destinations, target_dt, is_intl, base_url=None,
+                 pipeline=None, scheduler=None):
+    """Search every origin -> dest in `destinations` for target_dt.
+
+    Returns (deals, routes_checked, driver). The driver is returned because a
+    mid-run Chrome crash (InvalidSessionIdException etc.) triggers a rebuild;
+    the caller must keep using the returned instance. base_url overrides the
+    booking host (e.g. a local stand-in server).
+
+    With pipeline on (default: DEAL_PIPELINE) parsing and deal extraction run
+    on a worker thread, so the driver moves on to the next route while the
+    previous page is parsed during the politeness delay.
+    """
+    tasks = _route_tasks(destinations, target_dt, is_intl)
+    return search_tasks(driver, tasks, base_url, pipeline, scheduler)
+
+
+def search_tasks(driver, tasks, base_url=None, pipeline=None, scheduler=None):
+    """search_group over a ready list of RouteTasks (any mix of groups).
+
+    With a scheduler.Scheduler the tasks run highest expected value first and
+    no new route starts once its deadline is reached; routes_checked counts
+    the routes actually started.
+    """
+    if pipeline is None:
+        pipeline = PIPELINE
+    if not tasks:
         return [], 0, driver
+    if scheduler is not None:
+        tasks = scheduler.order(tasks)
+
+    timings = StageTimer()
+    # Serial mode prints the route first and the result when it is in; the
+    # pipelined worker prints whole lines so output from the two threads
+    # never interleaves mid-line.
+    worker = ThreadPoolExecutor(max_workers=1) if pipeline else None
+    results = []
+    checked = 0
+    browser = _Browser(driver)
+    try:
+        for task in tasks:
+            if scheduler is not None and not scheduler.take():
+                print(f"  ⏰ Deadline reached - {len(tasks) - checked} routes left unchecked")
+                break
+            checked += 1
+            if worker:
+                line = _route_prefix(task)
+            else:
+                print(_route_prefix(task), end="", flush=True)
+                line = ""
+            try:
+                data, page = _load_with_restart(
+                    browser, task, base_url, timings, line
+                )
+            except Exception as e:
+                print(f"{line}error: {type(e).__name__}")
+                with timings.stage("sleep"):
+                    polite_sleep(BETWEEN_REQUESTS)
+                continue
+
+            args = (task, data, page, base_url, timings, line)
+            if worker:
+                results.append(worker.submit(_finish_route, *args))
+            else:
+                results.append(_finish_route(*args))
+            if page is not None:
+                with timings.stage("sleep"):
+                    polite_sleep(BETWEEN_REQUESTS)
+    finally:
+        if worker:
+            worker.shutdown(wait=True)
 
     deals = []
+    for found in results:
+        deals.extend(found.result() if worker else found)
+    mode = "pipelined" if worker else "serial"
+    label = "+".join(sorted({t.label for t in tasks}))
+    print(f"  ⏱️  {label} stages ({mode}): {timings.summary()}")
+    return deals, checked, browser.driver
+
+
+def _pool_worker(tasks, budget, base_url, timings, deals, deals_lock,
+                 scheduler=None):
+    """Drain the shared task queue with one browser; returns routes checked."""
+    budget.acquire()
+    with _BUILD_LOCK:
+        browser = _Browser(build_driver())
     routes = 0
-    consecutive_restarts = 0
-    for origin in ORIGINS:
-        for dest_code, dest_name in destinations.items():
+    try:
+        browser.driver.get(HOME_URL)
+        polite_sleep(5)
+        while True:
+            try:
+                task = tasks.get_nowait()
+            except queue.Empty:
+                break
+            if scheduler is not None and not scheduler.take():
+                tasks.put(task)  # past the deadline: leave it unchecked
+                break
             routes += 1
-            url = (
-                f"https://booking.flyfrontier.com/Flight/InternalSelect?"
-                f"o1={origin}&d1={dest_code}&dd1={date_url}&ADT=1&mon=true&promo="
-            )
-            print(f"  {label} {origin}->{dest_code} ({display})...", end=" ", flush=True)
+            line = _route_prefix(task)
             try:
-                try:
-                    flights = _fetch_route(driver, url)
-                except Exception as e:
-                    # A dead session surfaces as InvalidSessionIdException,
-                    # MaxRetryError, etc. depending on how Chrome died — treat
-                    # any fetch failure as session-suspect: restart Chrome and
-                    # retry the route once, otherwise every remaining route
-                    # errors out too.
-                    if consecutive_restarts >= MAX_DRIVER_RESTARTS:
-                        raise
-                    consecutive_restarts += 1
-                    print(
-                        f"{type(e).__name__}; restarting Chrome "
-                        f"({consecutive_restarts}/{MAX_DRIVER_RESTARTS})...",
-                        end=" ",
-                        flush=True,
-                    )
-                    driver = _restart_driver(driver)
-                    flights = _fetch_route(driver, url)
-                found = extract_deals(
-                    flights, origin, dest_code, dest_name, display, is_intl
+                data, page = _load_with_restart(
+                    browser, task, base_url, timings, line, budget
                 )
-                deals.extend(found)
-                gw = sum(1 for d in found if d["type"] == "GoWild")
-                dd = sum(1 for d in found if d["type"] == "Discount Den")
-                print(f"{len(flights)} flights (GW:{gw} DD:{dd})")
-                consecutive_restarts = 0
             except Exception as e:
-                print(f"error: {type(e).__name__}")
-            time.sleep(BETWEEN_REQUESTS)
-    return deals, routes, driver
+                print(f"{line}error: {type(e).__name__}")
+                if browser.restarts >= MAX_DRIVER_RESTARTS:
+                    print("  ❌ worker giving up after repeated Chrome crashes")
+                    break
+                continue
+            found = _finish_route(task, data, page, base_url, timings, line)
+            with deals_lock:
+                deals.extend(found)
+    finally:
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+    return routes
+
+
+def search_pool(groups, workers, base_url=None, budget=None, scheduler=None):
+    """Search several (destinations, target_dt, is_intl) groups with a pool of
+    `workers` independent browsers fed from one shared route queue.
+
+    The per-route politeness sleep is replaced by one RateBudget shared by all
+    workers (default: one page load per SERIAL_INTERVAL seconds in total, the
+    serial loop's typical pace), so the pool never requests faster than one
+    browser would. It gains wall clock where the serial loop runs slower than
+    that: page loads past PAGE_SECONDS, Chrome restarts and parsing overlap.
+    Each worker builds and warms up its own Chrome and keeps the same crash
+    recovery as search_group. With a scheduler the queue holds every group's
+    routes in expected-value order and workers stop at its deadline.
+    Returns (deals, routes_checked).
+    """
+    ordered = [
+        task
+        for destinations, target_dt, is_intl in groups
+        for task in _route_tasks(destinations, target_dt, is_intl)
+    ]
+    if scheduler is not None:
+        ordered = scheduler.order(ordered)
+    tasks = queue.Queue()
+    for task in ordered:
+        tasks.put(task)
+    if tasks.empty():
+        return [], 0
+    if budget is None:
+        budget = RateBudget(SERIAL_INTERVAL)
+
+    timings = StageTimer()
+    deals = []
+    deals_lock = threading.Lock()
+    workers = max(1, min(workers, tasks.qsize()))
+    print(f"  🧵 {tasks.qsize()} routes across {workers} browsers "
+          f"({budget.per_minute:.1f} req/min budget)")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_pool_worker, tasks, budget, base_url, timings, deals,
+                        deals_lock, scheduler)
+            for _ in range(workers)
+        ]
+    routes = 0
+    for f in futures:
+        try:
+            routes += f.result()
+        except Exception as e:
+            print(f"  ❌ worker failed: {type(e).__name__}: {e}")
+    if not tasks.empty():
+        why = "deadline reached" if scheduler is not None and scheduler.expired else "all workers gave up"
+        print(f"  ⚠️  {tasks.qsize()} routes left unchecked ({why})")
+    print(f"  ⏱️  pool stages ({workers} workers): {timings.summary()}")
+    print(f"  {budget.summary()}")
+    return deals, routes
 
 
 def main():
@@ -426,36 +677,74 @@ def main():
     print("FRONTIER DEAL CHECKER")
     print(f"  CONUS (next day):   {conus_display}")
     print(f"  Int'l (10 days out): {intl_display}")
-    print(f"  Origins: {', '.join(ORIGINS)}  |  headless={HEADLESS}")
+    print(f"  Origins: {', '.join(ORIGINS)}  |  headless={HEADLESS}  |  browsers={WORKERS}")
     print("=" * 60)
 
-    driver = build_driver()
-    all_deals = []
-    routes_checked = 0
-    try:
-        # Warm up
-        driver.get("https://www.flyfrontier.com/")
-        time.sleep(5)
-
-        d1, r1, driver = search_group(
-            driver, DOMESTIC_DESTINATIONS, conus_dt, is_intl=False
-        )
-        d2, r2, driver = search_group(
-            driver, INTERNATIONAL_DESTINATIONS, intl_dt, is_intl=True
+    # Most valuable routes first, nothing new started after the deadline
+    scheduler = Scheduler.from_env()
+    if scheduler.deadline is not None:
+        print(f"  Deadline: {datetime.fromtimestamp(scheduler.deadline):%H:%M} "
+              f"(routes stop {(scheduler.deadline - scheduler.stop_at) / 60:.0f} min earlier)")
+
+    # Page loads and ETA up front; per-page-load time is measured per pool size
+    plan = plan_query(
+        [
+            *expand([(o, d) for o in ORIGINS for d in DOMESTIC_DESTINATIONS], [conus_dt]),
+            *expand([(o, d) for o in ORIGINS for d in INTERNATIONAL_DESTINATIONS], [intl_dt]),
+        ],
+        f"gowild_deal_report/{WORKERS}",
+        # workers share one SERIAL_INTERVAL budget, so they overlap page time only
+        default_seconds=max(SERIAL_INTERVAL * DELAY_SCALE,
+                            (BETWEEN_REQUESTS * DELAY_SCALE + PAGE_SECONDS) / WORKERS),
+    )
+    print(plan.summary())
+    if scheduler.stop_at is not None and time.time() + plan.eta_seconds > scheduler.stop_at:
+        reachable = int(max(scheduler.stop_at - time.time(), 0) / plan.seconds)
+        print(f"  ⚠️  ETA is past the deadline: expect ~{min(reachable, plan.requests)}"
+              f"/{plan.requests} page loads, lowest-value routes last")
+
+    if WORKERS > 1:
+        all_deals, routes_checked = search_pool(
+            [
+                (DOMESTIC_DESTINATIONS, conus_dt, False),
+                (INTERNATIONAL_DESTINATIONS, intl_dt, True),
+            ],
+            WORKERS,
+            scheduler=scheduler,
         )
-        all_deals = d1 + d2
-        routes_checked = r1 + r2
-    finally:
+    else:
+        driver = build_driver()
+        all_deals = []
+        routes_checked = 0
         try:
-            driver.quit()
-        except Exception:
-            pass
+            # Warm up
+            driver.get(HOME_URL)
+            polite_sleep(5)
+
+            # Both groups in one queue so the ranking spans CONUS and Int'l
+            tasks = _route_tasks(DOMESTIC_DESTINATIONS, conus_dt, False) + _route_tasks(
+                INTERNATIONAL_DESTINATIONS, intl_dt, True
+            )
+            all_deals, routes_checked, driver = search_tasks(
+                driver, tasks, scheduler=scheduler
+            )
+        finally:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    plan.finish()
+    print(ROUTE_CACHE.summary())
+    FARE_STORE.flush()
+    print(FARE_STORE.summary())
+    print(ROUTE_INDEX.summary())
+    print(scheduler.coverage())
 
     # Blackout note
     notes = []
-    if is_blackout_date(conus_dt.strftime("%Y-%m-%d")):
+    if is_blackout_date(conus_dt):
         notes.append(f"{conus_display} (CONUS)")
-    if is_blackout_date(intl_dt.strftime("%Y-%m-%d")):
+    if is_blackout_date(intl_dt):
         notes.append(f"{intl_display} (Int'l)")
     blackout_note = ", ".join(notes) if notes else "None"
 
@@ -463,6 +752,7 @@ def main():
         "conus_date": conus_display,
         "intl_date": intl_display,
         "routes_checked": routes_checked,
+        "coverage": scheduler.coverage(),
         "blackout_note": blackout_note,
         "generated": now.strftime("%Y-%m-%d %H:%M:%S PT"),
     }
@@ -487,6 +777,8 @@ def main():
             + f"\n   (cruise check failed: {type(e).__name__})\n"
         )
 
+    print(READY_STATS.summary())
+
     report = build_report(all_deals, meta, cruise_section=cruise_section)
     print("\n" + report)
 
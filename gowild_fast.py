@@ -2,17 +2,37 @@
 """
 Optimized GoWild scraper using requests with smart rate limiting
 This version is MUCH faster than Selenium but requires careful rate limiting
+Run with --resume to continue an interrupted scan (see checkpoint.py)
 """
 
-import csv
-import html, json, random, time
+import os, random, sys
 from datetime import datetime, timedelta
 
 import requests
-from bs4 import BeautifulSoup
+
+import async_scan
 
 # Import centralized configuration
-from config import GOWILD_BLACKOUT_DATES
+from config import (
+    DELAY_SCALE,
+    HOME_URL,
+    booking_url,
+    is_blackout_date,
+    iso_date,
+    polite_sleep,
+    split_blackout_dates,
+)
+from browser_state import restore_cookies
+from checkpoint import Checkpoint, route_status
+from fare_store import FARE_STORE
+from journeys import RESULTS, classify_page, content_charset, find_journeys_data_bytes
+from query_planner import expand, plan_query
+from result_sink import ResultSink
+from retry_queue import COVERAGE, RetryQueue
+from records import gowild_records
+from route_cache import ROUTE_CACHE
+from route_index import ROUTE_INDEX
+from sessions import SESSIONS
 
 # Global Variables
 destinations_avail = {}
@@ -171,181 +191,198 @@ def create_session():
         }
     )
 
+    # Cookies from the last run (results/cookies/), saved again at exit
+    restored = restore_cookies(session, "gowild_fast")
+
     # First, visit the main site to get cookies
     print("Establishing session with Frontier...")
     try:
-        session.get("https://www.flyfrontier.com/", timeout=15)
-        time.sleep(2)
-        print("✅ Session established")
+        session.get(HOME_URL, timeout=15)
+        if restored:
+            print(f"✅ Session restored ({restored} cookies from the last run)")
+        else:
+            polite_sleep(2)
+            print("✅ Session established")
     except Exception as e:
         print(f"⚠️  Warning: {e}")
 
     return session
 
 
-def get_flight_data(origin, dest, date, session):
-    """Get flight data for a single route"""
-    url = f"https://booking.flyfrontier.com/Flight/InternalSelect?o1={origin}&d1={dest}&dd1={date}&ADT=1&mon=true&promo="
-
-    try:
-        response = session.get(url, timeout=15)
+def parse_flight_response(response):
+    """Classify a results-page response and extract its flight data.
 
-        if response.status_code == 403:
-            print("⚠️  CAPTCHA triggered - slowing down...")
-            return None, True  # True = hit rate limit
-
-        if response.status_code != 200:
-            return None, False
-
-        # Check for CAPTCHA in content
-        if "px-captcha" in response.text or len(response.text) < 10000:
-            return None, True
-
-        # Extract flight data
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Look for the specific script with flight data
-        # The data is in a variable assignment like: var .... = {...};
-        for script in soup.find_all("script"):
-            script_text = script.string
-            if script_text and "journeys" in script_text and "flights" in script_text:
-                try:
-                    # Find JSON-like data
-                    decoded_data = html.unescape(script_text)
-
-                    # Extract JSON between { and };
-                    start = decoded_data.find("{")
-                    if start == -1:
-                        continue
-
-                    # Find the matching closing brace followed by semicolon
-                    brace_count = 0
-                    end = start
-                    for i in range(start, len(decoded_data)):
-                        if decoded_data[i] == "{":
-                            brace_count += 1
-                        elif decoded_data[i] == "}":
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end = i + 1
-                                break
-
-                    json_str = decoded_data[start:end]
-                    data = json.loads(json_str)
-
-                    if "journeys" in data:
-                        return data, False
-                except json.JSONDecodeError:
-                    continue
-                except Exception:
-                    continue
+    Returns (data, hit_limit) like get_flight_data. Split out so the parsing
+    half can be run (and benchmarked) against saved pages without a network.
+    """
+    if response.status_code == 403:
+        print("⚠️  CAPTCHA triggered - slowing down...")
+        return None, True  # True = hit rate limit
 
+    if response.status_code != 200:
         return None, False
 
+    # Classify on the raw bytes (CAPTCHA / too short / results) and decode
+    # only the journeys script, never the whole page.
+    content = response.content
+    if classify_page(content) != RESULTS:
+        return None, True
+
+    # Extract flight data
+    charset = content_charset(response.headers.get("Content-Type"))
+    data = find_journeys_data_bytes(content, charset)
+    if data is not None:
+        return data, False
+
+    return None, False
+
+
+def get_flight_data(origin, dest, date, session, base_url=None):
+    """Get flight data for a single route (served from ROUTE_CACHE when fresh)"""
+    cached = ROUTE_CACHE.get(origin, dest, date, base_url)
+    if cached is not None:
+        return cached, False
+
+    url = booking_url(origin, dest, date, base_url)
+
+    try:
+        response = session.get(url, timeout=15)
+        data, hit_limit = parse_flight_response(response)
+        if data is not None:
+            ROUTE_CACHE.put(origin, dest, date, data, base_url)
+            FARE_STORE.record(origin, dest, date, data)
+            ROUTE_INDEX.observe(origin, dest, data, base_url)
+        return data, hit_limit
+
     except Exception as e:
         print(f"    Error: {e}")
         return None, False
 
 
-def scan_routes(origin, destinations, date):
-    """Scan all routes from an origin"""
-    session = create_session()
+def gowild_entry(data, dest_name):
+    """(results entry or None, status message) for one route's journeys data.
+
+    The entry's "flights" are records.FlightRecord, not the raw flight dicts.
+    """
+    if not data or "journeys" not in data:
+        return None, "○ No data"
+    try:
+        flights = data["journeys"][0].get("flights")
+    except (KeyError, IndexError, TypeError):
+        return None, "○ No flights"
+    if not flights:
+        return None, "○ No flights"
+    gowild = gowild_records(flights)
+    if not gowild:
+        return None, "○ No GoWild flights"
+    entry = {"name": dest_name, "count": len(gowild), "flights": gowild}
+    return entry, f"✅ {len(gowild)} GoWild flights!"
+
+
+CSV_FIELDS = [
+    "Origin",
+    "Destination_Code",
+    "Destination_Name",
+    "Flight_Date",
+    "Price",
+    "Duration",
+    "Stops",
+    "Seats_Remaining",
+]
+
+
+def csv_rows(origin, dest_code, info, date_str):
+    """The CSV_FIELDS rows for one route's results entry."""
+    return [
+        {
+            "Origin": origin,
+            "Destination_Code": dest_code,
+            "Destination_Name": info["name"],
+            "Flight_Date": date_str.replace("%20", " "),
+            "Price": flight.fare if flight.fare is not None else "N/A",
+            "Duration": flight.duration,
+            "Stops": flight.stops,
+            "Seats_Remaining": flight.seats if flight.seats is not None else "N/A",
+        }
+        for flight in info["flights"]
+    ]
+
+
+def stream_route(sink, origin, dest_code, entry, date, status, checkpoint=None):
+    """Append one finished route to a result_sink.ResultSink and a
+    checkpoint.Checkpoint journal (either may be None)."""
+    if sink is not None:
+        rows = csv_rows(origin, dest_code, entry, date) if entry else []
+        sink.write_route(rows, origin=origin, dest=dest_code, date=iso_date(date),
+                         status=status)
+    if checkpoint is not None:
+        checkpoint.record(origin, dest_code, date, status, entry)
+
+
+def scan_routes(origin, destinations, date, base_url=None, sink=None,
+                checkpoint=None, session=None):
+    """Scan all routes from an origin (base_url overrides the booking host).
+
+    Each route is appended to `sink` (a ResultSink) and journaled in
+    `checkpoint` as soon as it finishes. Rate-limited routes, and routes that
+    came back without flight data, are retried at the end of the pass
+    (retry_queue.RetryQueue). Routes the route index knows aren't flown
+    (and origin == destination) are skipped. The run's warmed-up session
+    (sessions.SESSIONS) is reused unless one is passed in.
+    """
+    destinations = ROUTE_INDEX.plan(origin, destinations, base_url=base_url)
+    if session is None:
+        session = SESSIONS.get(create_session)
     results = {}
+    retry = RetryQueue(label=iso_date(date))
 
     print(f"\n🔍 Scanning {len(destinations)} routes from {origin}...\n")
 
     # Start with longer delay
     base_delay = 15  # seconds
 
-    for idx, (dest_code, dest_name) in enumerate(destinations.items(), 1):
-        # Smart delay - increases if we hit rate limits
-        delay = random.uniform(base_delay, base_delay + 10)
-
-        print(
-            f"[{idx}/{len(destinations)}] {origin} → {dest_code} ({dest_name})", end=" "
-        )
-        print(f"(waiting {delay:.1f}s)...", end=" ", flush=True)
+    for batch in retry.rounds(destinations):
+        for idx, (dest_code, dest_name) in enumerate(batch.items(), 1):
+            # Smart delay - increases if we hit rate limits
+            delay = random.uniform(base_delay, base_delay + 10)
 
-        time.sleep(delay)
-
-        data, hit_limit = get_flight_data(origin, dest_code, date, session)
-
-        if hit_limit:
-            print("❌ Rate limited - increasing delay")
-            base_delay = min(base_delay + 10, 60)  # Cap at 60 seconds
-            continue
-
-        if data and "journeys" in data:
-            try:
-                flights = data["journeys"][0].get("flights")
-                if flights:
-                    gowild = [f for f in flights if f.get("isGoWildFareEnabled")]
-
-                    if gowild:
-                        results[dest_code] = {
-                            "name": dest_name,
-                            "count": len(gowild),
-                            "flights": gowild,
-                        }
-                        print(f"✅ {len(gowild)} GoWild flights!")
-                    else:
-                        print("○ No GoWild flights")
-                else:
-                    print("○ No flights")
-            except (KeyError, IndexError, TypeError):
-                print("○ No flights")
-        else:
-            print("○ No data")
+            print(
+                f"[{idx}/{len(batch)}] {origin} → {dest_code} ({dest_name})", end=" "
+            )
+            if ROUTE_CACHE.contains(origin, dest_code, date, base_url):
+                print("(cached)...", end=" ", flush=True)
+            else:
+                print(f"(waiting {delay:.1f}s)...", end=" ", flush=True)
+                polite_sleep(delay)
 
-        # Reduce delay if things are going well
-        if not hit_limit and base_delay > 15:
-            base_delay = max(base_delay - 2, 15)
+            data, hit_limit = get_flight_data(
+                origin, dest_code, date, session, base_url=base_url
+            )
 
-    return results
+            if hit_limit:
+                print("❌ Rate limited - increasing delay, will retry")
+                stream_route(sink, origin, dest_code, None, date, "rate_limited",
+                             checkpoint)
+                retry.defer(dest_code, dest_name)
+                base_delay = min(base_delay + 10, 60)  # Cap at 60 seconds
+                continue
 
+            entry, message = gowild_entry(data, dest_name)
+            if entry:
+                results[dest_code] = entry
+            if data is None:
+                retry.defer(dest_code, dest_name)
+            print(message)
+            stream_route(sink, origin, dest_code, entry, date,
+                         route_status(data, entry), checkpoint)
 
-def export_to_csv(origin, results, date_str):
-    """Export results to CSV file"""
-    if not results:
-        print("No results to export")
-        return
+            # Reduce delay if things are going well
+            if not hit_limit and base_delay > 15:
+                base_delay = max(base_delay - 2, 15)
 
-    filename = f"gowild_results_{origin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-
-    with open(filename, "w", newline="") as csvfile:
-        fieldnames = [
-            "Origin",
-            "Destination_Code",
-            "Destination_Name",
-            "Flight_Date",
-            "Price",
-            "Duration",
-            "Stops",
-            "Seats_Remaining",
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-        writer.writeheader()
-
-        for dest_code, info in results.items():
-            for flight in info["flights"]:
-                writer.writerow(
-                    {
-                        "Origin": origin,
-                        "Destination_Code": dest_code,
-                        "Destination_Name": info["name"],
-                        "Flight_Date": date_str.replace("%20", " "),
-                        "Price": flight.get("goWildFare", "N/A"),
-                        "Duration": flight.get("duration", "N/A"),
-                        "Stops": flight.get("stopsText", "N/A"),
-                        "Seats_Remaining": flight.get(
-                            "goWildFareSeatsRemaining", "N/A"
-                        ),
-                    }
-                )
-
-    print(f"\n✅ Results exported to: {filename}")
-    return filename
+    print(f"\n{retry.summary()}")
+    # Keep the destination list order, retries included.
+    return {code: results[code] for code in destinations if code in results}
 
 
 def display_results(origin, results):
@@ -364,7 +401,7 @@ def display_results(origin, results):
 
         for flight in info["flights"][:3]:  # Show first 3
             print(
-                f"   • ${flight.get('goWildFare')} - {flight.get('stopsText')} - {flight.get('duration')}"
+                f"   • ${flight.fare} - {flight.stops} - {flight.duration}"
             )
 
         print()
@@ -425,12 +462,6 @@ def get_destinations_to_search():
         return destinations
 
 
-def is_blackout_date(date_obj):
-    """Check if a date is a GoWild blackout date"""
-    date_str = date_obj.strftime("%Y-%m-%d")
-    return date_str in GOWILD_BLACKOUT_DATES
-
-
 if __name__ == "__main__":
     print("=== Frontier GoWild Flight Search (Fast) ===\n")
 
@@ -491,21 +522,45 @@ if __name__ == "__main__":
     # Get destinations to search AFTER date processing
     destinations_to_search = get_destinations_to_search()
 
-    # Search flights for all dates
+    # Search flights for all dates. Every route is streamed to disk and
+    # journaled as it finishes; only per-date counts are kept for the summary.
+    # With --resume, routes the journal has as done are not fetched again and
+    # the run keeps appending to the same result files.
     all_results = {}
-    blackout_dates = []
+    searchable_dates, blackout_dates = split_blackout_dates(dates_to_search)
+    checkpoint = Checkpoint(
+        "gowild_fast",
+        {"origin": origin, "dates": [iso_date(d) for d in dates_to_search],
+         "destinations": sorted(destinations_to_search)},
+        resume="--resume" in sys.argv,
+        meta={"sink": f"gowild_results_{origin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"},
+    )
+    if checkpoint.resumed:
+        print(f"\n⏩ Resuming: {checkpoint.resumed} routes already done")
+
+    # What the scan will cost before the first page load: blackout dates,
+    # cached, unserved and already-journaled routes need none.
+    plan = plan_query(
+        expand([(origin, code) for code in destinations_to_search], dates_to_search),
+        "gowild_fast/async" if async_scan.ENABLED else "gowild_fast",
+        default_seconds=20 * DELAY_SCALE + 1,
+        done=checkpoint.done,
+    )
+    print(f"\n{plan.summary()}")
+    if plan.requests and input("Proceed? [Y/n] ").strip().lower() == "n":
+        exit()
+    sink = ResultSink(checkpoint.meta["sink"], CSV_FIELDS)
 
     for date_obj in dates_to_search:
         # Check if this is a blackout date
         if is_blackout_date(date_obj):
-            blackout_dates.append(date_obj)
             print(f"\n{'='*60}")
             print(f"🚫 BLACKOUT DATE: {date_obj.strftime('%A, %B %d, %Y')}")
             print(f"{'='*60}")
             print("❌ This is a GoWild blackout date - no GoWild flights available.")
             print("   Skipping search for this date.")
             print(f"{'='*60}")
-            all_results[date_obj.strftime("%Y-%m-%d")] = {}
+            all_results[date_obj.strftime("%Y-%m-%d")] = 0
             continue
 
         date_str = date_obj.strftime("%b-%d,-%Y").replace("-", "%20")
@@ -513,19 +568,39 @@ if __name__ == "__main__":
         print(f"Searching flights for {date_obj.strftime('%A, %B %d, %Y')}")
         print(f"{'='*60}")
 
-        results = scan_routes(origin, destinations_to_search, date_str)
+        pending, restored = checkpoint.restore(origin, destinations_to_search, date_str)
+        if len(pending) < len(destinations_to_search):
+            print(f"⏩ {len(destinations_to_search) - len(pending)} routes done in an "
+                  f"earlier run, {len(pending)} to scan")
+        if not pending:
+            results = {}
+        elif async_scan.ENABLED:
+            results = async_scan.scan_routes(
+                origin, pending, date_str, sink=sink, checkpoint=checkpoint
+            )
+        else:
+            results = scan_routes(
+                origin, pending, date_str, sink=sink, checkpoint=checkpoint
+            )
+        results = {
+            code: restored.get(code) or results[code]
+            for code in destinations_to_search
+            if code in restored or code in results
+        }
         display_results(origin, results)
 
         print(f"\n{'='*60}")
         print(f"Total destinations with GoWild flights: {len(results)}")
         print(f"{'='*60}")
 
-        # Export to CSV
-        if results:
-            export_to_csv(origin, results, date_str)
+        # Store the count for this date
+        all_results[date_obj.strftime("%Y-%m-%d")] = len(results)
 
-        # Store results for this date
-        all_results[date_obj.strftime("%Y-%m-%d")] = results
+    sink.close()
+    checkpoint.close()
+    plan.finish()
+    if os.path.exists(sink.paths[1]):
+        print(f"\n✅ Results exported to: {', '.join(sink.paths)}")
 
     # Summary across all dates
     if len(dates_to_search) > 1:
@@ -540,14 +615,19 @@ if __name__ == "__main__":
                 print(f"   {bd.strftime('%Y-%m-%d (%A)')}: GoWild not available")
 
         # Show search results
-        searchable_dates = [d for d in dates_to_search if d not in blackout_dates]
         if searchable_dates:
             print(f"\n✅ Searched Dates ({len(searchable_dates)}):")
-            for date_key, results in all_results.items():
-                if results:  # Only show if not empty (not a blackout)
-                    # Check if this was a blackout (empty dict)
-                    date_obj_check = datetime.strptime(date_key, "%Y-%m-%d")
-                    if date_obj_check not in blackout_dates:
+            for date_key, count in all_results.items():
+                if count:  # Only show if not empty (not a blackout)
+                    # Check if this was a blackout (zero count)
+                    if not is_blackout_date(date_key):
                         print(
-                            f"   {date_key}: {len(results)} destinations with GoWild flights"
+                            f"   {date_key}: {count} destinations with GoWild flights"
                         )
+
+    print(f"\n{ROUTE_CACHE.summary()}")
+    print(FARE_STORE.summary())
+    print(ROUTE_INDEX.summary())
+    print(checkpoint.summary())
+    print(COVERAGE.summary())
+    print(SESSIONS.summary())
@@ -4,8 +4,7 @@ Optimized GoWild scraper using curl_cffi to bypass PerimeterX
 curl_cffi uses libcurl with Chrome's TLS fingerprint - bypasses TLS-based bot detection
 """
 
-import csv
-import html, json, random, time
+import random
 from datetime import datetime, timedelta
 
 try:
@@ -19,42 +18,66 @@ except ImportError:
 
     sys.exit(1)
 
-from bs4 import BeautifulSoup
+import async_scan
+from browser_state import restore_cookies
+from checkpoint import route_status
 
 # Import centralized configuration
-from config import GOWILD_BLACKOUT_DATES, SFO_DIRECT_DESTINATIONS
+from config import (
+    HOME_URL,
+    SFO_DIRECT_DESTINATIONS,
+    booking_url,
+    is_blackout_date,
+    iso_date,
+    polite_sleep,
+)
+from fare_store import FARE_STORE
+from gowild_fast import CSV_FIELDS, gowild_entry, stream_route
+from journeys import RESULTS, classify_page, content_charset, find_journeys_data_bytes
+from result_sink import ResultSink
+from retry_queue import COVERAGE, RetryQueue
+from route_cache import ROUTE_CACHE
+from route_index import ROUTE_INDEX
+from sessions import SESSIONS
 
 
 def create_session():
     """Create a session that mimics Chrome browser exactly with session warming"""
     # Use curl_cffi's Session which impersonates Chrome
     session = requests.Session()
+    # Cookies from the last run (results/cookies/), saved again at exit. They
+    # are tied to this TLS fingerprint, hence a jar separate from gowild_fast's.
+    restored = restore_cookies(session, "gowild_fast_bypass")
 
     print("Establishing and warming up session with Frontier...")
     try:
         # Step 1: Visit homepage to get initial cookies
         print("  1. Visiting homepage...")
         response = session.get(
-            "https://www.flyfrontier.com/", impersonate="chrome120", timeout=15
+            HOME_URL, impersonate="chrome120", timeout=15
         )
         print(f"     Status: {response.status_code}")
-        time.sleep(random.uniform(3, 5))
+        if restored and response.status_code == 200:
+            # The browsing pattern was established on an earlier run
+            print(f"✅ Session restored ({restored} cookies from the last run)")
+            return session
+        polite_sleep(random.uniform(3, 5))
 
         # Step 2: Visit another page to establish browsing pattern
         print("  2. Visiting travel page...")
         response = session.get(
-            "https://www.flyfrontier.com/travel/", impersonate="chrome120", timeout=15
+            HOME_URL + "travel/", impersonate="chrome120", timeout=15
         )
         print(f"     Status: {response.status_code}")
-        time.sleep(random.uniform(2, 4))
+        polite_sleep(random.uniform(2, 4))
 
         # Step 3: Visit deals page (closer to what we're actually doing)
         print("  3. Visiting deals page...")
         response = session.get(
-            "https://www.flyfrontier.com/deals/", impersonate="chrome120", timeout=15
+            HOME_URL + "deals/", impersonate="chrome120", timeout=15
         )
         print(f"     Status: {response.status_code}")
-        time.sleep(random.uniform(2, 4))
+        polite_sleep(random.uniform(2, 4))
 
         print(f"✅ Session warmed up successfully")
         print(f"   Cookies: {len(session.cookies)} cookies set")
@@ -64,9 +87,13 @@ def create_session():
         return session
 
 
-def get_flight_data(origin, dest, date, session):
+def get_flight_data(origin, dest, date, session, base_url=None):
     """Get flight data for a single route using Chrome impersonation"""
-    url = f"https://booking.flyfrontier.com/Flight/InternalSelect?o1={origin}&d1={dest}&dd1={date}&ADT=1&mon=true&promo="
+    cached = ROUTE_CACHE.get(origin, dest, date, base_url)
+    if cached is not None:
+        return cached, False
+
+    url = booking_url(origin, dest, date, base_url)
 
     try:
         response = session.get(
@@ -85,42 +112,19 @@ def get_flight_data(origin, dest, date, session):
         if response.status_code != 200:
             return None, False
 
-        # Check for CAPTCHA in content
-        if "px-captcha" in response.text or len(response.text) < 10000:
+        # Classify on the raw bytes and decode only the journeys script
+        content = response.content
+        if classify_page(content) != RESULTS:
             return None, True
 
-        # Extract flight data (same logic as original)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        for script in soup.find_all("script"):
-            script_text = script.string
-            if script_text and "journeys" in script_text and "flights" in script_text:
-                try:
-                    decoded_data = html.unescape(script_text)
-                    start = decoded_data.find("{")
-                    if start == -1:
-                        continue
-
-                    brace_count = 0
-                    end = start
-                    for i in range(start, len(decoded_data)):
-                        if decoded_data[i] == "{":
-                            brace_count += 1
-                        elif decoded_data[i] == "}":
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end = i + 1
-                                break
-
-                    json_str = decoded_data[start:end]
-                    data = json.loads(json_str)
-
-                    if "journeys" in data:
-                        return data, False
-                except json.JSONDecodeError:
-                    continue
-                except Exception:
-                    continue
+        # Extract flight data
+        charset = content_charset(response.headers.get("Content-Type"))
+        data = find_journeys_data_bytes(content, charset)
+        if data is not None:
+            ROUTE_CACHE.put(origin, dest, date, data, base_url)
+            FARE_STORE.record(origin, dest, date, data)
+            ROUTE_INDEX.observe(origin, dest, data, base_url)
+            return data, False
 
         return None, False
 
@@ -129,101 +133,61 @@ def get_flight_data(origin, dest, date, session):
         return None, False
 
 
-def scan_routes(origin, destinations, date):
-    """Scan all routes from an origin"""
-    session = create_session()
+def scan_routes(origin, destinations, date, base_url=None, sink=None, session=None):
+    """Scan all routes from an origin (base_url overrides the booking host).
+
+    Each route is appended to `sink` (a ResultSink) as soon as it finishes;
+    rate-limited or failed routes are retried at the end of the pass.
+    Routes the route index knows aren't flown are skipped. The warmed-up
+    session is shared by every date of the run (sessions.SESSIONS).
+    """
+    destinations = ROUTE_INDEX.plan(origin, destinations, base_url=base_url)
+    if session is None:
+        session = SESSIONS.get(create_session)
     results = {}
+    retry = RetryQueue(label=iso_date(date))
 
     print(f"\n🔍 Scanning {len(destinations)} routes from {origin}...\n")
 
     base_delay = 12  # More conservative delay
 
-    for idx, (dest_code, dest_name) in enumerate(destinations.items(), 1):
-        delay = random.uniform(base_delay, base_delay + 8)
-
-        print(
-            f"[{idx}/{len(destinations)}] {origin} → {dest_code} ({dest_name})", end=" "
-        )
-        print(f"(waiting {delay:.1f}s)...", end=" ", flush=True)
-
-        time.sleep(delay)
+    for batch in retry.rounds(destinations):
+        for idx, (dest_code, dest_name) in enumerate(batch.items(), 1):
+            delay = random.uniform(base_delay, base_delay + 8)
 
-        data, hit_limit = get_flight_data(origin, dest_code, date, session)
-
-        if hit_limit:
-            print("❌ Rate limited - increasing delay")
-            base_delay = min(base_delay + 10, 60)
-            continue
-
-        if data and "journeys" in data:
-            try:
-                flights = data["journeys"][0].get("flights")
-                if flights:
-                    gowild = [f for f in flights if f.get("isGoWildFareEnabled")]
-
-                    if gowild:
-                        results[dest_code] = {
-                            "name": dest_name,
-                            "count": len(gowild),
-                            "flights": gowild,
-                        }
-                        print(f"✅ {len(gowild)} GoWild flights!")
-                    else:
-                        print("○ No GoWild flights")
-                else:
-                    print("○ No flights")
-            except (KeyError, IndexError, TypeError):
-                print("○ No flights")
-        else:
-            print("○ No data")
-
-        if not hit_limit and base_delay > 12:
-            base_delay = max(base_delay - 2, 12)
+            print(
+                f"[{idx}/{len(batch)}] {origin} → {dest_code} ({dest_name})", end=" "
+            )
+            if ROUTE_CACHE.contains(origin, dest_code, date, base_url):
+                print("(cached)...", end=" ", flush=True)
+            else:
+                print(f"(waiting {delay:.1f}s)...", end=" ", flush=True)
+                polite_sleep(delay)
+
+            data, hit_limit = get_flight_data(
+                origin, dest_code, date, session, base_url=base_url
+            )
 
-    return results
+            if hit_limit:
+                print("❌ Rate limited - increasing delay, will retry")
+                stream_route(sink, origin, dest_code, None, date, "rate_limited")
+                retry.defer(dest_code, dest_name)
+                base_delay = min(base_delay + 10, 60)
+                continue
 
+            entry, message = gowild_entry(data, dest_name)
+            if entry:
+                results[dest_code] = entry
+            if data is None:
+                retry.defer(dest_code, dest_name)
+            print(message)
+            stream_route(sink, origin, dest_code, entry, date, route_status(data, entry))
 
-def export_to_csv(origin, results, date_str):
-    """Export results to CSV file"""
-    if not results:
-        print("No results to export")
-        return
+            if not hit_limit and base_delay > 12:
+                base_delay = max(base_delay - 2, 12)
 
-    filename = f"gowild_results_{origin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-
-    with open(filename, "w", newline="") as csvfile:
-        fieldnames = [
-            "Origin",
-            "Destination_Code",
-            "Destination_Name",
-            "Flight_Date",
-            "Price",
-            "Duration",
-            "Stops",
-            "Seats_Remaining",
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for dest_code, info in results.items():
-            for flight in info["flights"]:
-                writer.writerow(
-                    {
-                        "Origin": origin,
-                        "Destination_Code": dest_code,
-                        "Destination_Name": info["name"],
-                        "Flight_Date": date_str.replace("%20", " "),
-                        "Price": flight.get("goWildFare", "N/A"),
-                        "Duration": flight.get("duration", "N/A"),
-                        "Stops": flight.get("stopsText", "N/A"),
-                        "Seats_Remaining": flight.get(
-                            "goWildFareSeatsRemaining", "N/A"
-                        ),
-                    }
-                )
-
-    print(f"\n✅ Results exported to: {filename}")
-    return filename
+    print(f"\n{retry.summary()}")
+    return {code: results[code] for code in destinations if code in results}
 
 
 def display_results(origin, results):
@@ -242,7 +206,7 @@ def display_results(origin, results):
 
         for flight in info["flights"][:3]:
             print(
-                f"   • ${flight.get('goWildFare')} - {flight.get('stopsText')} - {flight.get('duration')}"
+                f"   • ${flight.fare} - {flight.stops} - {flight.duration}"
             )
 
         print()
@@ -261,10 +225,13 @@ if __name__ == "__main__":
     ]
 
     all_results = {}
+    sink = ResultSink(
+        f"gowild_results_{origin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}", CSV_FIELDS
+    )
 
     for date_obj in dates_to_search:
         date_str_check = date_obj.strftime("%Y-%m-%d")
-        if date_str_check in GOWILD_BLACKOUT_DATES_2025:
+        if is_blackout_date(date_obj):
             print(f"\n🚫 BLACKOUT DATE: {date_obj.strftime('%A, %B %d, %Y')}")
             continue
 
@@ -273,17 +240,30 @@ if __name__ == "__main__":
         print(f"Searching: {date_obj.strftime('%A, %B %d, %Y')}")
         print(f"{'='*60}")
 
-        results = scan_routes(origin, SFO_DIRECT_DESTINATIONS, date_str)
+        if async_scan.ENABLED:
+            results = async_scan.scan_routes(
+                origin, SFO_DIRECT_DESTINATIONS, date_str,
+                session=SESSIONS.get(create_session), fetch=get_flight_data,
+                base_delay=12, jitter=8, sink=sink,
+            )
+        else:
+            results = scan_routes(origin, SFO_DIRECT_DESTINATIONS, date_str, sink=sink)
         display_results(origin, results)
 
-        if results:
-            export_to_csv(origin, results, date_str)
+        all_results[date_str_check] = len(results)
 
-        all_results[date_str_check] = results
+    sink.close()
+    if sink.rows:
+        print(f"\n✅ Results exported to: {', '.join(sink.paths)}")
 
     # Summary
     print(f"\n{'='*60}")
     print("FINAL SUMMARY")
     print(f"{'='*60}")
-    for date_key, results in all_results.items():
-        print(f"{date_key}: {len(results)} destinations with GoWild")
+    for date_key, count in all_results.items():
+        print(f"{date_key}: {count} destinations with GoWild")
+    print(ROUTE_CACHE.summary())
+    print(FARE_STORE.summary())
+    print(ROUTE_INDEX.summary())
+    print(COVERAGE.summary())
+    print(SESSIONS.summary())
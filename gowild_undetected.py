@@ -5,15 +5,23 @@ This WILL work - undetected-chromedriver bypasses PerimeterX completely
 """
 
 import csv
-import json
 import time
 from datetime import datetime
 
 import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
 
 # Import centralized configuration
-from config import GOWILD_BLACKOUT_DATES, SFO_DIRECT_DESTINATIONS
+from config import (
+    HOME_URL,
+    SFO_DIRECT_DESTINATIONS,
+    booking_url,
+    iso_date,
+    is_blackout_date,
+)
+from fare_store import FARE_STORE
+from journeys import find_journeys_data
+from page_wait import READY_STATS, RESULTS_READY_JS, wait_until_ready
+from route_index import ROUTE_INDEX
 
 # SFO Direct Destinations (limited for testing)
 TEST_DESTINATIONS = {
@@ -41,15 +49,16 @@ def check_flight(driver, origin, dest, date_str):
     Check for GoWild flights using undetected browser
     """
     # Format the date properly for the URL
-    url = f"https://booking.flyfrontier.com/Flight/InternalSelect?o1={origin}&d1={dest}&dd1={date_str}&ADT=1&mon=true&promo="
+    url = booking_url(origin, dest, date_str)
 
     print(f"  {origin} → {dest}...", end=" ", flush=True)
 
     try:
         driver.get(url)
 
-        # Wait LONGER for PerimeterX JavaScript to complete
-        time.sleep(10)
+        # Wait for PerimeterX JavaScript to finish and the flights to render
+        # (returns early once they are in the DOM, gives up after 10s)
+        wait_until_ready(driver, RESULTS_READY_JS, 10, kind="results")
 
         # Get the page source
         page_source = driver.page_source
@@ -73,52 +82,19 @@ def check_flight(driver, origin, dest, date_str):
             return None
 
         # Try to extract JSON data from the page
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        for script in soup.find_all("script"):
-            script_text = script.string
-            if script_text and "journeys" in script_text and "flights" in script_text:
-                try:
-                    # Extract JSON
-                    import html as html_lib
-
-                    decoded = html_lib.unescape(script_text)
-
-                    start = decoded.find("{")
-                    if start == -1:
-                        continue
-
-                    # Find matching closing brace
-                    brace_count = 0
-                    end = start
-                    for i in range(start, len(decoded)):
-                        if decoded[i] == "{":
-                            brace_count += 1
-                        elif decoded[i] == "}":
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end = i + 1
-                                break
-
-                    json_str = decoded[start:end]
-                    data = json.loads(json_str)
-
-                    if "journeys" in data:
-                        flights = data["journeys"][0].get("flights", [])
-                        gowild_flights = [
-                            f for f in flights if f.get("isGoWildFareEnabled")
-                        ]
-
-                        if gowild_flights:
-                            print(f"✅ {len(gowild_flights)} GoWild!")
-                            return {"dest": dest, "flights": gowild_flights}
-                        else:
-                            print("○ No GoWild")
-                            return None
-
-                except Exception as e:
-                    print(f"⚠️  Parse error: {e}")
-                    continue
+        data = find_journeys_data(page_source)
+        if data is not None:
+            FARE_STORE.record(origin, dest, date_str, data)
+            ROUTE_INDEX.observe(origin, dest, data)
+            flights = data["journeys"][0].get("flights", [])
+            gowild_flights = [f for f in flights if f.get("isGoWildFareEnabled")]
+
+            if gowild_flights:
+                print(f"✅ {len(gowild_flights)} GoWild!")
+                return {"dest": dest, "flights": gowild_flights}
+            else:
+                print("○ No GoWild")
+                return None
 
         print("○ No data")
         return None
@@ -145,7 +121,7 @@ def main():
     try:
         # Warm up the session
         print("\nWarming up session...")
-        driver.get("https://www.flyfrontier.com/")
+        driver.get(HOME_URL)
         time.sleep(3)
 
         # Dates to search
@@ -155,14 +131,18 @@ def main():
         for date_formatted in dates:
             # Display friendly date
             date_display = date_formatted.replace("%20", " ").replace("%2C", ",")
+            if is_blackout_date(iso_date(date_formatted)):
+                print(f"\n🚫 BLACKOUT DATE: {date_display} - skipping")
+                continue
             print(f"\n{'='*60}")
             print(f"Searching: {date_display}")
             print(f"{'='*60}\n")
 
             results = {}
+            planned = ROUTE_INDEX.plan("SFO", destinations)
 
-            for idx, (dest_code, dest_name) in enumerate(destinations.items(), 1):
-                print(f"[{idx}/{len(destinations)}] ", end="")
+            for idx, (dest_code, dest_name) in enumerate(planned.items(), 1):
+                print(f"[{idx}/{len(planned)}] ", end="")
 
                 result = check_flight(driver, "SFO", dest_code, date_formatted)
 
@@ -194,6 +174,9 @@ def main():
                     duration = flight.get("duration", "N/A")
                     stops = flight.get("stopsText", "N/A")
                     print(f"  {code}: ${price} - {stops} - {duration}")
+        print(f"\n{READY_STATS.summary()}")
+        print(FARE_STORE.summary())
+        print(ROUTE_INDEX.summary())
 
     finally:
         print("\nClosing browser...")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Shared extractor for the journeys JSON embedded in Frontier's results pages.
+
+booking.flyfrontier.com/Flight/InternalSelect ships its flight data as an
+HTML-escaped object literal inside one <script> tag of a 300-600 KB page. The
+scrapers used to build a full BeautifulSoup tree of the page, unescape every
+candidate script and then walk the text one character at a time to find the
+closing brace. Here we find the script by offset, unescape only that slice and
+let json.JSONDecoder.raw_decode find the end of the object.
+
+Most of that object is never read: per flight the scanners, extract_deals,
+records.FlightRecord and the fare store use about ten fields, while the
+fare-class arrays (rules text, bundles) make up most of the bytes. So by
+default find_journeys_data projects: it walks the first journey's flight
+list in the still-escaped script text, keeps only the FLIGHT_FIELDS values,
+and unescapes and decodes just those. Anything the walk can't follow falls
+back to the full decode plus project_journeys, so the result is the same.
+
+HTTP scanners don't need the page as a str at all: classify_page sorts a raw
+response body into captcha / too short / results with bytes searches, and
+find_journeys_data_bytes locates the journeys script in the bytes and
+decodes only that slice (through a memoryview, so the slice isn't copied
+first). See benchmarks/bench_bytes.py.
+"""
+
+import codecs
+import html
+import json
+import re
+from functools import lru_cache
+
+CAPTCHA_MARKER = "px-captcha"
+_CAPTCHA_BYTES = CAPTCHA_MARKER.encode()
+
+# classify_page verdicts for a raw response body.
+CAPTCHA = "captcha"
+TOO_SHORT = "short"
+RESULTS = "results"
+MIN_RESULTS_BYTES = 10000  # anything shorter is a block / interstitial page
+
+_decoder = json.JSONDecoder()
+
+# Every flight / leg field a consumer reads; the rest is dropped on decode.
+FLIGHT_FIELDS = frozenset({
+    "isGoWildFareEnabled", "goWildFare", "goWildFareSeatsRemaining",
+    "discountDenFare", "discountDenFareSeatsRemaining", "stopsText",
+    "duration", "legs",
+})
+LEG_FIELDS = frozenset({
+    "origin", "destination", "departureDate", "arrivalDate",
+    "departureDateFormatted", "flightNumber",
+})
+_QUOTES = ("&quot;", "&#34;", '"')
+_MARKERS = {
+    str: ("<script", ">", "</script", "journeys", "flights"),
+    bytes: (b"<script", b">", b"</script", b"journeys", b"flights"),
+}
+_NEST_DEPTH = 8
+
+
+def _script_body(page, pos):
+    """(start, end) of the <script> body that contains offset `pos`, or None.
+
+    `page` may be str or bytes; offsets are into it either way.
+    """
+    open_tag, gt, close_tag = _MARKERS[type(page)][:3]
+    tag = page.rfind(open_tag, 0, pos)
+    if tag == -1:
+        return None
+    start = page.find(gt, tag, pos)
+    if start == -1:
+        return None
+    start += 1
+    # The marker sits after a script that was already closed -> not in a script.
+    if page.find(close_tag, start, pos) != -1:
+        return None
+    end = page.find(close_tag, pos)
+    if end == -1:
+        end = len(page)
+    return start, end
+
+
+def _journeys_scripts(page):
+    """Yield (start, end) of every <script> body that mentions journeys and flights."""
+    journeys, flights = _MARKERS[type(page)][3:]
+    pos = page.find(journeys)
+    while pos != -1:
+        bounds = _script_body(page, pos)
+        if bounds is None:
+            pos = page.find(journeys, pos + 1)
+            continue
+        start, end = bounds
+        if page.find(flights, start, end) != -1:
+            yield start, end
+        pos = page.find(journeys, end)
+
+
+@lru_cache(maxsize=None)
+def _patterns(quote):
+    """(flights array start, one "key": value pair) regexes for a quote form.
+
+    Python 3.9 has no possessive quantifiers or atomic groups, so every loop
+    is written unrolled (x*(?:y x*)*) with x and y starting on different
+    characters. A value then has exactly one way to match and a failed match
+    can't backtrack exponentially. Nested values count [ and { alike rather
+    than pairing them by type, which keeps the pattern linear in
+    _NEST_DEPTH. On valid JSON this makes no difference, and kept values are
+    checked again by json.loads.
+    """
+    q = re.escape(quote)
+    if quote == '"':
+        string = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+    else:
+        rest = re.escape(quote[1:])
+        string = rf"{q}[^&\\]*(?:(?:\\.|&(?!{rest}))[^&\\]*)*{q}"
+    plain = r'[^\[\]{}&"]*'
+    nested = rf"[\[{{]{plain}(?:{string}{plain})*[\]}}]"
+    for _ in range(_NEST_DEPTH):
+        nested = rf"[\[{{]{plain}(?:(?:{string}|{nested}){plain})*[\]}}]"
+    value = rf'{string}|{nested}|[^,\]}}\s&"\[{{]+'
+    flights = re.compile(rf"{q}flights{q}\s*:\s*\[\s*")
+    pair = re.compile(rf"\s*{q}([A-Za-z0-9_$]+){q}\s*:\s*({value})\s*([,}}])")
+    return flights, pair
+
+
+def _project_body(body):
+    """Projected journeys data straight from escaped script text, or None."""
+    quote = next((q for q in _QUOTES if f"{q}journeys{q}" in body), None)
+    if quote is None:
+        return None
+    flights_re, pair_re = _patterns(quote)
+    start = body.find(f"{quote}journeys{quote}")
+    m = flights_re.search(body, start)
+    # A "]" on the way means the journeys array closed before any flights.
+    if m is None or "]" in body[start:m.start()]:
+        return None
+    pos = m.end()
+    parts = []
+    while body.startswith("{", pos):
+        pos += 1
+        kept = []
+        while True:
+            m = pair_re.match(body, pos)
+            if m is None:
+                return None
+            key, value, sep = m.groups()
+            if key in FLIGHT_FIELDS:
+                kept.append(f'"{key}":{value}')
+            pos = m.end()
+            if sep == "}":
+                break
+        parts.append("{" + ",".join(kept) + "}")
+        while pos < len(body) and body[pos] in " \t\r\n,":
+            pos += 1
+    if not body.startswith("]", pos):
+        return None
+    text = "[" + ",".join(parts) + "]"
+    if quote != '"':
+        # The quote entity is nearly every entity here; str.replace is far
+        # cheaper than html.unescape and can't create a new entity.
+        text = text.replace(quote, '"')
+    if "&" in text:
+        text = html.unescape(text)
+    try:
+        flights = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    for f in flights:
+        if isinstance(f.get("legs"), list):
+            f["legs"] = [_project(leg, LEG_FIELDS) for leg in f["legs"]]
+    return {"journeys": [{"flights": flights}]}
+
+
+def _project(obj, fields):
+    if not isinstance(obj, dict):
+        return obj
+    return {k: v for k, v in obj.items() if k in fields}
+
+
+def project_journeys(data):
+    """Fully decoded journeys data cut down to what find_journeys_data projects."""
+    flights = [
+        dict(_project(f, FLIGHT_FIELDS), **(
+            {"legs": [_project(leg, LEG_FIELDS) for leg in f["legs"]]}
+            if isinstance(f.get("legs"), list) else {}
+        ))
+        for f in journey_flights(data)
+    ]
+    return {"journeys": [{"flights": flights}]}
+
+
+def _decode_body(body, project):
+    """Journeys data from one script body (str), or None."""
+    if project:
+        data = _project_body(body)
+        if data is not None:
+            return data
+    if "&" in body:
+        body = html.unescape(body)
+    brace = body.find("{")
+    if brace == -1:
+        return None
+    try:
+        data, _ = _decoder.raw_decode(body, brace)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(data, dict) and "journeys" in data:
+        return project_journeys(data) if project else data
+    return None
+
+
+def find_journeys_data(page, project=True):
+    """Return the decoded object holding "journeys" from a results page, or None.
+
+    With project=True (the default) only the FLIGHT_FIELDS / LEG_FIELDS of
+    the first journey's flights are kept: {"journeys": [{"flights": [...]}]}.
+    project=False decodes the whole object.
+    """
+    for start, end in _journeys_scripts(page):
+        data = _decode_body(page[start:end], project)
+        if data is not None:
+            return data
+    return None
+
+
+def classify_page(content):
+    """CAPTCHA, TOO_SHORT or RESULTS for a raw (bytes) response body."""
+    if _CAPTCHA_BYTES in content:
+        return CAPTCHA
+    if len(content) < MIN_RESULTS_BYTES:
+        return TOO_SHORT
+    return RESULTS
+
+
+def content_charset(content_type, default="utf-8"):
+    """The charset of a Content-Type header if it names a usable one."""
+    for param in (content_type or "").split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            try:
+                return codecs.lookup(value.strip("\"' ")).name
+            except LookupError:
+                break
+    return default
+
+
+def find_journeys_data_bytes(content, encoding="utf-8", project=True):
+    """find_journeys_data for a raw response body, decoding only the script.
+
+    The script is found with bytes searches, which is only valid for
+    ASCII-compatible encodings; anything else is decoded in full first.
+    """
+    if "journeys".encode(encoding, "ignore") != b"journeys":
+        return find_journeys_data(str(content, encoding, "replace"), project)
+    view = memoryview(content)
+    for start, end in _journeys_scripts(content):
+        data = _decode_body(str(view[start:end], encoding, "replace"), project)
+        if data is not None:
+            return data
+    return None
+
+
+def journey_flights(data):
+    """The outbound flight list from decoded journeys data ([] if empty)."""
+    if not data or not data.get("journeys"):
+        return []
+    return data["journeys"][0].get("flights") or []
+
+
+def parse_flights(page):
+    """Return the list of flight dicts from a results page, or [] if none/blocked."""
+    if CAPTCHA_MARKER in page:
+        return []
+    return journey_flights(find_journeys_data(page))
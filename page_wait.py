@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Readiness-based page waits for the Selenium scrapers.
+
+After driver.get() the scrapers used to sleep a fixed 6-10 s whether the page
+was usable after 2 s or never. wait_until_ready() instead polls the DOM with a
+small JS predicate and returns as soon as it holds, giving up at a hard cap
+(the old fixed wait), after which the caller carries on with whatever loaded.
+
+Every wait is recorded in READY_STATS, a time-to-ready histogram per page kind
+that the scrapers print at the end of a run, e.g.
+
+    Page ready (results): 54 pages, p50 2.1s, p90 3.4s, 2 hit the 9s cap
+      <=1s    ##### 5
+      <=2s    ######################## 24
+      ...
+"""
+
+import threading
+import time
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+# A Frontier results page is usable once the journeys script is in the DOM, or
+# once PerimeterX has swapped in its captcha (no point waiting for flights then).
+RESULTS_READY_JS = """
+if (document.getElementById('px-captcha')) return true;
+var scripts = document.getElementsByTagName('script');
+for (var i = 0; i < scripts.length; i++) {
+    var t = scripts[i].text;
+    if (t.indexOf('journeys') !== -1 && t.indexOf('flights') !== -1) return true;
+}
+return false;
+"""
+
+# A VacationsToGo fastdeal page is usable once its itinerary table is present
+# (by id, or any table with Port/Arrive headers - see parse_itinerary).
+ITINERARY_READY_JS = """
+if (document.getElementById('FastdealItinerary')) return true;
+var tables = document.getElementsByTagName('table');
+for (var i = 0; i < tables.length; i++) {
+    var row = tables[i].rows[0];
+    var hdr = row ? row.textContent : '';
+    if (hdr.indexOf('Port') !== -1 && hdr.indexOf('Arrive') !== -1) return true;
+}
+return false;
+"""
+
+POLL_SECONDS = 0.25
+# Errors a page throws while it is still navigating; anything else (a dead
+# session, a crashed Chrome) goes straight to the caller's restart logic.
+TRANSIENT_ERRORS = (JavascriptException, StaleElementReferenceException)
+BUCKETS = (1, 2, 3, 5, 8, 13)  # histogram upper bounds in seconds
+
+
+class ReadyStats:
+    """Thread-safe time-to-ready samples per page kind."""
+
+    def __init__(self):
+        self.samples = {}   # kind -> [seconds]
+        self.timeouts = {}  # kind -> count of waits that hit the cap
+        self.caps = {}      # kind -> last cap used
+        self._lock = threading.Lock()
+
+    def record(self, kind, seconds, ready, cap):
+        with self._lock:
+            self.samples.setdefault(kind, []).append(seconds)
+            self.caps[kind] = cap
+            if not ready:
+                self.timeouts[kind] = self.timeouts.get(kind, 0) + 1
+
+    @staticmethod
+    def _pct(ordered, pct):
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def summary(self):
+        with self._lock:
+            kinds = {k: sorted(v) for k, v in self.samples.items()}
+            timeouts = dict(self.timeouts)
+            caps = dict(self.caps)
+        if not kinds:
+            return "Page ready: no waits recorded"
+        lines = []
+        for kind, ordered in kinds.items():
+            lines.append(
+                f"Page ready ({kind}): {len(ordered)} pages, "
+                f"p50 {self._pct(ordered, 50):.1f}s, p90 {self._pct(ordered, 90):.1f}s, "
+                f"{timeouts.get(kind, 0)} hit the {caps[kind]:g}s cap"
+            )
+            counts = [0] * (len(BUCKETS) + 1)
+            for s in ordered:
+                i = 0
+                while i < len(BUCKETS) and s > BUCKETS[i]:
+                    i += 1
+                counts[i] += 1
+            widest = max(counts)
+            labels = [f"<={b}s" for b in BUCKETS] + [f">{BUCKETS[-1]}s"]
+            for label, n in zip(labels, counts):
+                if n:
+                    bar = "#" * max(1, round(n / widest * 30))
+                    lines.append(f"  {label:<7} {bar} {n}")
+        return "\n".join(lines)
+
+
+# Shared by every scraper in the process, like route_cache.ROUTE_CACHE.
+READY_STATS = ReadyStats()
+
+
+def wait_until_ready(driver, ready_js, cap, kind="page", stats=READY_STATS):
+    """Block until ready_js returns true in the page, or `cap` seconds pass.
+
+    Call right after driver.get(). Returns True if the page became ready,
+    False if the cap was hit (the caller decides what a half-loaded page
+    means). JS errors while the page is still navigating count as not ready;
+    other WebDriverExceptions (InvalidSessionIdException when Chrome has died)
+    are raised at once instead of waiting out the cap.
+    """
+    t0 = time.perf_counter()
+    try:
+        WebDriverWait(
+            driver, cap, poll_frequency=POLL_SECONDS,
+            ignored_exceptions=TRANSIENT_ERRORS,
+        ).until(lambda d: d.execute_script(ready_js))
+        ready = True
+    except TimeoutException:
+        ready = False
+    stats.record(kind, time.perf_counter() - t0, ready, cap)
+    return ready
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+How many page loads a query costs, and how long it will take, before any
+of them is made.
+
+gowild_fast's date / destination prompts, roundtrip_fast's OUTBOUND_DATES /
+RETURN_DATES and the deal report's CONUS / Int'l split all multiply out to
+origin x destination x date, and nothing said so up front: a 2-week range
+over 95 destinations quietly became a 10-hour run. expand() turns a query
+into (origin, dest, date) tasks and plan_query drops the ones that need no
+page load:
+
+    blackout   GoWild blackout dates (config.is_blackout_date)
+    duplicate  the same route and date listed twice
+    unserved   origin == dest, or pruned by route_index.ROUTE_INDEX
+    cached     fresh in route_cache.ROUTE_CACHE (served without a fetch)
+    done       already finished (e.g. a checkpoint journal on --resume)
+
+What is left is the request set. The ETA multiplies it by the seconds per
+page load this scanner measured on earlier runs (plan.finish() records it;
+results/latency.json), falling back to its configured politeness delay:
+
+    plan = plan_query(expand(routes, dates), "gowild_fast", default_seconds=21)
+    print(plan.summary())    # 🧮 Query plan: 190 tasks → 171 page loads ... ETA ~57 min
+    ... scan ...
+    plan.finish()            # measured s/page load for next time
+"""
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from config import is_blackout_date, iso_date
+from route_cache import ROUTE_CACHE
+from route_index import ROUTE_INDEX
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LATENCY_PATH = os.path.join(BASE_DIR, "results", "latency.json")
+SMOOTHING = 0.3  # weight of the newest run in the per-scanner average
+
+Task = namedtuple("Task", "origin dest date")
+
+
+class LatencyLog:
+    """Seconds per page load, per scanner, averaged over runs (EWMA)."""
+
+    def __init__(self, path=LATENCY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key):
+        """(seconds, runs measured) or (None, 0)."""
+        entry = self._load().get(key) or {}
+        return entry.get("seconds"), entry.get("runs", 0)
+
+    def record(self, key, seconds):
+        with self._lock:
+            data = self._load()
+            entry = data.get(key) or {}
+            old = entry.get("seconds")
+            entry["seconds"] = seconds if old is None else (
+                SMOOTHING * seconds + (1 - SMOOTHING) * old
+            )
+            entry["runs"] = entry.get("runs", 0) + 1
+            data[key] = entry
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+LATENCY = LatencyLog()
+
+
+def _duration(seconds):
+    if seconds < 90:
+        return f"{seconds:.0f} s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+class QueryPlan:
+    """The page loads a query needs, what was dropped, and an ETA."""
+
+    def __init__(self, key, tasks, dropped, seconds, measured_runs,
+                 latency=LATENCY):
+        self.key = key
+        self.tasks = tasks
+        self.dropped = dropped
+        self.seconds = seconds
+        self.measured_runs = measured_runs
+        self.latency = latency
+        self._started = time.time()
+        self._misses = ROUTE_CACHE.misses
+
+    @property
+    def requests(self):
+        return len(self.tasks)
+
+    @property
+    def eta_seconds(self):
+        return self.requests * self.seconds
+
+    def summary(self):
+        total = self.requests + sum(self.dropped.values())
+        dropped = ", ".join(f"{n} {why}" for why, n in self.dropped.items() if n)
+        basis = (f"measured over {self.measured_runs} run(s)" if self.measured_runs
+                 else "configured delay")
+        text = f"🧮 Query plan: {total} tasks → {self.requests} page loads"
+        if dropped:
+            text += f" ({dropped} dropped)"
+        return (f"{text}\n   ETA ~{_duration(self.eta_seconds)} at "
+                f"{self.seconds:.1f} s/page load ({basis})")
+
+    def finish(self, fetched=None):
+        """Record this run's seconds per page load for the next ETA.
+
+        fetched defaults to the route cache misses since the plan was made
+        (the page loads actually attempted).
+        """
+        if fetched is None:
+            fetched = ROUTE_CACHE.misses - self._misses
+        if fetched > 0:
+            self.latency.record(self.key, (time.time() - self._started) / fetched)
+
+
+def expand(routes, dates):
+    """(origin, dest, date) for every route on every date."""
+    dates = list(dates)
+    for origin, dest in routes:
+        for day in dates:
+            yield origin, dest, day
+
+
+def plan_query(tasks, key, default_seconds, done=None, base_url=None,
+               latency=LATENCY):
+    """The page loads a scan of `tasks` will make, as a QueryPlan.
+
+    tasks: (origin, dest, date) triples (see expand()); dates may be in any
+    form config.iso_date takes. done(origin, dest, date) marks tasks finished
+    in an earlier run. key names the scanner for the measured latency;
+    default_seconds is the per-page-load estimate until one has been measured.
+    """
+    dropped = {"blackout": 0, "duplicate": 0, "unserved": 0, "cached": 0, "done": 0}
+    seen = set()
+    planned = []
+    blackout = {}
+    for origin, dest, day in tasks:
+        iso = iso_date(day)
+        if iso not in blackout:
+            blackout[iso] = is_blackout_date(iso)
+        task = Task(origin.upper(), dest.upper(), iso)
+        if blackout[iso]:
+            dropped["blackout"] += 1
+        elif task in seen:
+            dropped["duplicate"] += 1
+        elif ROUTE_INDEX.skip(task.origin, task.dest, base_url):
+            dropped["unserved"] += 1
+        elif ROUTE_CACHE.contains(task.origin, task.dest, iso, base_url):
+            dropped["cached"] += 1
+        elif done is not None and done(task.origin, task.dest, iso):
+            dropped["done"] += 1
+        else:
+            planned.append(task)
+        seen.add(task)
+    seconds, runs = latency.get(key)
+    if seconds is None:
+        seconds = default_seconds
+    return QueryPlan(key, planned, dropped, seconds, runs, latency)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Global politeness budget shared by concurrent scanners.
+
+With one browser the politeness delay is simply a sleep between routes. With
+several workers the sleeps would multiply the request rate by the worker
+count, so instead every worker acquires a slot from one RateBudget before each
+request. The budget is a GCRA (generic cell rate algorithm, a token bucket
+that only stores the "theoretical arrival time"): slots are handed out at most
+one per `interval` seconds in aggregate, with up to `burst` back to back.
+
+    budget = RateBudget(interval=5)   # 12 requests/min across all workers
+    budget.acquire()                  # blocks until this caller's slot
+
+Intervals are scaled by FRONTIER_DELAY_SCALE like every other politeness delay,
+so a scale of 0 disables the budget against the local stand-in server.
+
+The interval can also adapt, with the same rules the requests scanners apply
+to their own delay: penalize() after a 403/captcha widens it (capped), and
+reward() after a good response narrows it again, never below the starting
+interval. Because the budget is shared, one block slows every worker down.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+from config import DELAY_SCALE
+
+
+class RateBudget:
+    """Thread-safe GCRA limiter: one slot per `interval` seconds, `burst` deep.
+
+    `interval` and `jitter` are in live-site seconds; each slot is spaced by
+    interval + uniform(0, jitter), times the delay scale.
+    """
+
+    def __init__(self, interval, burst=1, scale=None, jitter=0.0):
+        self.scale = DELAY_SCALE if scale is None else scale
+        self.base = self.floor = max(0.0, interval)
+        self.jitter = jitter
+        self.burst = max(1, burst)
+        self.acquired = 0
+        self.waited = 0.0  # total seconds callers spent blocked
+        self.penalties = 0
+        self._tat = time.monotonic()  # theoretical arrival time of the next slot
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+
+    @property
+    def interval(self):
+        """Current spacing between slots before jitter, in real seconds."""
+        return self.base * self.scale
+
+    @property
+    def per_minute(self):
+        return 60 / self.interval if self.interval else float("inf")
+
+    def penalize(self, step=10, cap=60):
+        """Blocked (403/captcha): widen the interval by `step`, up to `cap`."""
+        with self._lock:
+            self.base = min(self.base + step, max(cap, self.floor))
+            self.penalties += 1
+
+    def reward(self, step=2):
+        """Good response: narrow the interval by `step`, down to the start."""
+        with self._lock:
+            if self.base > self.floor:
+                self.base = max(self.base - step, self.floor)
+
+    def reserve(self):
+        """Claim the next slot; returns how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            # A slot is free once the backlog is within the burst allowance.
+            start = tat - (self.burst - 1) * self.interval
+            delay = max(0.0, start - now)
+            spacing = self.base
+            if self.jitter:
+                spacing += self._rng.uniform(0, self.jitter)
+            self._tat = tat + spacing * self.scale
+            self.acquired += 1
+            self.waited += delay
+        return delay
+
+    def acquire(self):
+        """Block until the caller may send its request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self):
+        """acquire() for coroutines: waits without blocking the event loop."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def summary(self):
+        if not self.interval:
+            return f"Rate budget: unlimited, {self.acquired} requests"
+        text = (
+            f"Rate budget: {self.per_minute:.1f} req/min, {self.acquired} requests, "
+            f"{self.waited:.0f}s spent waiting for a slot"
+        )
+        if self.penalties:
+            text += f", slowed down {self.penalties}x"
+        return text
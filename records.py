@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Compact flight and deal records.
+
+The scanners used to keep every GoWild flight as the raw journeys dict
+(fare-class arrays, bundles, rules text and all) in results[dest]["flights"]
+for every date of a range scan, and extract_deals built an 11-key dict per
+deal repeating the same origin / dest / name / date strings. Here both are
+__slots__ classes holding only the fields the displays, CSV exports and
+reports read:
+
+    FlightRecord   one GoWild flight (fare, seats, stops, times, ...)
+    Deal           one priced deal for the deal report
+
+Repeated short strings (airport codes, city names, dates, "Nonstop", ...)
+are interned so a 30-day range scan keeps one copy of each, and fare types
+are the FareType enum rather than free text. FareType is a str enum, so
+deal.fare_type == "GoWild" still holds. benchmarks/bench_records.py measures
+bytes per flight and peak RSS against the raw dicts.
+"""
+
+import sys
+from enum import Enum
+
+_intern = sys.intern
+
+
+def _text(value, default="N/A"):
+    return _intern(value) if isinstance(value, str) else default
+
+
+class FareType(str, Enum):
+    GOWILD = "GoWild"
+    DISCOUNT_DEN = "Discount Den"
+
+    def __str__(self):
+        return self.value
+
+
+class FlightRecord:
+    """The parts of a journeys flight dict the scanners use."""
+
+    __slots__ = (
+        "fare", "seats", "discount_den", "discount_den_seats", "stops",
+        "duration", "departs", "departs_at", "arrives_at", "flight_no",
+    )
+
+    def __init__(self, fare, seats=None, discount_den=None, discount_den_seats=None,
+                 stops="N/A", duration="N/A", departs="N/A", departs_at=None,
+                 arrives_at=None, flight_no=None):
+        self.fare = fare
+        self.seats = seats
+        self.discount_den = discount_den
+        self.discount_den_seats = discount_den_seats
+        self.stops = stops
+        self.duration = duration
+        self.departs = departs
+        self.departs_at = departs_at
+        self.arrives_at = arrives_at
+        self.flight_no = flight_no
+
+    @classmethod
+    def from_flight(cls, flight):
+        """Build a record from one flight dict of the journeys payload."""
+        legs = flight.get("legs") or [{}]
+        first, last = legs[0] or {}, legs[-1] or {}
+        fare = flight.get("goWildFare")
+        dd = flight.get("discountDenFare")
+        seats = flight.get("goWildFareSeatsRemaining")
+        return cls(
+            float(fare) if fare is not None else None,
+            _text(seats, seats),
+            float(dd) if dd is not None else None,
+            flight.get("discountDenFareSeatsRemaining"),
+            _text(flight.get("stopsText")),
+            _text(flight.get("duration")),
+            _text(first.get("departureDateFormatted")),
+            first.get("departureDate"),
+            last.get("arrivalDate"),
+            _text(first.get("flightNumber"), None),
+        )
+
+    def __repr__(self):
+        return (f"FlightRecord(fare={self.fare!r}, stops={self.stops!r}, "
+                f"departs_at={self.departs_at!r})")
+
+
+def gowild_records(flights):
+    """FlightRecords for the GoWild-enabled flights of a journeys flight list."""
+    return [
+        FlightRecord.from_flight(f) for f in flights or () if f.get("isGoWildFareEnabled")
+    ]
+
+
+def best_fare(records, default=999):
+    """Cheapest GoWild fare among FlightRecords (default when none is priced)."""
+    return min((r.fare for r in records if r.fare is not None), default=default)
+
+
+class Deal:
+    """One GoWild or Discount Den fare on a route, as the deal report ranks it."""
+
+    __slots__ = (
+        "fare_type", "origin", "dest", "dest_name", "price", "stops",
+        "duration", "departs", "seats", "flight_date", "is_intl",
+    )
+
+    def __init__(self, fare_type, origin, dest, dest_name, price, stops="N/A",
+                 duration="N/A", departs="N/A", seats=None, flight_date="",
+                 is_intl=False):
+        self.fare_type = FareType(fare_type)
+        self.origin = _intern(origin)
+        self.dest = _intern(dest)
+        self.dest_name = _intern(dest_name)
+        self.price = price
+        self.stops = _text(stops)
+        self.duration = _text(duration)
+        self.departs = _text(departs)
+        self.seats = seats
+        self.flight_date = _intern(flight_date)
+        self.is_intl = is_intl
+
+    def as_dict(self):
+        """The dict form extract_deals used to return ("type" = fare type)."""
+        d = {name: getattr(self, name) for name in self.__slots__}
+        d["type"] = d.pop("fare_type").value
+        return d
+
+    def __repr__(self):
+        return (f"Deal({self.fare_type.value}, {self.origin}>{self.dest}, "
+                f"${self.price:.2f}, {self.flight_date})")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Streaming result sink: rows are written as each route completes.
+
+The scanners used to keep every result in memory and write one CSV at the
+very end, so a crash at route 90 of 95 lost the whole run. A ResultSink
+appends each route's rows to an NDJSON file and a CSV file side by side,
+flushing both after every route, so whatever finished is on disk:
+
+    sink = ResultSink("gowild_results_SFO_20260302_000100", FIELDS)
+    sink.write_route(rows, origin="SFO", dest="DEN", date="2026-03-02")
+    sink.close()
+
+Files are opened on the first write (an empty run leaves nothing behind).
+RESULT_GZIP=1 writes .ndjson.gz / .csv.gz instead; each flush is a gzip
+sync flush, so a partly written file still decompresses up to the last
+route.
+
+RESULT_EVENTS=1 also prints one machine-readable line per event on stdout,
+between the normal progress output:
+
+    @event {"event": "route", "origin": "SFO", "dest": "DEN", "rows": 3, ...}
+
+so another tool can follow a long scan live:
+
+    RESULT_EVENTS=1 python3 gowild_fast.py | python3 result_sink.py follow
+"""
+
+import csv
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+
+COMPRESS = os.environ.get("RESULT_GZIP", "0") == "1"
+EVENTS = os.environ.get("RESULT_EVENTS", "0") == "1"
+EVENT_PREFIX = "@event "
+
+
+def _json_default(value):
+    return str(value)
+
+
+def emit(event, **fields):
+    """Print one event line (EVENT_PREFIX + JSON) on stdout."""
+    record = {"event": event, "ts": round(time.time(), 3), **fields}
+    sys.stdout.write(EVENT_PREFIX + json.dumps(record, default=_json_default) + "\n")
+    sys.stdout.flush()
+
+
+def parse_event(line):
+    """The event dict from an output line, or None for ordinary output."""
+    if not line.startswith(EVENT_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(EVENT_PREFIX):])
+    except json.JSONDecodeError:
+        return None
+
+
+class ResultSink:
+    """Append-only NDJSON + CSV writer, flushed per route; thread-safe."""
+
+    def __init__(self, base_path, fieldnames, compress=None, events=None):
+        self.base_path = base_path
+        self.fieldnames = list(fieldnames)
+        self.compress = COMPRESS if compress is None else compress
+        self.events = EVENTS if events is None else events
+        self.routes = 0
+        self.rows = 0
+        self._ndjson = None
+        self._csv_file = None
+        self._csv = None
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self):
+        ext = ".gz" if self.compress else ""
+        return f"{self.base_path}.ndjson{ext}", f"{self.base_path}.csv{ext}"
+
+    def _open(self):
+        ndjson_path, csv_path = self.paths
+        if os.path.dirname(self.base_path):
+            os.makedirs(os.path.dirname(self.base_path), exist_ok=True)
+        new_csv = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+        if self.compress:
+            self._ndjson = gzip.open(ndjson_path, "at", encoding="utf-8")
+            self._csv_file = gzip.open(csv_path, "at", encoding="utf-8", newline="")
+        else:
+            self._ndjson = open(ndjson_path, "a", encoding="utf-8")
+            self._csv_file = open(csv_path, "a", encoding="utf-8", newline="")
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=self.fieldnames,
+                                   extrasaction="ignore")
+        if new_csv:
+            self._csv.writeheader()
+
+    def write_route(self, rows, **route):
+        """Append one route's rows (dicts keyed by fieldnames) and flush.
+
+        `route` (origin, dest, date, ...) goes into the route event only.
+        """
+        with self._lock:
+            if rows:
+                if self._ndjson is None:
+                    self._open()
+                self._ndjson.write(
+                    "".join(json.dumps(r, default=_json_default) + "\n" for r in rows)
+                )
+                self._csv.writerows(rows)
+                # For gzip this flushes through to a zlib sync flush.
+                self._ndjson.flush()
+                self._csv_file.flush()
+            self.routes += 1
+            self.rows += len(rows)
+        if self.events:
+            emit("route", rows=len(rows), **route)
+
+    def close(self):
+        with self._lock:
+            for f in (self._ndjson, self._csv_file):
+                if f is not None:
+                    f.close()
+            self._ndjson = self._csv_file = self._csv = None
+        if self.events:
+            emit("done", routes=self.routes, rows=self.rows,
+                 files=list(self.paths) if self.rows else [])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def summary(self):
+        if not self.rows:
+            return f"Result sink: no rows written ({self.routes} routes)"
+        return f"Result sink: {self.rows} rows from {self.routes} routes → {', '.join(self.paths)}"
+
+
+def main():
+    """follow: read scanner output on stdin and print only the events, as JSON."""
+    if sys.argv[1:2] != ["follow"]:
+        print("usage: <scanner> | python3 result_sink.py follow", file=sys.stderr)
+        sys.exit(2)
+    for line in sys.stdin:
+        event = parse_event(line)
+        if event is not None:
+            print(json.dumps(event), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Deferred retries for routes that were rate limited or failed.
+
+The scanners used to print "Rate limited" and move on, so every captcha left
+a hole in the results that only a second manual run could fill. A
+RetryQueue runs a scan in rounds instead: the first round is every route;
+routes that come back rate limited (or with no journeys payload) are
+deferred to the end of the pass and retried in the next round, after a wait
+that doubles each round, until they succeed or run out of attempts:
+
+    retry = RetryQueue()
+    for batch in retry.rounds(destinations):   # {code: name}
+        for code, name in batch.items():
+            data, hit_limit = get_flight_data(...)
+            if hit_limit or data is None:
+                retry.defer(code, name)
+                continue
+            ...
+    print(retry.summary())   # attempted / succeeded / abandoned
+
+Every finished queue also adds its counts to the process-wide COVERAGE, whose
+summary() the scripts print at the end of a run next to the cache summaries.
+
+Waiting between rounds (rather than retrying a route straight away) gives
+the block time to clear while the rest of the pass keeps going. A caller
+that learns during the pass that some routes are no longer needed passes
+rounds(items, keep=...): deferred routes keep() rejects are dropped before
+the wait, and a round left empty doesn't wait at all. retried counts only
+the routes actually tried again (skip() takes one back).
+
+Settings (env vars):
+    SCAN_RETRY_ATTEMPTS=3    tries per route, including the first (1 = no retries)
+    SCAN_RETRY_DELAY=60      seconds before the first retry round; doubles
+                             each round, scaled by FRONTIER_DELAY_SCALE
+"""
+
+import os
+import threading
+
+from config import polite_sleep
+
+MAX_ATTEMPTS = int(os.environ.get("SCAN_RETRY_ATTEMPTS", "3"))
+RETRY_DELAY = float(os.environ.get("SCAN_RETRY_DELAY", "60"))
+
+
+def _coverage_line(attempted, retried, abandoned):
+    text = (f"Coverage: {attempted - len(abandoned)}/{attempted} routes succeeded, "
+            f"{retried} retries, {len(abandoned)} abandoned")
+    if abandoned:
+        shown = ", ".join(str(k) for k in abandoned[:10])
+        text += f" ({shown}, ...)" if len(abandoned) > 10 else f" ({shown})"
+    return text
+
+
+class Coverage:
+    """Run-wide totals over every RetryQueue that finished."""
+
+    def __init__(self):
+        self.attempted = 0
+        self.retried = 0
+        self.abandoned = []
+        self._lock = threading.Lock()
+
+    def add(self, queue, label=None):
+        with self._lock:
+            self.attempted += queue.attempted
+            self.retried += queue.retried
+            self.abandoned.extend(
+                f"{label} {k}" if label else k for k in queue.abandoned
+            )
+
+    def summary(self):
+        return _coverage_line(self.attempted, self.retried, self.abandoned)
+
+
+COVERAGE = Coverage()
+
+
+class RetryQueue:
+    """Rounds of routes; deferred ones come back with exponential spacing."""
+
+    def __init__(self, max_attempts=None, base_delay=None, sleep=None,
+                 coverage=COVERAGE, label=None):
+        self.max_attempts = max(1, MAX_ATTEMPTS if max_attempts is None else max_attempts)
+        self.base_delay = RETRY_DELAY if base_delay is None else base_delay
+        self.sleep = polite_sleep if sleep is None else sleep
+        self.coverage = coverage
+        self.label = label
+        self.attempts = {}
+        self.abandoned = {}
+        self.retried = 0
+        self._deferred = {}
+        self._retrying = False
+        self._lock = threading.Lock()
+
+    def rounds(self, items, keep=None):
+        """Yield {key: value} batches: everything first, then each retry round.
+
+        Keys deferred during a batch come back in the next one, until
+        max_attempts; after that they are abandoned. keep(key, value), if
+        given, is asked about each deferred key just before a retry round;
+        keys it rejects are dropped (neither retried nor abandoned). The
+        totals go to `coverage` once every round is done.
+        """
+        batch = dict(items)
+        n = 0
+        while batch:
+            self._retrying = n > 0
+            if n:
+                wait = self.base_delay * 2 ** (n - 1)
+                print(f"\n🔁 Retry round {n}: {len(batch)} deferred route(s) "
+                      f"after {wait:.0f}s...\n")
+                self.sleep(wait)
+                self.retried += len(batch)
+            for key in batch:
+                self.attempts[key] = self.attempts.get(key, 0) + 1
+            yield batch
+            with self._lock:
+                deferred, self._deferred = self._deferred, {}
+            batch = {}
+            for key, value in deferred.items():
+                if keep is not None and not keep(key, value):
+                    continue
+                if self.attempts[key] < self.max_attempts:
+                    batch[key] = value
+                else:
+                    self.abandoned[key] = value
+            n += 1
+        if self.coverage is not None:
+            self.coverage.add(self, self.label)
+
+    def defer(self, key, value=None):
+        """Retry `key` in the next round (if it has attempts left)."""
+        with self._lock:
+            self._deferred[key] = value
+
+    def skip(self, key):
+        """Take back this round's attempt at `key`: the caller decided not to
+        try it (e.g. it can no longer change the result)."""
+        with self._lock:
+            if self._retrying:
+                self.retried -= 1
+            left = self.attempts.get(key, 0) - 1
+            if left > 0:
+                self.attempts[key] = left
+            else:
+                self.attempts.pop(key, None)
+
+    @property
+    def attempted(self):
+        return len(self.attempts)
+
+    @property
+    def succeeded(self):
+        return self.attempted - len(self.abandoned)
+
+    def summary(self):
+        return _coverage_line(self.attempted, self.retried, list(self.abandoned))
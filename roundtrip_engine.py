@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Round-trip combination engine.
+
+compile_roundtrips used to walk every outbound date x destination x return
+date in Python, build a dict per pair and sort them all. Here the best fare
+per (destination, day) is held in two dense arrays, outbound and return, on a
+shared day axis (inf = no fare). For a stay of s days every pair is just
+
+    out[:, :n - s] + ret[:, s:]
+
+one vectorised add over all destinations and departure days at once. For
+each stay, np.partition finds the k-th cheapest total and every pair at or
+below it is kept, so pairs tied with the k-th all survive. The final top-k
+is picked from those per-stay candidates by (total, destination, day, stay),
+so ties break the same way on every run and the full pair list is never
+built. min_stay / max_stay bound the stays considered (in days; 0 = same-day
+return).
+
+NumPy is optional: without it the same answer comes from a heapq.nsmallest
+walk over each destination's fare days (fine for the scripts' handful of
+dates, slow at benchmark scale). See benchmarks/bench_roundtrip.py.
+
+lazy_return_search is the fetch-side counterpart for a top-k query: it
+decides which return legs are worth a page load at all (branch and bound on
+outbound fare + the lowest possible return fare).
+"""
+
+import heapq
+import math
+from collections import namedtuple
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback below
+    np = None
+
+RoundTrip = namedtuple(
+    "RoundTrip", "dest outbound_date return_date outbound_price return_price total_price"
+)
+
+
+def best_price_grids(outbound_by_date, return_by_date):
+    """Dense best-fare grids from the scripts' per-date search results.
+
+    Both inputs map "YYYY-MM-DD" -> {dest_code: {"best_price": ...}}, as
+    returned by search_outbound / search_return. Returns (dests, first_day,
+    out, ret): out/ret are len(dests) x n_days lists of lists, or float
+    arrays when NumPy is available, indexed [dest][day - first_day].
+    """
+    dests = []
+    seen = set()
+    for results in outbound_by_date.values():
+        for code in results:
+            if code not in seen:
+                seen.add(code)
+                dests.append(code)
+    ordinals = [
+        date.fromisoformat(d).toordinal()
+        for d in list(outbound_by_date) + list(return_by_date)
+    ]
+    if not dests or not ordinals:
+        return dests, None, None, None
+    first = min(ordinals)
+    n_days = max(ordinals) - first + 1
+    row = {code: i for i, code in enumerate(dests)}
+
+    def grid(by_date):
+        cells = [[math.inf] * n_days for _ in dests]
+        for day, results in by_date.items():
+            col = date.fromisoformat(day).toordinal() - first
+            for code, info in results.items():
+                if code in row:
+                    cells[row[code]][col] = info["best_price"]
+        return np.array(cells, dtype=np.float64) if np is not None else cells
+
+    return dests, first, grid(outbound_by_date), grid(return_by_date)
+
+
+def _stays(n_days, min_stay, max_stay):
+    hi = n_days - 1 if max_stay is None else min(max_stay, n_days - 1)
+    return range(max(min_stay, 0), hi + 1)
+
+
+def top_k_pairs(out, ret, k=None, min_stay=0, max_stay=None):
+    """Cheapest (total, dest_row, out_day, stay) over all valid pairs.
+
+    out/ret are dests x days best-fare grids (inf = no fare). k=None returns
+    every pair that has both fares. Ties are broken by destination row, then
+    departure day, then stay, so results are deterministic.
+    """
+    if np is None or not isinstance(out, np.ndarray):
+        return _top_k_pairs_py(out, ret, k, min_stay, max_stay)
+    n_dests, n_days = out.shape
+    totals, rows, days, stays = [], [], [], []
+    for s in _stays(n_days, min_stay, max_stay):
+        block = out[:, : n_days - s] + ret[:, s:]
+        flat = block.ravel()
+        if k is not None and k < flat.size:
+            # Keep every pair tied with the k-th total (a k-element partition
+            # would keep an arbitrary subset); the lexsort below chooses.
+            kth = np.partition(flat, k - 1)[k - 1]
+            idx = np.flatnonzero(flat <= kth)
+        else:
+            idx = np.arange(flat.size)
+        idx = idx[np.isfinite(flat[idx])]
+        if not idx.size:
+            continue
+        r, d = np.divmod(idx, n_days - s)
+        totals.append(flat[idx])
+        rows.append(r)
+        days.append(d)
+        stays.append(np.full(idx.size, s))
+    if not totals:
+        return []
+    totals, rows = np.concatenate(totals), np.concatenate(rows)
+    days, stays = np.concatenate(days), np.concatenate(stays)
+    order = np.lexsort((stays, days, rows, totals))
+    if k is not None:
+        order = order[:k]
+    return [
+        (float(totals[i]), int(rows[i]), int(days[i]), int(stays[i])) for i in order
+    ]
+
+
+def _top_k_pairs_py(out, ret, k, min_stay, max_stay):
+    """top_k_pairs without NumPy: a lazy pair walk fed to heapq.nsmallest."""
+    n_days = len(out[0]) if out else 0
+    stays = _stays(n_days, min_stay, max_stay)
+
+    def pairs():
+        for r, (out_row, ret_row) in enumerate(zip(out, ret)):
+            ret_days = [d for d, p in enumerate(ret_row) if p != math.inf]
+            if not ret_days:
+                continue
+            for d, price in enumerate(out_row):
+                if price == math.inf:
+                    continue
+                for s in stays:
+                    if d + s >= n_days:
+                        break
+                    back = ret_row[d + s]
+                    if back != math.inf:
+                        yield (price + back, r, d, s)
+
+    if k is None:
+        return sorted(pairs())
+    return heapq.nsmallest(k, pairs())
+
+
+def top_roundtrips(outbound_by_date, return_by_date, k=None, min_stay=0,
+                   max_stay=None):
+    """Cheapest round trips as RoundTrip tuples (dates as "YYYY-MM-DD")."""
+    dests, first, out, ret = best_price_grids(outbound_by_date, return_by_date)
+    if first is None:
+        return []
+    trips = []
+    for total, r, d, s in top_k_pairs(out, ret, k, min_stay, max_stay):
+        out_day = date.fromordinal(first + d).isoformat()
+        ret_day = date.fromordinal(first + d + s).isoformat()
+        trips.append(
+            RoundTrip(
+                dests[r], out_day, ret_day,
+                outbound_by_date[out_day][dests[r]]["best_price"],
+                return_by_date[ret_day][dests[r]]["best_price"],
+                total,
+            )
+        )
+    return trips
+
+
+# fetch_return's answer for a leg it could not load (rate limited / captcha):
+# unlike None ("no GoWild fare") it says nothing about the leg's price.
+DEFERRED = object()
+
+
+def lazy_return_search(outbound_by_date, return_dates, fetch_return, k,
+                       floor=0.0, min_stay=0, max_stay=None, retry=None):
+    """Fetch only the return legs that can still reach the top k round trips.
+
+    Every (destination, return date) is a candidate whose lower bound is the
+    destination's cheapest outbound fare on a date the stay bounds allow,
+    plus `floor` (the lowest return fare possible). Candidates are fetched
+    cheapest bound first via fetch_return(dest, return_date), which returns
+    the return_by_date entry ({"best_price": ..., ...}), None when the leg has
+    no fare, or DEFERRED when it could not be loaded. A running max-heap holds
+    the k cheapest totals found so far; once the next bound is above the k-th
+    of them, no remaining candidate can make the top k and the search stops.
+
+    With a retry_queue.RetryQueue, DEFERRED legs are retried in its rounds
+    (after its waits), cheapest bound first and under the same stopping rule.
+    Legs that can no longer make the top k are dropped before a round waits,
+    so they are neither fetched again nor waited or counted for.
+
+    Returns (return_by_date, fetched, candidates, unresolved): the results
+    the full search would need for the top k, ready for top_roundtrips; how
+    many of the candidate return legs fetch_return was asked for; and the
+    (dest, return_date) legs still DEFERRED at the end (out of retries)
+    whose bound could reach the top k. If unresolved is not empty, the top k
+    may be missing round trips.
+    """
+    ords = {d: date.fromisoformat(d).toordinal() for d in outbound_by_date}
+    by_dest = {}
+    for out_day, results in outbound_by_date.items():
+        for code, info in results.items():
+            by_dest.setdefault(code, []).append((ords[out_day], info["best_price"]))
+
+    queue = []
+    for ret_day in return_dates:
+        ret_ord = date.fromisoformat(ret_day).toordinal()
+        for code, outs in by_dest.items():
+            valid = [
+                p for o, p in outs
+                if ret_ord - o >= min_stay and (max_stay is None or ret_ord - o <= max_stay)
+            ]
+            if valid:
+                queue.append((min(valid) + floor, code, ret_day, ret_ord, valid))
+    candidates = len(by_dest) * len(return_dates)
+    queue.sort(key=lambda c: c[:3])
+
+    best = []  # max-heap (negated) of the k cheapest totals so far
+    return_by_date = {d: {} for d in return_dates}
+    asked = set()
+    deferred = {}
+    legs = {(code, ret_day): (bound, valid) for bound, code, ret_day, _, valid in queue}
+
+    def can_make_top_k(leg, entry):
+        return not (k and len(best) >= k and entry[0] > -best[0])
+
+    for batch in ([legs] if retry is None else retry.rounds(legs, keep=can_make_top_k)):
+        order = sorted(batch, key=lambda leg: (batch[leg][0],) + leg)
+        for i, leg in enumerate(order):
+            bound, valid = batch[leg]
+            if not can_make_top_k(leg, batch[leg]):
+                if retry is not None:
+                    for rest in order[i:]:
+                        retry.skip(rest)  # can't make the top k: not needed
+                break
+            asked.add(leg)
+            info = fetch_return(*leg)
+            if info is DEFERRED:
+                if retry is None:
+                    deferred[leg] = batch[leg]
+                else:
+                    retry.defer(leg, batch[leg])
+                continue
+            if not info:
+                continue
+            return_by_date[leg[1]][leg[0]] = info
+            for price in valid:
+                total = price + info["best_price"]
+                if not k or len(best) < k:
+                    heapq.heappush(best, -total)
+                elif total < -best[0]:
+                    heapq.heapreplace(best, -total)
+    if retry is not None:
+        deferred = retry.abandoned
+    full = k and len(best) >= k
+    unresolved = [leg for leg, (bound, _) in deferred.items()
+                  if not full or bound <= -best[0]]
+    return return_by_date, len(asked), candidates, unresolved
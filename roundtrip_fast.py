@@ -5,18 +5,47 @@ Searches popular destinations only for quick results
 """
 
 import csv
-import html, json, random, sys, time
+import html, json, os, random, sys
 from collections import defaultdict
-from datetime import datetime
+from itertools import chain
+from datetime import datetime, timedelta
 
 import requests
 from bs4 import BeautifulSoup
 
 # Import centralized configuration
-from config import GOWILD_BLACKOUT_DATES
+from config import DELAY_SCALE, is_blackout_date, polite_sleep
 
 # Import from gowild_fast
 from gowild_fast import create_session, get_flight_data
+from fare_store import FARE_STORE
+from query_planner import expand, plan_query
+from records import best_fare, gowild_records
+from result_sink import ResultSink
+from retry_queue import COVERAGE, RetryQueue
+from roundtrip_engine import DEFERRED, lazy_return_search, top_roundtrips
+from roundtrip_match import match_roundtrips
+from route_cache import ROUTE_CACHE
+from route_index import ROUTE_INDEX
+from sessions import SESSIONS
+
+# ROUNDTRIP_TOP_K=15 fetches only the return legs that can still make the 15
+# cheapest round trips; 0 (default) searches every return leg.
+TOP_K = int(os.environ.get("ROUNDTRIP_TOP_K", "0"))
+# Lowest return fare assumed possible when deciding a leg can't make the top
+# k. 0 is always safe; a higher floor (e.g. the fare's taxes) prunes more.
+RETURN_FARE_FLOOR = float(os.environ.get("ROUNDTRIP_RETURN_FLOOR", "0"))
+# Time on the ground between landing and the return flight, for the
+# flight-level matches (e.g. ROUNDTRIP_MIN_GROUND_HOURS=36). Unset = no bound.
+MIN_GROUND_HOURS = os.environ.get("ROUNDTRIP_MIN_GROUND_HOURS")
+MAX_GROUND_HOURS = os.environ.get("ROUNDTRIP_MAX_GROUND_HOURS")
+
+# Columns of the per-leg stream (roundtrip_legs_*.ndjson / .csv), written as
+# each outbound or return route finishes.
+LEG_FIELDS = [
+    "Direction", "Origin", "Destination", "Flight_Date", "Price",
+    "Departs", "Duration", "Stops", "Seats_Remaining",
+]
 
 # Popular/likely destinations from SFO
 POPULAR_DESTINATIONS = {
@@ -53,12 +82,29 @@ POPULAR_DESTINATIONS = {
 }
 
 
-def is_blackout_date(date_str):
-    """Check if a date is a GoWild blackout date"""
-    return date_str in GOWILD_BLACKOUT_DATES
-
-
-def search_outbound(origin, date_str, destinations, session):
+def stream_leg(sink, direction, origin, dest, date_str, entry):
+    """Append one searched leg's GoWild flights to `sink` (if any)."""
+    if sink is None:
+        return
+    rows = [
+        {
+            "Direction": direction,
+            "Origin": origin,
+            "Destination": dest,
+            "Flight_Date": date_str,
+            "Price": f.fare if f.fare is not None else "N/A",
+            "Departs": f.departs,
+            "Duration": f.duration,
+            "Stops": f.stops,
+            "Seats_Remaining": f.seats if f.seats is not None else "N/A",
+        }
+        for f in (entry or {}).get("flights", ())
+    ]
+    sink.write_route(rows, direction=direction, origin=origin, dest=dest, date=date_str)
+
+
+def search_outbound(origin, date_str, destinations, session, base_url=None,
+                    sink=None):
     """Search specified destinations from origin on a specific date"""
     print(f"\n{'='*70}")
     print(f"🛫 OUTBOUND: {origin} on {date_str}")
@@ -69,65 +115,120 @@ def search_outbound(origin, date_str, destinations, session):
         return {}
 
     results = {}
+    retry = RetryQueue(label=f"{origin} {date_str}")
+    destinations = ROUTE_INDEX.plan(origin, destinations, base_url=base_url)
     total_dests = len(destinations)
     base_delay = 15
 
     print(f"\n🔍 Scanning {total_dests} popular destinations...\n")
 
-    for idx, (dest_code, dest_name) in enumerate(destinations.items(), 1):
-        delay = random.uniform(base_delay, base_delay + 10)
-
-        print(
-            f"[{idx}/{total_dests}] {origin}→{dest_code} ({dest_name[:20]})",
-            end=" ",
-            flush=True,
-        )
-        time.sleep(delay)
+    for batch in retry.rounds(destinations):
+        for idx, (dest_code, dest_name) in enumerate(batch.items(), 1):
+            delay = random.uniform(base_delay, base_delay + 10)
 
-        formatted_date = (
-            datetime.strptime(date_str, "%Y-%m-%d")
-            .strftime("%b-%d,-%Y")
-            .replace("-", "%20")
-        )
-        data, hit_limit = get_flight_data(origin, dest_code, formatted_date, session)
+            print(
+                f"[{idx}/{len(batch)}] {origin}→{dest_code} ({dest_name[:20]})",
+                end=" ",
+                flush=True,
+            )
+            formatted_date = (
+                datetime.strptime(date_str, "%Y-%m-%d")
+                .strftime("%b-%d,-%Y")
+                .replace("-", "%20")
+            )
+            if not ROUTE_CACHE.contains(origin, dest_code, formatted_date, base_url):
+                polite_sleep(delay)
+            data, hit_limit = get_flight_data(
+                origin, dest_code, formatted_date, session, base_url=base_url
+            )
 
-        if hit_limit:
-            print("❌ Rate limit")
-            base_delay = min(base_delay + 10, 60)
-            continue
-
-        if data and "journeys" in data:
-            try:
-                flights = data["journeys"][0].get("flights")
-                if flights:
-                    gowild = [f for f in flights if f.get("isGoWildFareEnabled")]
-                    if gowild:
-                        results[dest_code] = {
-                            "name": dest_name,
-                            "flights": gowild,
-                            "best_price": min(f.get("goWildFare", 999) for f in gowild),
-                            "count": len(gowild),
-                        }
-                        print(
-                            f"✅ {len(gowild)} (${results[dest_code]['best_price']:.2f})"
-                        )
+            if hit_limit:
+                print("❌ Rate limit, will retry")
+                retry.defer(dest_code, dest_name)
+                base_delay = min(base_delay + 10, 60)
+                continue
+
+            if data and "journeys" in data:
+                try:
+                    flights = data["journeys"][0].get("flights")
+                    if flights:
+                        gowild = gowild_records(flights)
+                        if gowild:
+                            results[dest_code] = {
+                                "name": dest_name,
+                                "flights": gowild,
+                                "best_price": best_fare(gowild),
+                                "count": len(gowild),
+                            }
+                            print(
+                                f"✅ {len(gowild)} (${results[dest_code]['best_price']:.2f})"
+                            )
+                            stream_leg(sink, "outbound", origin, dest_code, date_str,
+                                       results[dest_code])
+                        else:
+                            print("○")
                     else:
                         print("○")
-                else:
+                except (KeyError, IndexError, TypeError):
                     print("○")
-            except (KeyError, IndexError, TypeError):
+            else:
                 print("○")
-        else:
-            print("○")
+                if data is None:
+                    retry.defer(dest_code, dest_name)
 
-        if not hit_limit and base_delay > 15:
-            base_delay = max(base_delay - 2, 15)
+            if not hit_limit and base_delay > 15:
+                base_delay = max(base_delay - 2, 15)
 
+    print(f"\n{retry.summary()}")
     print(f"\n✅ Found GoWild flights to {len(results)} destinations")
     return results
 
 
-def search_return(destinations_list, dest_names, return_date_str, session):
+def fetch_return_leg(dest_code, dest_name, return_date_str, session, delay,
+                     base_url=None, prefix="", sink=None):
+    """Fetch one destination -> SFO return leg.
+
+    Returns (entry, hit_limit): entry is the return_by_date value
+    ({"flights", "best_price", "count"}) or None when there is no GoWild fare.
+    """
+    print(f"{prefix}{dest_code}→SFO ({dest_name[:20]})", end=" ", flush=True)
+    formatted_date = (
+        datetime.strptime(return_date_str, "%Y-%m-%d")
+        .strftime("%b-%d,-%Y")
+        .replace("-", "%20")
+    )
+    if not ROUTE_CACHE.contains(dest_code, "SFO", formatted_date, base_url):
+        polite_sleep(delay)
+    data, hit_limit = get_flight_data(
+        dest_code, "SFO", formatted_date, session, base_url=base_url
+    )
+
+    if hit_limit:
+        print("❌ Rate limit")
+        return None, True
+
+    entry = None
+    if data and "journeys" in data:
+        try:
+            flights = data["journeys"][0].get("flights")
+            gowild = gowild_records(flights)
+            if gowild:
+                entry = {
+                    "flights": gowild,
+                    "best_price": best_fare(gowild),
+                    "count": len(gowild),
+                }
+        except (KeyError, IndexError, TypeError):
+            pass
+    print(f"✅ {entry['count']} (${entry['best_price']:.2f})" if entry else "○")
+    if entry:
+        stream_leg(sink, "return", dest_code, "SFO", return_date_str, entry)
+    return entry, False
+
+
+def search_return(
+    destinations_list, dest_names, return_date_str, session, base_url=None, sink=None
+):
     """Search return flights from destinations to SFO"""
     print(f"\n{'='*70}")
     print(f"🛬 RETURN: To SFO on {return_date_str}")
@@ -138,101 +239,129 @@ def search_return(destinations_list, dest_names, return_date_str, session):
         return {}
 
     results = {}
-    total_dests = len(destinations_list)
+    retry = RetryQueue(label=f"return {return_date_str}")
+    planned = ROUTE_INDEX.plan("SFO", dict.fromkeys(destinations_list), inbound=True,
+                              base_url=base_url)
+    total_dests = len(planned)
     base_delay = 15
 
     print(f"\n🔍 Checking {total_dests} return routes...\n")
 
-    for idx, dest_code in enumerate(destinations_list, 1):
-        delay = random.uniform(base_delay, base_delay + 10)
+    for batch in retry.rounds(planned):
+        for idx, dest_code in enumerate(batch, 1):
+            delay = random.uniform(base_delay, base_delay + 10)
+            entry, hit_limit = fetch_return_leg(
+                dest_code, dest_names.get(dest_code, "Unknown"), return_date_str,
+                session, delay, base_url=base_url, prefix=f"[{idx}/{len(batch)}] ",
+                sink=sink,
+            )
 
-        dest_name = dest_names.get(dest_code, "Unknown")
-        print(
-            f"[{idx}/{total_dests}] {dest_code}→SFO ({dest_name[:20]})",
-            end=" ",
-            flush=True,
-        )
-        time.sleep(delay)
+            if hit_limit:
+                retry.defer(dest_code)
+                base_delay = min(base_delay + 10, 60)
+                continue
+            if entry:
+                results[dest_code] = entry
+            if base_delay > 15:
+                base_delay = max(base_delay - 2, 15)
 
-        formatted_date = (
-            datetime.strptime(return_date_str, "%Y-%m-%d")
-            .strftime("%b-%d,-%Y")
-            .replace("-", "%20")
-        )
-        data, hit_limit = get_flight_data(dest_code, "SFO", formatted_date, session)
+    print(f"\n{retry.summary()}")
+    print(f"\n✅ Found return flights from {len(results)} destinations")
+    return results
+
+
+def search_return_top_k(outbound_results, return_dates, dest_names, session,
+                        top_k, floor=RETURN_FARE_FLOOR, base_url=None, sink=None):
+    """Return-leg search for a top-k query, skipping legs that can't matter.
 
+    Instead of every destination on every return date, return legs are
+    fetched cheapest outbound fare first and the search stops once the
+    cheapest remaining outbound + `floor` can't beat the k-th best round
+    trip found so far (roundtrip_engine.lazy_return_search). Rate-limited
+    legs go round again in a RetryQueue like every other scan. The round
+    trips compile_roundtrips(..., top_k=top_k) then picks are the same as
+    after a full search unless a leg stays blocked past its last retry,
+    which is reported. Returns the return_by_date dict.
+    """
+    print(f"\n{'='*70}")
+    print(f"🛬 RETURN (top {top_k}): To SFO on {', '.join(return_dates)}")
+    print(f"{'='*70}")
+
+    for d in return_dates:
+        if is_blackout_date(d):
+            print(f"🚫 BLACKOUT DATE - Skipping {d}")
+    open_dates = [d for d in return_dates if not is_blackout_date(d)]
+    base_delay = 15
+    page_loads = 0
+
+    def fetch(dest_code, return_date_str):
+        nonlocal base_delay, page_loads
+        if ROUTE_INDEX.skip(dest_code, "SFO", base_url):
+            return None
+        misses = ROUTE_CACHE.misses
+        delay = random.uniform(base_delay, base_delay + 10)
+        entry, hit_limit = fetch_return_leg(
+            dest_code, dest_names.get(dest_code, "Unknown"), return_date_str,
+            session, delay, base_url=base_url, prefix=f"[{return_date_str}] ",
+            sink=sink,
+        )
+        page_loads += ROUTE_CACHE.misses - misses
         if hit_limit:
-            print("❌ Rate limit")
             base_delay = min(base_delay + 10, 60)
-            continue
-
-        if data and "journeys" in data:
-            try:
-                flights = data["journeys"][0].get("flights")
-                if flights:
-                    gowild = [f for f in flights if f.get("isGoWildFareEnabled")]
-                    if gowild:
-                        results[dest_code] = {
-                            "flights": gowild,
-                            "best_price": min(f.get("goWildFare", 999) for f in gowild),
-                            "count": len(gowild),
-                        }
-                        print(
-                            f"✅ {len(gowild)} (${results[dest_code]['best_price']:.2f})"
-                        )
-                    else:
-                        print("○")
-                else:
-                    print("○")
-            except (KeyError, IndexError, TypeError):
-                print("○")
-        else:
-            print("○")
-
-        if not hit_limit and base_delay > 15:
+            return DEFERRED  # unknown price: retried in the next round
+        if base_delay > 15:
             base_delay = max(base_delay - 2, 15)
+        return entry
 
-    print(f"\n✅ Found return flights from {len(results)} destinations")
+    print(f"\n🔍 Fetching return legs cheapest outbound first "
+          f"(return fare floor ${floor:.2f})...\n")
+    retry = RetryQueue(label="return top-k")
+    results, checked, candidates, unresolved = lazy_return_search(
+        outbound_results, open_dates, fetch, top_k, floor=floor, retry=retry
+    )
+    print(f"\n{retry.summary()}")
+    print(f"\n✅ Checked {checked} of {candidates} return routes with {page_loads} "
+          f"page loads ({max(candidates - page_loads, 0)} avoided)")
+    if unresolved:
+        legs = ", ".join(f"{code} {day}" for code, day in unresolved)
+        print(f"⚠️  Top {top_k} may be incomplete: {len(unresolved)} rate-limited "
+              f"return leg(s) could still make it ({legs})")
     return results
 
 
-def compile_roundtrips(outbound_by_date, return_by_date):
-    """Compile all possible round-trip combinations"""
-    roundtrips = []
+def compile_roundtrips(outbound_by_date, return_by_date, top_k=None, min_stay=0,
+                       max_stay=None):
+    """Compile round-trip combinations, cheapest first.
 
-    for out_date, out_dests in outbound_by_date.items():
-        for dest_code, out_info in out_dests.items():
-            dest_name = out_info["name"]
-
-            for ret_date, ret_dests in return_by_date.items():
-                if dest_code in ret_dests:
-                    ret_info = ret_dests[dest_code]
-
-                    # Calculate total price
-                    total_price = out_info["best_price"] + ret_info["best_price"]
-
-                    # Calculate trip days
-                    days = (
-                        datetime.strptime(ret_date, "%Y-%m-%d")
-                        - datetime.strptime(out_date, "%Y-%m-%d")
-                    ).days
-
-                    roundtrips.append(
-                        {
-                            "destination_code": dest_code,
-                            "destination_name": dest_name,
-                            "outbound_date": out_date,
-                            "return_date": ret_date,
-                            "trip_days": days,
-                            "outbound_price": out_info["best_price"],
-                            "return_price": ret_info["best_price"],
-                            "total_price": total_price,
-                            "outbound_options": out_info["count"],
-                            "return_options": ret_info["count"],
-                        }
-                    )
-
-    return sorted(roundtrips, key=lambda x: x["total_price"])
+    Pairs come from roundtrip_engine (vectorised over destination x date);
+    top_k limits the result to the k cheapest without building every pair,
+    min_stay/max_stay bound the trip length in days.
+    """
+    roundtrips = []
+    for trip in top_roundtrips(
+        outbound_by_date, return_by_date, top_k, min_stay, max_stay
+    ):
+        out_info = outbound_by_date[trip.outbound_date][trip.dest]
+        ret_info = return_by_date[trip.return_date][trip.dest]
+        days = (
+            datetime.strptime(trip.return_date, "%Y-%m-%d")
+            - datetime.strptime(trip.outbound_date, "%Y-%m-%d")
+        ).days
+        roundtrips.append(
+            {
+                "destination_code": trip.dest,
+                "destination_name": out_info["name"],
+                "outbound_date": trip.outbound_date,
+                "return_date": trip.return_date,
+                "trip_days": days,
+                "outbound_price": trip.outbound_price,
+                "return_price": trip.return_price,
+                "total_price": trip.total_price,
+                "outbound_options": out_info["count"],
+                "return_options": ret_info["count"],
+            }
+        )
+    return roundtrips
 
 
 def display_full_results(roundtrips):
@@ -295,6 +424,32 @@ def highlight_best_deals(roundtrips, top_n=15):
         print()
 
 
+def highlight_flight_matches(outbound_by_date, return_by_date, min_hours=None,
+                             max_hours=None, top_n=15):
+    """Show the cheapest flight-level round trips that respect ground time"""
+    min_ground = timedelta(hours=float(min_hours or 0))
+    max_ground = timedelta(hours=float(max_hours)) if max_hours else None
+    span = f"{float(min_hours or 0):g}h" + (f"-{float(max_hours):g}h" if max_hours else "+")
+    print(f"\n{'='*70}")
+    print(f"⏱️  TOP {top_n} FLIGHT-LEVEL ROUND TRIPS ({span} on the ground)")
+    print(f"{'='*70}\n")
+
+    matches = match_roundtrips(
+        outbound_by_date, return_by_date, min_ground, max_ground, top_k=top_n
+    )
+    if not matches:
+        print("No flight pairs fit the ground-time window 😔")
+        return matches
+
+    for idx, m in enumerate(matches, 1):
+        hours = m.ground.total_seconds() / 3600
+        print(f"{idx}. {m.dest} - ${m.total_price:.2f} total "
+              f"(${m.outbound.price:.2f} + ${m.inbound.price:.2f})")
+        print(f"   🛬 lands {m.outbound.arrives:%a %b %d %H:%M} → "
+              f"🛫 departs {m.inbound.departs:%a %b %d %H:%M} ({hours:.1f}h on the ground)")
+    return matches
+
+
 def export_results(roundtrips, filename):
     """Export results to CSV"""
     if not roundtrips:
@@ -355,8 +510,21 @@ if __name__ == "__main__":
     print(f"🎯 Searching {len(POPULAR_DESTINATIONS)} popular destinations")
     print()
 
+    # Request count and ETA before the first page load. Return legs are an
+    # upper bound: only destinations with an outbound flight get searched.
+    plan = plan_query(
+        chain(expand([(ORIGIN, code) for code in POPULAR_DESTINATIONS], OUTBOUND_DATES),
+              expand([(code, ORIGIN) for code in POPULAR_DESTINATIONS], RETURN_DATES)),
+        "roundtrip_fast", default_seconds=20 * DELAY_SCALE + 1,
+    )
+    print(plan.summary())
+
     # Create session
-    session = create_session()
+    session = SESSIONS.get(create_session)
+    # Every leg is streamed to disk as it is searched
+    leg_sink = ResultSink(
+        f"roundtrip_legs_sfo_{datetime.now().strftime('%Y%m%d_%H%M%S')}", LEG_FIELDS
+    )
 
     # Step 1: Search outbound flights
     print("\n" + "=" * 70)
@@ -366,7 +534,7 @@ if __name__ == "__main__":
     outbound_results = {}
     for date in OUTBOUND_DATES:
         outbound_results[date] = search_outbound(
-            ORIGIN, date, POPULAR_DESTINATIONS, session
+            ORIGIN, date, POPULAR_DESTINATIONS, session, sink=leg_sink
         )
 
     # Compile unique destinations with outbound flights
@@ -394,11 +562,21 @@ if __name__ == "__main__":
     print("PHASE 2: RETURN FLIGHTS")
     print("=" * 70)
 
-    return_results = {}
-    for date in RETURN_DATES:
-        return_results[date] = search_return(
-            list(all_destinations.keys()), all_destinations, date, session
+    if TOP_K:
+        return_results = search_return_top_k(
+            outbound_results, RETURN_DATES, all_destinations, session, TOP_K,
+            sink=leg_sink,
         )
+    else:
+        return_results = {}
+        for date in RETURN_DATES:
+            return_results[date] = search_return(
+                list(all_destinations.keys()), all_destinations, date, session,
+                sink=leg_sink,
+            )
+
+    leg_sink.close()
+    plan.finish()
 
     print(f"\n{'='*70}")
     print(f"📊 RETURN SUMMARY")
@@ -408,7 +586,7 @@ if __name__ == "__main__":
     print()
 
     # Step 3: Compile round-trips
-    roundtrips = compile_roundtrips(outbound_results, return_results)
+    roundtrips = compile_roundtrips(outbound_results, return_results, top_k=TOP_K or None)
 
     # Step 4: Display all results
     display_full_results(roundtrips)
@@ -416,6 +594,11 @@ if __name__ == "__main__":
     # Step 5: Highlight best deals
     highlight_best_deals(roundtrips, top_n=15)
 
+    if MIN_GROUND_HOURS or MAX_GROUND_HOURS:
+        highlight_flight_matches(
+            outbound_results, return_results, MIN_GROUND_HOURS, MAX_GROUND_HOURS
+        )
+
     # Step 6: Export to CSV
     filename = f"roundtrip_sfo_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     export_results(roundtrips, filename)
@@ -430,4 +613,10 @@ if __name__ == "__main__":
             f"💰 Best deal: ${roundtrips[0]['total_price']:.2f} to {roundtrips[0]['destination_code']}"
         )
     print(f"📁 Results saved to: {filename}")
+    print(f"📁 {leg_sink.summary()}")
+    print(f"🗄️  {ROUTE_CACHE.summary()}")
+    print(f"🔁 {COVERAGE.summary()}")
+    print(f"🗺️  {ROUTE_INDEX.summary()}")
+    print(f"🗄️  {FARE_STORE.summary()}")
+    print(f"🔌 {SESSIONS.summary()}")
     print("=" * 70)
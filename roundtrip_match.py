@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Flight-level round-trip matching.
+
+compile_roundtrips pairs destinations on the best fare per date, so it can't
+tell a 7 am return after an 11 pm arrival from a comfortable weekend. This
+module pairs individual flights instead, using the journeys payload's legs:
+the outbound's last-leg arrivalDate and the return's first-leg
+departureDate. Both are local times at the destination, so their difference
+is the time on the ground.
+
+Per destination, outbound flights are sorted by arrival and return flights by
+departure. A single sweep over the returns keeps the outbounds whose arrival
+falls in [departure - max_ground, departure - min_ground] in a monotonic
+deque (cheapest at the front), so each return flight is paired with the
+cheapest outbound that fits in O(1) amortised. That is O(n log n) for the
+sorts and linear for the join, with no pairing of every outbound with every
+return:
+
+    from roundtrip_match import match_roundtrips
+    trips = match_roundtrips(outbound_by_date, return_by_date,
+                             min_ground=timedelta(hours=36), top_k=15)
+
+Inputs are the {"YYYY-MM-DD": {dest: {"flights": [...]}}} dicts that
+roundtrip_fast.search_outbound / search_return return (flights as
+records.FlightRecord or raw journeys dicts). See
+benchmarks/bench_roundtrip_match.py.
+"""
+
+import heapq
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+
+from records import FlightRecord
+
+Leg = namedtuple("Leg", "departs arrives price flight")
+FlightMatch = namedtuple("FlightMatch", "dest outbound inbound total_price ground")
+
+
+def flight_leg(flight):
+    """A Leg for a GoWild FlightRecord or flight dict, or None when it lacks
+    times or a fare."""
+    if isinstance(flight, FlightRecord):
+        try:
+            departs = datetime.fromisoformat(flight.departs_at)
+            arrives = datetime.fromisoformat(flight.arrives_at)
+        except (TypeError, ValueError):
+            return None
+        if flight.fare is None:
+            return None
+        return Leg(departs, arrives, flight.fare, flight)
+    legs = flight.get("legs") or []
+    price = flight.get("goWildFare")
+    if not legs or price is None or not flight.get("isGoWildFareEnabled", True):
+        return None
+    try:
+        departs = datetime.fromisoformat(legs[0]["departureDate"])
+        arrives = datetime.fromisoformat(legs[-1]["arrivalDate"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return Leg(departs, arrives, float(price), flight)
+
+
+def legs_by_dest(by_date):
+    """{dest: [Leg, ...]} from per-date search results."""
+    legs = {}
+    for results in by_date.values():
+        for code, info in results.items():
+            for flight in info.get("flights") or []:
+                leg = flight_leg(flight)
+                if leg is not None:
+                    legs.setdefault(code, []).append(leg)
+    return legs
+
+
+def match_legs(outbound, inbound, min_ground=timedelta(0), max_ground=None):
+    """Pair each inbound Leg with the cheapest outbound Leg it fits.
+
+    An outbound fits when min_ground <= inbound.departs - outbound.arrives
+    <= max_ground (max_ground=None: no upper bound). Yields (outbound,
+    inbound) pairs, at most one per inbound leg.
+    """
+    outs = sorted(outbound, key=lambda leg: leg.arrives)
+    window = deque()  # indices into outs, arrival order, strictly rising price
+    nxt = 0
+    for back in sorted(inbound, key=lambda leg: leg.departs):
+        latest = back.departs - min_ground
+        while nxt < len(outs) and outs[nxt].arrives <= latest:
+            price = outs[nxt].price
+            while window and outs[window[-1]].price >= price:
+                window.pop()
+            window.append(nxt)
+            nxt += 1
+        if max_ground is not None:
+            earliest = back.departs - max_ground
+            while window and outs[window[0]].arrives < earliest:
+                window.popleft()
+        if window:
+            yield outs[window[0]], back
+
+
+def match_roundtrips(outbound_by_date, return_by_date, min_ground=timedelta(0),
+                     max_ground=None, top_k=None):
+    """Cheapest flight-level round trips, as FlightMatch tuples.
+
+    One match per return flight (with the cheapest outbound that leaves the
+    requested time on the ground), sorted by total price; top_k keeps the k
+    cheapest. ground is the time between landing and the return departure.
+    """
+    outbound = legs_by_dest(outbound_by_date)
+    inbound = legs_by_dest(return_by_date)
+
+    def matches():
+        for code, outs in outbound.items():
+            for out, back in match_legs(outs, inbound.get(code, ()), min_ground, max_ground):
+                yield FlightMatch(code, out, back, out.price + back.price,
+                                  back.departs - out.arrives)
+
+    key = lambda m: (m.total_price, m.dest, m.inbound.departs)
+    if top_k is None:
+        return sorted(matches(), key=key)
+    return heapq.nsmallest(top_k, matches(), key=key)
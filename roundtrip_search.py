@@ -2,29 +2,35 @@
 """
 Round-trip GoWild flight finder
 Searches outbound flights, then finds return flights for all destinations
+Run with --resume to continue an interrupted search (see checkpoint.py)
 """
 
 import csv
-import html, json, random, sys, time
+import html, json, random, sys
 from collections import defaultdict
+from itertools import chain
 from datetime import datetime
 
 import requests
 from bs4 import BeautifulSoup
 
 # Import centralized configuration
-from config import GOWILD_BLACKOUT_DATES
+from checkpoint import Checkpoint, route_status
+from config import DELAY_SCALE, is_blackout_date, polite_sleep
 
 # Import destinations from gowild_fast
 from gowild_fast import create_session, destinations, get_flight_data
+from fare_store import FARE_STORE
+from query_planner import expand, plan_query
+from records import best_fare, gowild_records
+from retry_queue import COVERAGE, RetryQueue
+from roundtrip_engine import top_roundtrips
+from route_cache import ROUTE_CACHE
+from route_index import ROUTE_INDEX
+from sessions import SESSIONS
 
 
-def is_blackout_date(date_str):
-    """Check if a date is a GoWild blackout date"""
-    return date_str in GOWILD_BLACKOUT_DATES
-
-
-def search_outbound(origin, date_str, session):
+def search_outbound(origin, date_str, session, base_url=None, checkpoint=None):
     """Search all destinations from origin on a specific date"""
     print(f"\n{'='*60}")
     print(f"🛫 OUTBOUND: Searching from {origin} on {date_str}")
@@ -35,61 +41,82 @@ def search_outbound(origin, date_str, session):
         return {}
 
     results = {}
-    total_dests = len(destinations)
+    retry = RetryQueue(label=f"{origin} {date_str}")
+    planned = ROUTE_INDEX.plan(origin, destinations, base_url=base_url)
+    total_dests = len(planned)
     base_delay = 15
 
     print(f"\n🔍 Scanning {total_dests} destinations...\n")
 
-    for idx, (dest_code, dest_name) in enumerate(destinations.items(), 1):
-        delay = random.uniform(base_delay, base_delay + 10)
-
-        print(f"[{idx}/{total_dests}] {origin}→{dest_code}", end=" ", flush=True)
-        time.sleep(delay)
+    for batch in retry.rounds(planned):
+        for idx, (dest_code, dest_name) in enumerate(batch.items(), 1):
+            delay = random.uniform(base_delay, base_delay + 10)
+
+            print(f"[{idx}/{len(batch)}] {origin}→{dest_code}", end=" ", flush=True)
+            if checkpoint is not None and checkpoint.done(origin, dest_code, date_str):
+                entry = checkpoint.entry(origin, dest_code, date_str)
+                if entry:
+                    results[dest_code] = entry
+                print("⏩ (done)")
+                continue
+            formatted_date = (
+                datetime.strptime(date_str, "%Y-%m-%d")
+                .strftime("%b-%d,-%Y")
+                .replace("-", "%20")
+            )
+            if not ROUTE_CACHE.contains(origin, dest_code, formatted_date, base_url):
+                polite_sleep(delay)
+            data, hit_limit = get_flight_data(
+                origin, dest_code, formatted_date, session, base_url=base_url
+            )
 
-        formatted_date = (
-            datetime.strptime(date_str, "%Y-%m-%d")
-            .strftime("%b-%d,-%Y")
-            .replace("-", "%20")
-        )
-        data, hit_limit = get_flight_data(origin, dest_code, formatted_date, session)
-
-        if hit_limit:
-            print("❌ Rate limit")
-            base_delay = min(base_delay + 10, 60)
-            continue
-
-        if data and "journeys" in data:
-            try:
-                flights = data["journeys"][0].get("flights")
-                if flights:
-                    gowild = [f for f in flights if f.get("isGoWildFareEnabled")]
-                    if gowild:
-                        results[dest_code] = {
-                            "name": dest_name,
-                            "flights": gowild,
-                            "best_price": min(f.get("goWildFare", 999) for f in gowild),
-                            "count": len(gowild),
-                        }
-                        print(
-                            f"✅ {len(gowild)} flights (${results[dest_code]['best_price']:.2f})"
-                        )
+            if hit_limit:
+                print("❌ Rate limit, will retry")
+                retry.defer(dest_code, dest_name)
+                if checkpoint is not None:
+                    checkpoint.record(origin, dest_code, date_str, "rate_limited")
+                base_delay = min(base_delay + 10, 60)
+                continue
+
+            if data and "journeys" in data:
+                try:
+                    flights = data["journeys"][0].get("flights")
+                    if flights:
+                        gowild = gowild_records(flights)
+                        if gowild:
+                            results[dest_code] = {
+                                "name": dest_name,
+                                "flights": gowild,
+                                "best_price": best_fare(gowild),
+                                "count": len(gowild),
+                            }
+                            print(
+                                f"✅ {len(gowild)} flights (${results[dest_code]['best_price']:.2f})"
+                            )
+                        else:
+                            print("○")
                     else:
                         print("○")
-                else:
+                except (KeyError, IndexError, TypeError):
                     print("○")
-            except (KeyError, IndexError, TypeError):
+            else:
                 print("○")
-        else:
-            print("○")
+                if data is None:
+                    retry.defer(dest_code, dest_name)
+            if checkpoint is not None:
+                entry = results.get(dest_code)
+                checkpoint.record(origin, dest_code, date_str, route_status(data, entry), entry)
 
-        if not hit_limit and base_delay > 15:
-            base_delay = max(base_delay - 2, 15)
+            if not hit_limit and base_delay > 15:
+                base_delay = max(base_delay - 2, 15)
 
+    print(f"\n{retry.summary()}")
     print(f"\n✅ Found GoWild flights to {len(results)} destinations")
     return results
 
 
-def search_return(destinations_list, return_date_str, session):
+def search_return(destinations_list, return_date_str, session, base_url=None,
+                  checkpoint=None):
     """Search return flights from destinations to SFO"""
     print(f"\n{'='*60}")
     print(f"🛬 RETURN: Searching to SFO on {return_date_str}")
@@ -100,89 +127,105 @@ def search_return(destinations_list, return_date_str, session):
         return {}
 
     results = {}
-    total_dests = len(destinations_list)
+    retry = RetryQueue(label=f"return {return_date_str}")
+    planned = ROUTE_INDEX.plan("SFO", dict.fromkeys(destinations_list), inbound=True,
+                              base_url=base_url)
+    total_dests = len(planned)
     base_delay = 15
 
     print(f"\n🔍 Checking {total_dests} return routes...\n")
 
-    for idx, dest_code in enumerate(destinations_list, 1):
-        delay = random.uniform(base_delay, base_delay + 10)
-
-        print(f"[{idx}/{total_dests}] {dest_code}→SFO", end=" ", flush=True)
-        time.sleep(delay)
+    for batch in retry.rounds(planned):
+        for idx, dest_code in enumerate(batch, 1):
+            delay = random.uniform(base_delay, base_delay + 10)
+
+            print(f"[{idx}/{len(batch)}] {dest_code}→SFO", end=" ", flush=True)
+            if checkpoint is not None and checkpoint.done(dest_code, "SFO", return_date_str):
+                entry = checkpoint.entry(dest_code, "SFO", return_date_str)
+                if entry:
+                    results[dest_code] = entry
+                print("⏩ (done)")
+                continue
+            formatted_date = (
+                datetime.strptime(return_date_str, "%Y-%m-%d")
+                .strftime("%b-%d,-%Y")
+                .replace("-", "%20")
+            )
+            if not ROUTE_CACHE.contains(dest_code, "SFO", formatted_date, base_url):
+                polite_sleep(delay)
+            data, hit_limit = get_flight_data(
+                dest_code, "SFO", formatted_date, session, base_url=base_url
+            )
 
-        formatted_date = (
-            datetime.strptime(return_date_str, "%Y-%m-%d")
-            .strftime("%b-%d,-%Y")
-            .replace("-", "%20")
-        )
-        data, hit_limit = get_flight_data(dest_code, "SFO", formatted_date, session)
-
-        if hit_limit:
-            print("❌ Rate limit")
-            base_delay = min(base_delay + 10, 60)
-            continue
-
-        if data and "journeys" in data:
-            try:
-                flights = data["journeys"][0].get("flights")
-                if flights:
-                    gowild = [f for f in flights if f.get("isGoWildFareEnabled")]
-                    if gowild:
-                        results[dest_code] = {
-                            "flights": gowild,
-                            "best_price": min(f.get("goWildFare", 999) for f in gowild),
-                            "count": len(gowild),
-                        }
-                        print(
-                            f"✅ {len(gowild)} flights (${results[dest_code]['best_price']:.2f})"
-                        )
+            if hit_limit:
+                print("❌ Rate limit, will retry")
+                retry.defer(dest_code)
+                if checkpoint is not None:
+                    checkpoint.record(dest_code, "SFO", return_date_str, "rate_limited")
+                base_delay = min(base_delay + 10, 60)
+                continue
+
+            if data and "journeys" in data:
+                try:
+                    flights = data["journeys"][0].get("flights")
+                    if flights:
+                        gowild = gowild_records(flights)
+                        if gowild:
+                            results[dest_code] = {
+                                "flights": gowild,
+                                "best_price": best_fare(gowild),
+                                "count": len(gowild),
+                            }
+                            print(
+                                f"✅ {len(gowild)} flights (${results[dest_code]['best_price']:.2f})"
+                            )
+                        else:
+                            print("○")
                     else:
                         print("○")
-                else:
+                except (KeyError, IndexError, TypeError):
                     print("○")
-            except (KeyError, IndexError, TypeError):
+            else:
                 print("○")
-        else:
-            print("○")
-
-        if not hit_limit and base_delay > 15:
-            base_delay = max(base_delay - 2, 15)
-
+                if data is None:
+                    retry.defer(dest_code)
+            if checkpoint is not None:
+                entry = results.get(dest_code)
+                checkpoint.record(
+                    dest_code, "SFO", return_date_str, route_status(data, entry), entry
+                )
+
+            if not hit_limit and base_delay > 15:
+                base_delay = max(base_delay - 2, 15)
+
+    print(f"\n{retry.summary()}")
     print(f"\n✅ Found return flights from {len(results)} destinations")
     return results
 
 
-def compile_roundtrips(outbound_by_date, return_by_date):
-    """Compile all possible round-trip combinations"""
+def compile_roundtrips(outbound_by_date, return_by_date, top_k=None, min_stay=0,
+                       max_stay=None):
+    """Compile round-trip combinations, cheapest first (see roundtrip_engine)"""
     roundtrips = []
-
-    for out_date, out_dests in outbound_by_date.items():
-        for dest_code, out_info in out_dests.items():
-            dest_name = out_info["name"]
-
-            for ret_date, ret_dests in return_by_date.items():
-                if dest_code in ret_dests:
-                    ret_info = ret_dests[dest_code]
-
-                    # Calculate total price
-                    total_price = out_info["best_price"] + ret_info["best_price"]
-
-                    roundtrips.append(
-                        {
-                            "destination_code": dest_code,
-                            "destination_name": dest_name,
-                            "outbound_date": out_date,
-                            "return_date": ret_date,
-                            "outbound_price": out_info["best_price"],
-                            "return_price": ret_info["best_price"],
-                            "total_price": total_price,
-                            "outbound_options": out_info["count"],
-                            "return_options": ret_info["count"],
-                        }
-                    )
-
-    return sorted(roundtrips, key=lambda x: x["total_price"])
+    for trip in top_roundtrips(
+        outbound_by_date, return_by_date, top_k, min_stay, max_stay
+    ):
+        out_info = outbound_by_date[trip.outbound_date][trip.dest]
+        ret_info = return_by_date[trip.return_date][trip.dest]
+        roundtrips.append(
+            {
+                "destination_code": trip.dest,
+                "destination_name": out_info["name"],
+                "outbound_date": trip.outbound_date,
+                "return_date": trip.return_date,
+                "outbound_price": trip.outbound_price,
+                "return_price": trip.return_price,
+                "total_price": trip.total_price,
+                "outbound_options": out_info["count"],
+                "return_options": ret_info["count"],
+            }
+        )
+    return roundtrips
 
 
 def display_results(roundtrips):
@@ -306,12 +349,34 @@ if __name__ == "__main__":
     print(f"   Return: {', '.join(RETURN_DATES)}")
 
     # Create session
-    session = create_session()
+    session = SESSIONS.get(create_session)
+
+    # Every finished leg is journaled; --resume skips the ones already done
+    checkpoint = Checkpoint(
+        "roundtrip_search",
+        {"origin": ORIGIN, "outbound": OUTBOUND_DATES, "return": RETURN_DATES,
+         "destinations": sorted(destinations)},
+        resume="--resume" in sys.argv,
+    )
+    if checkpoint.resumed:
+        print(f"\n⏩ Resuming: {checkpoint.resumed} routes already done")
+
+    # Request count and ETA before the first page load. Return legs are an
+    # upper bound: only destinations with an outbound flight get searched.
+    plan = plan_query(
+        chain(expand([(ORIGIN, code) for code in destinations], OUTBOUND_DATES),
+              expand([(code, ORIGIN) for code in destinations], RETURN_DATES)),
+        "roundtrip_search", default_seconds=20 * DELAY_SCALE + 1,
+        done=checkpoint.done,
+    )
+    print(plan.summary())
 
     # Step 1: Search outbound flights
     outbound_results = {}
     for date in OUTBOUND_DATES:
-        outbound_results[date] = search_outbound(ORIGIN, date, session)
+        outbound_results[date] = search_outbound(
+            ORIGIN, date, session, checkpoint=checkpoint
+        )
 
     # Compile unique destinations with outbound flights
     all_destinations = set()
@@ -334,7 +399,11 @@ if __name__ == "__main__":
     # Step 2: Search return flights
     return_results = {}
     for date in RETURN_DATES:
-        return_results[date] = search_return(list(all_destinations), date, session)
+        return_results[date] = search_return(
+            list(all_destinations), date, session, checkpoint=checkpoint
+        )
+    checkpoint.close()
+    plan.finish()
 
     print(f"\n{'='*60}")
     print(f"📊 RETURN SUMMARY")
@@ -358,4 +427,10 @@ if __name__ == "__main__":
 
     print(f"\n{'='*60}")
     print(f"✅ Search complete! Found {len(roundtrips)} round-trip options")
+    print(ROUTE_CACHE.summary())
+    print(FARE_STORE.summary())
+    print(ROUTE_INDEX.summary())
+    print(checkpoint.summary())
+    print(COVERAGE.summary())
+    print(SESSIONS.summary())
     print(f"{'='*60}")
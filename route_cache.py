@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of parsed journeys data per (origin, dest, date).
+
+roundtrip_search.py / roundtrip_fast.py search the same dates again, and
+gowild_fast is often re-run after a crash, so the same route/date gets fetched
+minutes apart. Each successful lookup is stored as JSON under
+results/route_cache/, addressed by a SHA-256 of (booking host, origin, dest,
+ISO date), and served without a page load (or politeness delay) while it is
+younger than the TTL (file mtime). The directory is size-bounded: once it grows
+past max_bytes, stale entries and then the least recently used ones (file
+atime, bumped on every hit) are evicted.
+
+Blocked / captcha / failed fetches are never cached.
+
+Settings (env vars):
+    ROUTE_CACHE=0            disable the cache
+    ROUTE_CACHE_TTL=1800     seconds an entry stays fresh
+    ROUTE_CACHE_MAX_MB=64    size bound for the cache directory
+
+Clear it with:  python3 route_cache.py --clear
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from config import BOOKING_BASE_URL, iso_date
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "results", "route_cache")
+CACHE_ENABLED = os.environ.get("ROUTE_CACHE", "1") == "1"
+CACHE_TTL_SECONDS = int(os.environ.get("ROUTE_CACHE_TTL", "1800"))
+CACHE_MAX_BYTES = int(os.environ.get("ROUTE_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+
+class RouteCache:
+    """Content-addressed, TTL'd, size-bounded store of journeys data."""
+
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL_SECONDS,
+                 max_bytes=CACHE_MAX_BYTES, enabled=CACHE_ENABLED):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled and ttl > 0
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # bytes on disk, computed on first put
+        self._lock = threading.Lock()
+
+    # -- addressing --------------------------------------------------------
+    @staticmethod
+    def key(origin, dest, date, base_url=None):
+        host = (base_url or BOOKING_BASE_URL).rstrip("/")
+        ident = f"{host}|{origin.upper()}|{dest.upper()}|{iso_date(date)}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:] + ".json")
+
+    def _fresh_path(self, origin, dest, date, base_url):
+        if not self.enabled:
+            return None
+        path = self._path(self.key(origin, dest, date, base_url))
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return None
+        return path if age < self.ttl else None
+
+    # -- lookups -----------------------------------------------------------
+    def contains(self, origin, dest, date, base_url=None):
+        """True if a fresh entry exists. Does not count as a hit or miss."""
+        return self._fresh_path(origin, dest, date, base_url) is not None
+
+    def get(self, origin, dest, date, base_url=None):
+        """Cached journeys data, or None on a miss / stale entry.
+
+        Every None counts as a miss, with the cache disabled too, so misses
+        is the number of page loads the scanners went on to make.
+        """
+        if not self.enabled:
+            with self._lock:
+                self.misses += 1
+            return None
+        path = self._fresh_path(origin, dest, date, base_url)
+        data = None
+        if path is not None:
+            try:
+                with open(path) as f:
+                    data = json.load(f)["data"]
+                # Record the use in atime for LRU eviction; mtime stays the
+                # store time so the TTL is not extended by reads.
+                os.utime(path, (time.time(), os.path.getmtime(path)))
+            except (OSError, ValueError, KeyError):
+                data = None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, origin, dest, date, data, base_url=None):
+        """Store journeys data for a route/date (atomic write, then evict)."""
+        if not self.enabled or data is None:
+            return
+        key = self.key(origin, dest, date, base_url)
+        path = self._path(key)
+        body = json.dumps(
+            {
+                "origin": origin,
+                "dest": dest,
+                "date": iso_date(date),
+                "stored_at": time.time(),
+                "data": data,
+            },
+            separators=(",", ":"),
+        )
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(body)
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️  route cache write failed: {e}")
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_size()
+            else:
+                self._size += len(body) - old
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    # -- maintenance -------------------------------------------------------
+    def _entries(self):
+        """[(atime, mtime, size, path)] for every cache file."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for sub in os.listdir(self.directory):
+            subdir = os.path.join(self.directory, sub)
+            if not os.path.isdir(subdir):
+                continue
+            for name in os.listdir(subdir):
+                path = os.path.join(subdir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_atime, st.st_mtime, st.st_size, path))
+        return entries
+
+    def _disk_size(self):
+        return sum(e[2] for e in self._entries())
+
+    def evict(self):
+        """Drop stale entries, then least recently used ones until under 90%
+        of max_bytes."""
+        cutoff = time.time() - self.ttl
+        # Stale entries sort first, then by last use.
+        entries = sorted(self._entries(), key=lambda e: (e[1] >= cutoff, e[0]))
+        total = sum(e[2] for e in entries)
+        target = self.max_bytes * 0.9
+        for _, mtime, size, path in entries:
+            if mtime >= cutoff and total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._size = total
+
+    def clear(self):
+        for *_, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._size = 0
+
+    # -- reporting ---------------------------------------------------------
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        if not self.enabled:
+            return "Route cache: disabled"
+        total = self.hits + self.misses
+        return (
+            f"Route cache: {self.hits}/{total} hits ({self.hit_rate:.0%}), "
+            f"TTL {self.ttl // 60} min"
+        )
+
+
+# Shared by every scanner in the process so the run's hit rate is in one place.
+ROUTE_CACHE = RouteCache()
+
+
+if __name__ == "__main__":
+    if "--clear" in sys.argv:
+        ROUTE_CACHE.clear()
+        print(f"Cleared {CACHE_DIR}")
+    else:
+        entries = ROUTE_CACHE._entries()
+        size = sum(e[2] for e in entries)
+        print(f"{CACHE_DIR}: {len(entries)} entries, {size / 1024:.0f} KB")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Which routes Frontier actually flies, learned from past scans.
+
+Dozens of the destinations in gowild_fast.destinations come back "No
+flights" from a given origin on every run (and the list includes SFO and
+SJC themselves, so an SFO scan used to request SFO -> SFO), yet each one
+still cost a 15-25 s politeness delay. The index remembers, per origin ->
+dest, how many runs in a row saw no flights at all on the route (any fare,
+not just GoWild), and the scanners skip a route once that streak reaches
+DEAD_RUNS:
+
+    destinations = ROUTE_INDEX.plan(origin, destinations)   # prints planned / pruned
+    ...
+    ROUTE_INDEX.observe(origin, dest, data)                  # next to FARE_STORE.record
+
+Streaks count runs, not dates: a run that finds the route served on any date
+resets it, so a route that flies twice a week is never pruned by a date-range
+scan. Pruned routes are re-probed (scanned again) once REPROBE_DAYS have
+passed since they were last looked at, so a new or seasonal route comes back
+on its own. Origin == destination is always pruned. Decisions use the index
+as it was when the process started; this run's observations are folded in
+and saved at exit (results/route_index.json).
+
+The index only describes the real booking site. Scans against any other host
+(a base_url or FRONTIER_BOOKING_URL pointing at benchmarks/standin_server.py)
+are neither recorded nor pruned, so a stand-in's made-up schedule can never
+mark a real route dead.
+
+Settings (env vars):
+    ROUTE_INDEX=0                  disable pruning (self routes are still skipped)
+    ROUTE_INDEX_DEAD_RUNS=7        runs in a row without flights before pruning
+    ROUTE_INDEX_REPROBE_DAYS=7     days before a pruned route is tried again
+
+    python3 route_index.py              # list pruned routes
+    python3 route_index.py --clear
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+from config import BOOKING_BASE_URL, PRODUCTION_BOOKING_URL
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(BASE_DIR, "results", "route_index.json")
+INDEX_ENABLED = os.environ.get("ROUTE_INDEX", "1") == "1"
+DEAD_RUNS = int(os.environ.get("ROUTE_INDEX_DEAD_RUNS", "7"))
+REPROBE_DAYS = float(os.environ.get("ROUTE_INDEX_REPROBE_DAYS", "7"))
+
+
+def _key(origin, dest):
+    return f"{origin.upper()}>{dest.upper()}"
+
+
+def has_flights(data):
+    """True if a journeys payload lists any flight, None if there is no payload."""
+    if not data:
+        return None
+    try:
+        return bool(data["journeys"][0].get("flights"))
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return None
+
+
+class RouteIndex:
+    """Per-route no-service streaks, persisted as one small JSON file."""
+
+    def __init__(self, path=INDEX_PATH, enabled=INDEX_ENABLED, dead_runs=DEAD_RUNS,
+                 reprobe_days=REPROBE_DAYS, site=PRODUCTION_BOOKING_URL):
+        self.path = path
+        self.enabled = enabled
+        self.site = site.rstrip("/")
+        self.dead_runs = dead_runs
+        self.reprobe_seconds = reprobe_days * 86400
+        self.planned = 0
+        self.pruned_self = 0
+        self.pruned_dead = 0
+        self._routes = None  # key -> {"streak", "checked", "served"}
+        self._seen = {}      # this run: key -> served on any date
+        self._registered = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._routes is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._routes = json.load(f)
+            except (OSError, ValueError):
+                self._routes = {}
+        return self._routes
+
+    def tracks(self, base_url=None):
+        """True if scans of base_url (default: the booking host) feed the index."""
+        return self.enabled and (base_url or BOOKING_BASE_URL).rstrip("/") == self.site
+
+    # -- decisions ---------------------------------------------------------
+    def dead(self, origin, dest, now=None, base_url=None):
+        """True if the route has had no flights for dead_runs runs and isn't
+        due for a re-probe."""
+        if not self.tracks(base_url):
+            return False
+        entry = self._load().get(_key(origin, dest))
+        if not entry or entry.get("streak", 0) < self.dead_runs:
+            return False
+        now = time.time() if now is None else now
+        return now - entry.get("checked", 0) < self.reprobe_seconds
+
+    def skip(self, origin, dest, base_url=None):
+        return origin.upper() == dest.upper() or self.dead(origin, dest, base_url=base_url)
+
+    def plan(self, origin, destinations, inbound=False, quiet=False, base_url=None):
+        """The {code: name} destinations worth scanning from `origin`.
+
+        inbound=True plans the dest -> origin direction (return legs).
+        Prints the planned vs pruned counts unless quiet.
+        """
+        kept, self_routes, dead = {}, 0, []
+        for code, name in destinations.items():
+            route = (code, origin) if inbound else (origin, code)
+            if route[0].upper() == route[1].upper():
+                self_routes += 1
+            elif self.dead(*route, base_url=base_url):
+                dead.append(code)
+            else:
+                kept[code] = name
+        with self._lock:
+            self.planned += len(destinations)
+            self.pruned_self += self_routes
+            self.pruned_dead += len(dead)
+        if not quiet and (self_routes or dead):
+            text = (f"🗺️  Route index: {len(destinations)} planned, "
+                    f"{self_routes + len(dead)} pruned ({self_routes} self, "
+                    f"{len(dead)} no service) → {len(kept)} to scan")
+            if dead:
+                text += f"\n   skipped: {', '.join(dead)}"
+            print(text)
+        return kept
+
+    # -- learning ----------------------------------------------------------
+    def observe(self, origin, dest, data, base_url=None):
+        """Note one fetched route's journeys data for this run."""
+        served = has_flights(data)
+        if served is None or not self.tracks(base_url):
+            return
+        key = _key(origin, dest)
+        with self._lock:
+            self._seen[key] = self._seen.get(key, False) or served
+            if not self._registered:
+                atexit.register(self.save)
+                self._registered = True
+
+    def save(self):
+        """Fold this run's observations into the streaks and write the file."""
+        with self._lock:
+            if not self._seen:
+                return
+            routes = self._load()
+            now = time.time()
+            for key, served in self._seen.items():
+                entry = routes.setdefault(key, {"streak": 0})
+                entry["checked"] = now
+                if served:
+                    entry["streak"] = 0
+                    entry["served"] = now
+                else:
+                    entry["streak"] = entry.get("streak", 0) + 1
+            self._seen = {}
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(routes, f, indent=0, sort_keys=True)
+            os.replace(tmp, self.path)
+
+    def pruned_routes(self):
+        return sorted(k for k in self._load() if self.dead(*k.split(">"), base_url=self.site))
+
+    def summary(self):
+        pruned = self.pruned_self + self.pruned_dead
+        return (f"Route index: {self.planned} routes planned, {pruned} pruned "
+                f"({self.pruned_self} self, {self.pruned_dead} no service)")
+
+
+# Shared by every scanner in the process, like route_cache.ROUTE_CACHE.
+ROUTE_INDEX = RouteIndex()
+
+
+def main():
+    if "--clear" in sys.argv[1:]:
+        if os.path.exists(INDEX_PATH):
+            os.remove(INDEX_PATH)
+        print(f"Cleared {INDEX_PATH}")
+        return
+    pruned = ROUTE_INDEX.pruned_routes()
+    print(f"{len(pruned)} routes pruned (no flights for {DEAD_RUNS}+ runs):")
+    for key in pruned:
+        entry = ROUTE_INDEX._load()[key]
+        print(f"  {key.replace('>', ' → ')}  streak {entry['streak']}")
+
+
+if __name__ == "__main__":
+    main()
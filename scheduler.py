@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Deadline-aware route order for the nightly deal report.
+
+The launchd job (launchd/com.frontier.dealcheck.plist) starts at 00:01 and
+the email is only useful if it lands before morning, but search_group used
+to walk the routes in dict order, so a slow night (captchas, Chrome
+restarts) could end before the best destinations were checked at all. The
+Scheduler ranks routes by expected value from the fare store's history and
+stops handing out routes at the deadline:
+
+    sched = Scheduler.from_env()            # DEAL_DEADLINE=06:30 or DEAL_BUDGET_MIN=300
+    for task in sched.order(tasks):
+        if not sched.take():
+            break                           # out of time: report what finished
+        ...
+    print(sched.coverage())
+
+A route's expected value is P(GoWild fare) x (REFERENCE_FARE - its cheapest
+GoWild fare), both over the scanner's last HISTORY_RUNS runs. The hit rate is
+smoothed ((hits + 1) / (runs + 2)), and a route scanned without a GoWild
+fare is valued at the average saving, so the more runs it has come back
+empty (no fares, or only Discount Den) the closer it gets to zero. A route
+that was never scanned (0.5 x the average) ranks between the proven ones
+and those. Ties keep the original order. Without a deadline every route is
+still taken, in value order.
+
+Settings (env vars):
+    DEAL_DEADLINE=06:30        stop starting routes at this local time (next occurrence)
+    DEAL_BUDGET_MIN=300        ... or this many minutes after start
+    DEAL_REPORT_RESERVE_MIN=5  minutes kept back for the cruise check + email
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from fare_store import FARE_STORE
+
+HISTORY_RUNS = 30
+REFERENCE_FARE = 199.0  # a typical walk-up fare; GoWild's value is the saving
+RESERVE_MIN = float(os.environ.get("DEAL_REPORT_RESERVE_MIN", "5"))
+
+
+def deadline_from_env(now=None):
+    """Epoch seconds of the DEAL_DEADLINE / DEAL_BUDGET_MIN deadline, or None."""
+    now = datetime.now() if now is None else now
+    clock = os.environ.get("DEAL_DEADLINE")
+    if clock:
+        hour, minute = (int(part) for part in clock.split(":"))
+        at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if at <= now:
+            at += timedelta(days=1)
+        return at.timestamp()
+    budget = os.environ.get("DEAL_BUDGET_MIN")
+    if budget:
+        return (now + timedelta(minutes=float(budget))).timestamp()
+    return None
+
+
+def route_values(stats, runs, reference=REFERENCE_FARE):
+    """{(origin, dest): expected value} from FareStore.route_stats output."""
+    values = {}
+    savings = [
+        max(reference - cheapest, 0.0)
+        for _, cheapest in stats.values() if cheapest is not None
+    ]
+    default = sum(savings) / len(savings) if savings else reference / 2
+    for route, (hits, cheapest) in stats.items():
+        p = (hits + 1) / (runs + 2)
+        values[route] = p * (default if cheapest is None else max(reference - cheapest, 0.0))
+    values[None] = 0.5 * default  # any route never scanned in the window
+    return values
+
+
+class Scheduler:
+    """Orders route tasks by expected value and enforces a deadline."""
+
+    def __init__(self, values=None, deadline=None, reserve=RESERVE_MIN * 60):
+        self.values = values or {None: 0.0}
+        self.deadline = deadline
+        self.stop_at = None if deadline is None else deadline - reserve
+        self.total = 0
+        self.taken = 0
+        self.expired = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, store=FARE_STORE, last_runs=HISTORY_RUNS):
+        values = None
+        if store.enabled:
+            try:
+                runs, stats = store.route_stats(last_runs=last_runs)
+                values = route_values(stats, runs)
+            except Exception as e:  # no history yet / locked db: dict order
+                print(f"⚠️  Scheduler: no fare history ({type(e).__name__})")
+        return cls(values, deadline_from_env())
+
+    def value(self, origin, dest):
+        return self.values.get((origin, dest), self.values[None])
+
+    def order(self, tasks):
+        """Tasks (anything with .origin / .dest) by expected value, best first."""
+        tasks = list(tasks)
+        with self._lock:
+            self.total += len(tasks)
+        return sorted(tasks, key=lambda t: -self.value(t.origin, t.dest))
+
+    def take(self):
+        """True if there is time to start another route (and counts it)."""
+        with self._lock:
+            if self.stop_at is not None and time.time() >= self.stop_at:
+                self.expired = True
+                return False
+            self.taken += 1
+            return True
+
+    def coverage(self):
+        text = f"Coverage: {self.taken}/{self.total} routes checked"
+        if self.deadline is not None:
+            text += f" by {datetime.fromtimestamp(self.deadline):%H:%M}"
+        skipped = self.total - self.taken
+        if skipped and self.expired:
+            text += f", {skipped} lowest-value routes skipped at the deadline"
+        elif skipped:
+            text += f", {skipped} not reached"
+        return text
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+One warmed-up HTTP session per run, shared by every date, origin and phase.
+
+gowild_fast.scan_routes called create_session() for every date, so each date
+of a multi-date scan repeated the homepage warm-up (and its sleep), and
+gowild_fast_bypass.create_session makes three warm-up requests with 7-13 s of
+sleeps. The scanners now ask the process-wide SESSIONS for their session
+factory's session instead; the first call builds and warms it up, later calls
+reuse it:
+
+    session = SESSIONS.get(create_session)   # warm-up only on the first call
+    ...
+    print(SESSIONS.summary())                # warm-ups made vs avoided
+
+Cookies and pooled connections carry over between dates the same way they
+already did between routes. A session that has gone bad can be dropped with
+SESSIONS.reset(create_session); the next get() warms up a fresh one.
+The browser scanners (gowild_WORKING, gowild_undetected, the deal report)
+already keep one driver for the whole run.
+"""
+
+import threading
+import time
+
+
+class WarmSessions:
+    """Sessions keyed by the factory that builds them, with warm-up totals."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.warmups = 0
+        self.reused = 0
+        self.warmup_seconds = 0.0
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, factory):
+        """The run's session from `factory`, built (and timed) on first use."""
+        with self._lock:
+            if factory in self._sessions:
+                self.reused += 1
+                return self._sessions[factory]
+            start = self.clock()
+            session = factory()
+            self.warmup_seconds += self.clock() - start
+            self.warmups += 1
+            self._sessions[factory] = session
+            return session
+
+    def reset(self, factory):
+        """Forget `factory`'s session; the next get() builds a new one."""
+        with self._lock:
+            self._sessions.pop(factory, None)
+
+    @property
+    def saved_seconds(self):
+        """Warm-up time avoided, at the average measured warm-up."""
+        if not self.warmups:
+            return 0.0
+        return self.reused * self.warmup_seconds / self.warmups
+
+    def summary(self):
+        return (f"Sessions: {self.warmups} warm-up(s) in {self.warmup_seconds:.0f}s, "
+                f"{self.reused} reused (~{self.saved_seconds:.0f}s of warm-up saved)")
+
+
+# Shared by every scanner in the process, like route_cache.ROUTE_CACHE.
+SESSIONS = WarmSessions()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import browser_state
+import gowild_fast
+import retry_queue
+import roundtrip_fast
+
+
+@pytest.fixture
+def offline_scan(monkeypatch):
+    """Scanners with no network, no sleeping and no on-disk state.
+
+    Returns use(fetch, module=gowild_fast), which puts fetch in place of the
+    module's get_flight_data. Sessions are None unless a test patches
+    create_session itself.
+    """
+    monkeypatch.setattr(gowild_fast, "create_session", lambda: None)
+    for module in (gowild_fast, roundtrip_fast, retry_queue):
+        monkeypatch.setattr(module, "polite_sleep", lambda s: None)
+    monkeypatch.setattr(gowild_fast.ROUTE_CACHE, "enabled", False)
+    monkeypatch.setattr(gowild_fast.ROUTE_INDEX, "enabled", False)
+    monkeypatch.setattr(browser_state, "COOKIE_JAR_ENABLED", False)
+
+    def use(fetch, module=gowild_fast):
+        monkeypatch.setattr(module, "get_flight_data", fetch)
+
+    return use
@@ -0,0 +1,38 @@
+import os
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import async_scan
+
+
+def test_each_worker_thread_gets_its_own_session(monkeypatch):
+    monkeypatch.setattr(async_scan.ROUTE_CACHE, "enabled", False)
+    monkeypatch.setattr(async_scan.ROUTE_INDEX, "enabled", False)
+    warmed = requests.Session()
+    warmed.headers["User-Agent"] = "scanner"
+    warmed.cookies.set("_px3", "token", domain=".flyfrontier.com")
+    seen = {}  # id(session) -> threads that used it
+    sessions = {}
+    lock = threading.Lock()
+
+    def fetch(origin, dest, date, session, base_url=None):
+        time.sleep(0.01)  # keep several workers busy at once
+        with lock:
+            seen.setdefault(id(session), set()).add(threading.get_ident())
+            sessions[id(session)] = session
+        return {"journeys": [{"flights": []}]}, False
+
+    dests = {f"D{i:02d}": f"Dest {i}" for i in range(24)}
+    async_scan.scan_routes("SFO", dests, "Mar%2002,%202026", concurrency=4,
+                           session=warmed, fetch=fetch, base_delay=0, jitter=0)
+
+    assert all(len(threads) == 1 for threads in seen.values())
+    assert id(warmed) in seen and 1 < len(seen) <= 4
+    for session in sessions.values():
+        assert session.headers["User-Agent"] == "scanner"
+        assert session.cookies.get("_px3") == "token"
@@ -0,0 +1,46 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    GOWILD_BLACKOUT_DATES,
+    blackout_dates_between,
+    blackout_mask,
+    is_blackout_date,
+    split_blackout_dates,
+)
+
+START = date(2024, 12, 1)
+DAYS = [START + timedelta(days=i) for i in range(4 * 366)]
+
+
+def test_every_form_agrees_with_the_list():
+    for d in DAYS:
+        expected = d.isoformat() in GOWILD_BLACKOUT_DATES
+        assert is_blackout_date(d) == expected
+        assert is_blackout_date(d.isoformat()) == expected
+        assert is_blackout_date(datetime(d.year, d.month, d.day, 13, 30)) == expected
+
+
+def test_batch_helpers():
+    mask = blackout_mask(DAYS)
+    assert sum(mask) == len(set(GOWILD_BLACKOUT_DATES))
+    searchable, blackout = split_blackout_dates(DAYS)
+    assert len(searchable) + len(blackout) == len(DAYS)
+    assert blackout == [d for d, m in zip(DAYS, mask) if m]
+    assert blackout_dates_between(DAYS[0], DAYS[-1]) == blackout
+    assert blackout_dates_between(date(2025, 12, 24), date(2025, 12, 25)) == []
+
+
+def test_blackout_mask_takes_mixed_and_datetime64_input():
+    mixed = [d.isoformat() if i % 3 == 0 else d for i, d in enumerate(DAYS)]
+    mixed += ["not a date", date(1999, 1, 1), datetime(2099, 1, 1, 8)]
+    expected = [is_blackout_date(v) for v in mixed]
+    assert blackout_mask(mixed) == expected and sum(expected) > 0
+    np = pytest.importorskip("numpy")
+    assert blackout_mask(np.array(DAYS, dtype="datetime64[D]")) == blackout_mask(DAYS)
+    assert blackout_mask([]) == []
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from browser_state import cookie_path, launch_with_profile, restore_cookies, save_cookies
+
+
+def _session():
+    session = requests.Session()
+    session.cookies.set("_px3", "kept", domain=".flyfrontier.com",
+                        expires=int(time.time()) + 3600)
+    session.cookies.set("_pxhd", "stale", domain=".flyfrontier.com",
+                        expires=int(time.time()) - 60)
+    session.cookies.set("dotrez", "session", domain="booking.flyfrontier.com")
+    return session
+
+
+def test_cookie_jar_round_trip_honours_expiry(tmp_path):
+    save_cookies(_session(), "scan", str(tmp_path))
+
+    fresh = requests.Session()
+    assert restore_cookies(fresh, "scan", str(tmp_path), enabled=True,
+                           save_at_exit=False) == 2
+    assert {c.name for c in fresh.cookies} == {"_px3", "dotrez"}
+
+    # Session cookies are only reused while the jar is recent.
+    old = time.time() - 13 * 3600
+    os.utime(cookie_path("scan", str(tmp_path)), (old, old))
+    later = requests.Session()
+    restore_cookies(later, "scan", str(tmp_path), enabled=True,
+                    session_hours=12, save_at_exit=False)
+    assert [c.name for c in later.cookies] == ["_px3"]
+
+
+def test_unreadable_cookie_jar_starts_empty(tmp_path):
+    path = cookie_path("scan", str(tmp_path))
+    with open(path, "w") as f:
+        f.write("not a cookie file\n")
+    session = requests.Session()
+    assert restore_cookies(session, "scan", str(tmp_path), enabled=True,
+                           save_at_exit=False) == 0
+    assert not os.path.exists(path)
+
+
+def test_cookie_jar_is_on_by_default_and_kept_per_host(tmp_path):
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("COOKIE_JAR", "FRONTIER_BOOKING_URL")}
+    code = ("import os, browser_state as b; "
+            "print(b.COOKIE_JAR_ENABLED, os.path.basename(b.cookie_path('gowild_fast')))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout.split()
+    assert out == ["True", "gowild_fast@booking.flyfrontier.com.txt"]
+
+    standin = "http://127.0.0.1:8765"
+    save_cookies(_session(), "scan", str(tmp_path), site=standin)
+    assert sorted(os.listdir(tmp_path)) == ["scan@127.0.0.1_8765.txt"]
+    assert restore_cookies(requests.Session(), "scan", str(tmp_path), enabled=True,
+                           save_at_exit=False) == 0
+    assert restore_cookies(requests.Session(), "scan", str(tmp_path), enabled=True,
+                           save_at_exit=False, site=standin) == 2
+
+
+def test_corrupt_profile_falls_back_to_a_fresh_one(tmp_path):
+    launched = []
+
+    def launch(profile):
+        launched.append(profile)
+        if os.path.exists(os.path.join(profile, "Local State")):
+            raise RuntimeError("session not created: Chrome failed to start")
+        return "driver"
+
+    assert launch_with_profile(launch, base=str(tmp_path)) == "driver"
+    (profile,) = launched
+    with open(os.path.join(profile, "Local State"), "w") as f:
+        f.write("{truncated")
+    os.symlink("host-999999999", os.path.join(profile, "SingletonLock"))  # dead Chrome
+
+    assert launch_with_profile(launch, base=str(tmp_path)) == "driver"
+    assert launched == [profile] * 3
+    assert os.listdir(profile) == []
+    assert sorted(os.listdir(profile + ".corrupt")) == ["Local State"]
+    assert launch_with_profile(lambda p: p, base="") is None  # not enabled
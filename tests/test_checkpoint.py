@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gowild_fast
+from checkpoint import Checkpoint, route_status
+from records import FlightRecord
+
+DATE = "Mar%2002,%202026"
+FLIGHT = {"isGoWildFareEnabled": True, "goWildFare": 29, "stopsText": "Nonstop",
+          "legs": [{"departureDate": "2026-03-02T06:00:00",
+                    "arrivalDate": "2026-03-02T08:30:00"}]}
+PARAMS = {"origin": "SFO", "dates": ["2026-03-02"]}
+
+
+def test_journal_round_trip_and_failures_requeue(tmp_path):
+    ckpt = Checkpoint("scan", PARAMS, directory=str(tmp_path))
+    entry = {"name": "Denver", "count": 1, "flights": [FlightRecord(29.0, departs="6:00 AM")]}
+    ckpt.record("SFO", "DEN", DATE, "ok", entry)
+    ckpt.record("SFO", "LAS", "2026-03-02", "none")
+    ckpt.record("SFO", "MCO", DATE, "rate_limited")
+    ckpt.record("SFO", "PHX", DATE, route_status(None, None))
+    ckpt.close()
+    with open(ckpt.path, "a") as f:
+        f.write('{"origin": "SFO", "dest": "SEA", "da')  # torn by a crash
+
+    resumed = Checkpoint("scan", PARAMS, resume=True, directory=str(tmp_path))
+    dests = {"DEN": "Denver", "LAS": "Las Vegas", "MCO": "Orlando", "PHX": "Phoenix",
+             "SEA": "Seattle"}
+    pending, restored = resumed.restore("SFO", dests, "2026-03-02")
+    assert list(pending) == ["MCO", "PHX", "SEA"]
+    (rec,) = restored["DEN"]["flights"]
+    assert (rec.fare, rec.departs, restored["DEN"]["name"]) == (29.0, "6:00 AM", "Denver")
+    assert resumed.resumed == 2
+
+    # A re-queued route that now succeeds is done from then on.
+    resumed.record("SFO", "MCO", DATE, "none")
+    resumed.close()
+    again = Checkpoint("scan", PARAMS, resume=True, directory=str(tmp_path))
+    assert again.done("SFO", "MCO", DATE) and not again.done("SFO", "SEA", DATE)
+
+    # Without --resume, or for another scan, the journal starts empty.
+    assert Checkpoint("scan", {**PARAMS, "origin": "OAK"}, resume=True,
+                      directory=str(tmp_path)).resumed == 0
+    assert Checkpoint("scan", PARAMS, directory=str(tmp_path)).resumed == 0
+
+
+def test_resumed_scan_refetches_no_completed_route(tmp_path, offline_scan):
+    dests = {f"D{i:03d}": f"Dest {i}" for i in range(1000)}
+    fetched = []
+    crash_at = [600]
+
+    def fake_fetch(origin, dest, date, session, base_url=None):
+        if len(fetched) == crash_at[0]:
+            raise KeyboardInterrupt  # the laptop went to sleep
+        fetched.append(dest)
+        if dest.endswith("7"):
+            return None, True  # captcha
+        return {"journeys": [{"flights": [FLIGHT] if dest.endswith("1") else []}]}, False
+
+    offline_scan(fake_fetch)
+
+    ckpt = Checkpoint("scan", PARAMS, directory=str(tmp_path))
+    with pytest.raises(KeyboardInterrupt):
+        gowild_fast.scan_routes("SFO", dests, DATE, checkpoint=ckpt)
+    ckpt.close()
+    first = list(fetched)  # the crash came before any retry round
+    fetched.clear()
+    crash_at[0] = None
+
+    ckpt = Checkpoint("scan", PARAMS, resume=True, directory=str(tmp_path))
+    pending, restored = ckpt.restore("SFO", dests, DATE)
+    results = gowild_fast.scan_routes("SFO", pending, DATE, checkpoint=ckpt)
+    done_first = {d for d in first if not d.endswith("7")}
+    assert not done_first & set(fetched)
+    assert set(fetched) == set(dests) - done_first
+    assert len(restored) + len(results) == 100
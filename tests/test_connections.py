@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connections import ConnectionGraph, Flight, flights_from_store
+from fare_store import FareStore
+
+
+def fl(origin, dest, dep, hours, price):
+    departs = datetime.fromisoformat(dep)
+    return Flight(origin, dest, departs, departs + timedelta(hours=hours), price, None)
+
+
+FLIGHTS = [
+    fl("SFO", "DEN", "2026-03-02T06:00", 2.5, 19.0),
+    fl("SFO", "LAS", "2026-03-02T07:00", 1.5, 29.0),
+    fl("DEN", "CUN", "2026-03-02T09:00", 4.0, 39.0),   # 30 min after landing
+    fl("DEN", "CUN", "2026-03-02T12:00", 4.0, 59.0),
+    fl("LAS", "CUN", "2026-03-02T11:00", 4.0, 35.0),
+    fl("DEN", "CUN", "2026-03-03T07:00", 4.0, 20.0),   # overnight
+    fl("SFO", "CUN", "2026-03-02T08:00", 6.0, 99.0),
+]
+
+
+def route(it):
+    return [f.origin for f in it.flights] + [it.flights[-1].dest], it.price
+
+
+def test_cheapest_respects_connection_rules():
+    g = ConnectionGraph(FLIGHTS)
+    found = g.cheapest("SFO", "CUN", "2026-03-02", k=3)
+    assert [route(i) for i in found] == [
+        (["SFO", "LAS", "CUN"], 64.0), (["SFO", "DEN", "CUN"], 78.0), (["SFO", "CUN"], 99.0),
+    ]
+    over = g.cheapest("SFO", "CUN", "2026-03-02", k=1, overnight=True)
+    assert route(over[0]) == (["SFO", "DEN", "CUN"], 39.0)
+    assert g.cheapest("SFO", "CUN", "2026-03-02", max_price=60) == []
+    assert [route(i) for i in g.cheapest("SFO", "CUN", "2026-03-02", max_legs=1)] == [(["SFO", "CUN"], 99.0)]
+
+
+def test_k_cheapest_keeps_every_prefix_into_a_shared_flight():
+    # Both SFO -> LAS flights make the same LAS -> DEN connection; the second
+    # cheapest itinerary differs from the first only before that flight.
+    g = ConnectionGraph([
+        fl("SFO", "LAS", "2026-03-02T06:00", 1.5, 19.0),
+        fl("SFO", "LAS", "2026-03-02T06:30", 1.5, 29.0),
+        fl("LAS", "DEN", "2026-03-02T09:30", 2.0, 20.0),
+        fl("DEN", "CUN", "2026-03-02T13:00", 4.0, 30.0),
+    ])
+    found = g.cheapest("SFO", "CUN", "2026-03-02", k=2, max_legs=3)
+    assert [route(i) for i in found] == [
+        (["SFO", "LAS", "DEN", "CUN"], 69.0), (["SFO", "LAS", "DEN", "CUN"], 79.0),
+    ]
+    assert found[0].flights[0].price == 19.0 and found[1].flights[0].price == 29.0
+
+
+def test_flights_from_store_uses_latest_run():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fares.sqlite3")
+        leg = {"departureDate": "2026-03-02T06:00:00", "arrivalDate": "2026-03-02T08:30:00"}
+        for price in (49, 19):
+            store = FareStore(path, enabled=True, scanner="test")
+            store.record("SFO", "DEN", "2026-03-02",
+                         [{"isGoWildFareEnabled": True, "goWildFare": price, "legs": [leg]}])
+            store.close()
+        (f,) = flights_from_store(FareStore(path), "2026-03-02")
+        assert (f.origin, f.dest, f.price) == ("SFO", "DEN", 19.0)
+
+
+def test_flights_from_store_drops_fares_the_latest_scan_no_longer_saw(tmp_path):
+    path = str(tmp_path / "fares.sqlite3")
+    leg = {"departureDate": "2026-03-02T06:00:00", "arrivalDate": "2026-03-02T08:30:00"}
+    gowild = {"isGoWildFareEnabled": True, "goWildFare": 19, "legs": [leg]}
+    den_only = {"isGoWildFareEnabled": False, "discountDenFare": 89, "legs": [leg]}
+    for second in ([den_only], []):
+        for flights in ([gowild], second):  # run 1, then run 2
+            store = FareStore(path, enabled=True, scanner="test")
+            store.record("SFO", "DEN", "2026-03-02", {"journeys": [{"flights": flights}]})
+            store.close()
+        assert flights_from_store(FareStore(path), "2026-03-02") == []
@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fare_store import DISCOUNT_DEN, GOWILD, FareStore
+
+
+def flight(gw, dd, seats="3 Seats Left!", dep="2026-03-02T06:00:00"):
+    return {
+        "isGoWildFareEnabled": gw is not None,
+        "goWildFare": gw,
+        "goWildFareSeatsRemaining": seats,
+        "discountDenFare": dd,
+        "stopsText": "Nonstop",
+        "duration": "3h 10m",
+        "legs": [{"departureDate": dep, "arrivalDate": "2026-03-02T09:10:00", "flightNumber": "F9 1001"}],
+    }
+
+
+def data(*flights):
+    return {"journeys": [{"flights": list(flights)}]}
+
+
+def test_records_one_row_per_fare_type(tmp_path):
+    store = FareStore(str(tmp_path / "f.sqlite3"), enabled=True, scanner="test")
+    store.record("SFO", "CUN", "Mar%2002,%202026", data(flight(49.0, 89.0), flight(None, 79.0)))
+    assert store.recorded == 3
+    gw = store.cheapest("SFO", "CUN", GOWILD)
+    assert [(r["flight_date"], r["price"], r["seats"]) for r in gw] == [("2026-03-02", 49.0, 3)]
+    assert [r["price"] for r in store.cheapest("SFO", "CUN", DISCOUNT_DEN)] == [79.0, 89.0]
+    store.close()
+
+
+def test_cheapest_only_looks_at_recent_runs(tmp_path):
+    path = str(tmp_path / "f.sqlite3")
+    for price in (19.0, 99.0, 59.0):  # three separate runs, oldest first
+        store = FareStore(path, enabled=True, scanner="test")
+        store.record("SFO", "CUN", "2026-03-02", data(flight(price, None)))
+        store.close()
+    store = FareStore(path, enabled=True)
+    assert [r["price"] for r in store.cheapest("SFO", "CUN", last_runs=2)] == [59.0, 99.0]
+    assert store.cheapest("SFO", "CUN", last_runs=30)[0]["price"] == 19.0
+    runs = store.runs()
+    assert len(runs) == 3 and all(r[3] for r in runs)  # every run was finished
+
+
+def test_scans_are_recorded_even_without_fares(tmp_path):
+    store = FareStore(str(tmp_path / "f.sqlite3"), enabled=True, scanner="test")
+    store.record("SFO", "CUN", "2026-03-02", data(flight(49.0, 89.0)))
+    store.record("SFO", "CUN", "2026-03-02", data(flight(None, 79.0)))  # second pass
+    store.record("SFO", "BQN", "2026-03-02", data())
+    store.record("SFO", "MCO", "2026-03-02", None)  # fetch failed: not a scan
+    store.flush()
+    scans = store.connect().execute(
+        "SELECT dest, fares FROM scans WHERE run_id = ? ORDER BY dest", (store.run_id,)
+    ).fetchall()
+    assert scans == [("BQN", 0), ("CUN", 3)]
+    store.close()
+
+
+def test_disabled_store_writes_nothing(tmp_path):
+    path = tmp_path / "f.sqlite3"
+    store = FareStore(str(path), enabled=False)
+    store.record("SFO", "CUN", "2026-03-02", data(flight(49.0, 89.0)))
+    store.close()
+    assert not path.exists()
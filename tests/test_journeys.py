@@ -0,0 +1,98 @@
+"""
+Offline checks for the shared journeys extractor (no network).
+
+    python3 -m pytest -q tests/test_journeys.py
+"""
+
+import html
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journeys import _QUOTES, _patterns, find_journeys_data, parse_flights
+
+
+def _page(payload, before="", after=""):
+    escaped = html.escape(json.dumps(payload), quote=True)
+    return (
+        f"<html><head><script>var a = {{}};</script></head><body>{before}"
+        f"<script>var FlightData = '{escaped}';</script>{after}</body></html>"
+    )
+
+
+FLIGHTS = [
+    {"goWildFare": 29.0, "isGoWildFareEnabled": True, "stopsText": "Nonstop"},
+    {"goWildFare": None, "isGoWildFareEnabled": False, "stopsText": "1 Stop {via DEN}"},
+]
+
+
+def test_parse_flights_from_escaped_script():
+    page = _page({"journeys": [{"flights": FLIGHTS}]})
+    assert parse_flights(page) == FLIGHTS
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    page = _page({"journeys": [{"flights": FLIGHTS}], "note": "} trailing {"})
+    assert find_journeys_data(page, project=False)["note"] == "} trailing {"
+
+
+def test_projection_keeps_only_consumed_fields():
+    flight = {
+        "goWildFare": 19.0, "isGoWildFareEnabled": True, "stopsText": "] {Nonstop} [",
+        "fareClasses": [{"code": "GW", "rules": "No \"refunds\" [ever] {}", "bundles": [{"n": [1, [2]]}]}],
+        "legs": [{"departureDate": "2026-03-02T06:00:00", "equipment": "A321neo"}],
+    }
+    page = _page({"journeys": [{"flights": [flight, flight]}], "currency": "USD"})
+    expected = {
+        "goWildFare": 19.0, "isGoWildFareEnabled": True, "stopsText": "] {Nonstop} [",
+        "legs": [{"departureDate": "2026-03-02T06:00:00"}],
+    }
+    assert find_journeys_data(page) == {"journeys": [{"flights": [expected, expected]}]}
+
+
+def test_projection_falls_back_to_full_decode():
+    # Nesting deeper than the projecting walk follows: same answer via json.
+    deep = {"goWildFare": 29.0, "blob": json.loads("[" * 20 + "]" * 20)}
+    page = _page({"journeys": [{"flights": [deep]}]})
+    assert parse_flights(page) == [{"goWildFare": 29.0}]
+
+
+def test_journeys_text_outside_a_script_is_ignored():
+    page = _page(
+        {"journeys": [{"flights": FLIGHTS}]},
+        before="<p>Your journeys and flights</p>",
+    )
+    assert parse_flights(page) == FLIGHTS
+
+
+def test_captcha_and_empty_pages():
+    assert parse_flights('<div id="px-captcha"></div>') == []
+    assert parse_flights("<html><body>No flights</body></html>") == []
+    assert parse_flights(_page({"journeys": []})) == []
+
+
+def test_bytes_pipeline_matches_text():
+    from journeys import (CAPTCHA, RESULTS, TOO_SHORT, classify_page, content_charset,
+                          find_journeys_data_bytes)
+
+    page = _page({"journeys": [{"flights": FLIGHTS}]}, after="<p>" + "x" * 12000 + "</p>")
+    body = page.encode("utf-8")
+    assert classify_page(body) == RESULTS
+    assert classify_page(b'<div id="px-captcha"></div>') == CAPTCHA
+    assert classify_page(b"<html></html>") == TOO_SHORT
+    assert find_journeys_data_bytes(body) == find_journeys_data(page)
+    assert find_journeys_data_bytes(page.encode("utf-16"), "utf-16") == find_journeys_data(page)
+    assert content_charset('text/html; charset="ISO-8859-1"') == "iso8859-1"
+    assert content_charset("text/html") == "utf-8"
+
+
+def test_projection_patterns_need_no_3_11_regex_syntax():
+    # The nightly job runs the system python3 (3.9 on macOS): no possessive
+    # quantifiers or atomic groups.
+    for quote in _QUOTES:
+        for pattern in _patterns(quote):
+            assert not re.search(r"[*+?}]\+|\(\?>", pattern.pattern), quote
+            assert len(pattern.pattern) < 4000
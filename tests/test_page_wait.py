@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.common.exceptions import InvalidSessionIdException, JavascriptException
+
+from page_wait import RESULTS_READY_JS, ReadyStats, wait_until_ready
+
+
+class FakeDriver:
+    """Answers the readiness script False `not_ready` times, then True."""
+
+    def __init__(self, not_ready, error_first=False, error=JavascriptException):
+        self.not_ready = not_ready
+        self.error_first = error_first
+        self.error = error
+        self.calls = 0
+
+    def execute_script(self, js):
+        self.calls += 1
+        if self.error_first and self.calls == 1:
+            raise self.error("document is navigating")
+        return self.calls > self.not_ready
+
+
+def test_returns_as_soon_as_ready():
+    stats = ReadyStats()
+    driver = FakeDriver(not_ready=0)
+    assert wait_until_ready(driver, RESULTS_READY_JS, 5, kind="results", stats=stats)
+    assert driver.calls == 1
+    assert stats.samples["results"][0] < 1
+    assert "1 pages" in stats.summary() and "0 hit the 5s cap" in stats.summary()
+
+
+def test_js_errors_count_as_not_ready():
+    stats = ReadyStats()
+    driver = FakeDriver(not_ready=1, error_first=True)
+    assert wait_until_ready(driver, RESULTS_READY_JS, 5, kind="results", stats=stats)
+    assert driver.calls == 2
+
+
+def test_cap_is_recorded_as_timeout():
+    stats = ReadyStats()
+    assert not wait_until_ready(FakeDriver(not_ready=10**6), "", 0.3, kind="itinerary", stats=stats)
+    assert stats.timeouts == {"itinerary": 1}
+    assert "1 hit the 0.3s cap" in stats.summary()
+
+
+def test_dead_session_is_raised_without_waiting_out_the_cap():
+    stats = ReadyStats()
+    driver = FakeDriver(not_ready=10**6, error_first=True, error=InvalidSessionIdException)
+    with pytest.raises(InvalidSessionIdException):
+        wait_until_ready(driver, RESULTS_READY_JS, 30, kind="results", stats=stats)
+    assert driver.calls == 1
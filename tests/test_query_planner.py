@@ -0,0 +1,59 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import query_planner
+from query_planner import LatencyLog, expand, plan_query
+from route_cache import RouteCache
+from route_index import RouteIndex
+
+DATA = {"journeys": [{"flights": []}]}
+
+
+def _planner(tmp_path, monkeypatch):
+    cache = RouteCache(directory=str(tmp_path / "cache"), ttl=3600, enabled=True)
+    index = RouteIndex(path=str(tmp_path / "idx.json"), enabled=True, dead_runs=1)
+    monkeypatch.setattr(query_planner, "ROUTE_CACHE", cache)
+    monkeypatch.setattr(query_planner, "ROUTE_INDEX", index)
+    return cache, index, LatencyLog(str(tmp_path / "latency.json"))
+
+
+def test_plan_drops_tasks_that_need_no_page_load(tmp_path, monkeypatch, capsys):
+    cache, index, latency = _planner(tmp_path, monkeypatch)
+    cache.put("SFO", "DEN", "Mar%2002,%202026", DATA)
+    index.observe("SFO", "BQN", DATA)
+    index.save()
+    index._routes = None  # the next run's snapshot
+
+    routes = [("SFO", code) for code in ("SFO", "DEN", "LAS", "BQN", "las")]
+    dates = ["2026-03-02", "Mar 3, 2026", "2026-01-01"]  # Jan 1 is a blackout
+    plan = plan_query(expand(routes, dates), "scan", default_seconds=20,
+                      done=lambda o, d, day: (d, day) == ("LAS", "2026-03-03"),
+                      latency=latency)
+
+    assert plan.tasks == [("SFO", "DEN", "2026-03-03"), ("SFO", "LAS", "2026-03-02")]
+    assert plan.dropped == {"blackout": 5, "duplicate": 2, "unserved": 4,
+                            "cached": 1, "done": 1}
+    assert plan.eta_seconds == 40
+    assert "15 tasks → 2 page loads" in plan.summary()
+    assert "ETA ~40 s at 20.0 s/page load (configured delay)" in plan.summary()
+
+
+def test_eta_uses_measured_seconds_per_page_load(tmp_path, monkeypatch):
+    cache, _, latency = _planner(tmp_path, monkeypatch)
+    tasks = list(expand([("SFO", "DEN"), ("SFO", "LAS")], ["2026-03-02"]))
+
+    plan = plan_query(tasks, "scan", default_seconds=20, latency=latency)
+    plan._started -= 60
+    for dest in ("DEN", "LAS", "MCO"):  # three page loads actually made
+        cache.get("SFO", dest, "2026-03-02")
+    plan.finish()
+    seconds, runs = latency.get("scan")
+    assert (round(seconds), runs) == (20, 1)
+
+    latency.record("scan", 30.0)
+    again = plan_query(tasks, "scan", default_seconds=5, latency=latency)
+    assert round(again.seconds) == 23  # smoothed towards the new run
+    assert "measured over 2 run(s)" in again.summary()
+    assert latency.get("other") == (None, 0)
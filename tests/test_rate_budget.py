@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_budget import RateBudget
+
+
+def test_slots_are_spaced_by_interval():
+    budget = RateBudget(10, scale=1)
+    delays = [budget.reserve() for _ in range(4)]
+    assert delays[0] == 0
+    assert [round(d) for d in delays[1:]] == [10, 20, 30]
+
+
+def test_burst_allows_back_to_back_slots():
+    budget = RateBudget(10, burst=3, scale=1)
+    delays = [budget.reserve() for _ in range(4)]
+    assert delays[:3] == [0, 0, 0]
+    assert round(delays[3]) == 10
+
+
+def test_aggregate_rate_across_threads():
+    budget = RateBudget(0.02, scale=1)
+    stamps = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(5):
+            budget.acquire()
+            with lock:
+                stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stamps.sort()
+    assert budget.acquired == 20
+    # 20 slots one interval apart cannot finish faster than 19 intervals.
+    assert stamps[-1] - stamps[0] >= 19 * 0.02 * 0.9
+
+
+def test_zero_scale_is_unlimited():
+    budget = RateBudget(5, scale=0)
+    assert budget.acquire() == 0 and budget.acquire() == 0
+    assert "unlimited" in budget.summary()
+
+
+def test_penalize_and_reward_adapt_the_shared_interval():
+    budget = RateBudget(15, scale=1)
+    budget.penalize()
+    budget.penalize()
+    assert budget.base == 35
+    for _ in range(5):
+        budget.penalize()
+    assert budget.base == 60
+    for _ in range(100):
+        budget.reward()
+    assert budget.base == 15
+
+
+def test_acquire_async_waits_without_blocking():
+    import asyncio
+
+    budget = RateBudget(0.05, scale=1)
+
+    async def run():
+        return [await budget.acquire_async() for _ in range(3)]
+
+    delays = asyncio.run(run())
+    assert delays[0] == 0 and min(delays[1:]) > 0.03
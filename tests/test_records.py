@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Deal, FareType, FlightRecord, best_fare, gowild_records
+
+FLIGHT = {
+    "isGoWildFareEnabled": True,
+    "goWildFare": 29,
+    "goWildFareSeatsRemaining": "2 Seats Left!",
+    "discountDenFare": 89.5,
+    "stopsText": "Nonstop",
+    "duration": "2h 30m",
+    "legs": [{"departureDate": "2026-03-02T06:00:00", "arrivalDate": "2026-03-02T08:30:00",
+              "departureDateFormatted": "6:00 AM", "flightNumber": "F9 1001"}],
+    "fareClasses": [{"code": "ST", "price": 120.0}],
+}
+
+
+def test_flight_record_keeps_only_used_fields():
+    (rec,) = gowild_records([FLIGHT, {**FLIGHT, "isGoWildFareEnabled": False}])
+    assert (rec.fare, rec.seats, rec.discount_den, rec.stops, rec.departs) == (
+        29.0, "2 Seats Left!", 89.5, "Nonstop", "6:00 AM")
+    assert (rec.departs_at, rec.arrives_at, rec.flight_no) == (
+        "2026-03-02T06:00:00", "2026-03-02T08:30:00", "F9 1001")
+    assert not hasattr(rec, "__dict__")
+    assert best_fare([rec, FlightRecord(19.0), FlightRecord(None)]) == 19.0
+    assert best_fare([]) == 999
+
+
+def test_deal_interns_and_round_trips_to_dict():
+    a = Deal("GoWild", "SFO", "DEN", "Denver, CO", 29.0, flight_date="".join(["Mar 2, ", "2026"]))
+    b = Deal(FareType.GOWILD, "SFO", "DEN", "Denver, CO", 39.0, flight_date="Mar 2, 2026")
+    assert a.fare_type is FareType.GOWILD and a.fare_type == "GoWild"
+    assert a.flight_date is b.flight_date
+    assert a.as_dict()["type"] == "GoWild" and a.as_dict()["price"] == 29.0
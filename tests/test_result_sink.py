@@ -0,0 +1,71 @@
+import csv
+import gzip
+import json
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_sink import EVENT_PREFIX, ResultSink, parse_event
+
+FIELDS = ["Origin", "Destination", "Price"]
+
+
+def _rows(dest, *prices):
+    return [{"Origin": "SFO", "Destination": dest, "Price": p} for p in prices]
+
+
+def test_rows_are_on_disk_after_each_route(tmp_path):
+    sink = ResultSink(str(tmp_path / "run"), FIELDS, compress=False, events=False)
+    sink.write_route(_rows("DEN", 29, 49), origin="SFO", dest="DEN")
+    ndjson_path, csv_path = sink.paths
+    assert [json.loads(l)["Price"] for l in open(ndjson_path)] == [29, 49]
+
+    sink.write_route([], origin="SFO", dest="LAS")
+    sink.write_route(_rows("PHX", 19), origin="SFO", dest="PHX")
+    with open(csv_path, newline="") as f:
+        lines = list(csv.reader(f))
+    assert lines[0] == FIELDS and len(lines) == 4
+    sink.close()
+    assert (sink.routes, sink.rows) == (3, 3)
+
+
+def test_no_rows_leaves_no_files(tmp_path):
+    with ResultSink(str(tmp_path / "empty"), FIELDS, compress=False, events=False) as sink:
+        sink.write_route([], origin="SFO", dest="DEN")
+    assert not any(os.path.exists(p) for p in sink.paths)
+
+
+def test_gzip_is_readable_before_close(tmp_path):
+    sink = ResultSink(str(tmp_path / "run"), FIELDS, compress=True, events=False)
+    sink.write_route(_rows("DEN", 29), origin="SFO", dest="DEN")
+    sink.write_route(_rows("MCO", 39), origin="SFO", dest="MCO")
+    ndjson_path, csv_path = sink.paths
+    # No gzip trailer yet: a raw inflate still yields every flushed route.
+    raw = open(ndjson_path, "rb").read()
+    text = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(raw).decode()
+    assert [json.loads(l)["Destination"] for l in text.splitlines()] == ["DEN", "MCO"]
+    sink.close()
+    with gzip.open(csv_path, "rt", newline="") as f:
+        assert list(csv.DictReader(f))[1]["Destination"] == "MCO"
+
+
+def test_reopened_sink_appends_without_second_header(tmp_path):
+    for dest in ("DEN", "MCO"):
+        with ResultSink(str(tmp_path / "run"), FIELDS, compress=False, events=False) as sink:
+            sink.write_route(_rows(dest, 29), origin="SFO", dest=dest)
+    with open(sink.paths[1], newline="") as f:
+        assert [r["Destination"] for r in csv.DictReader(f)] == ["DEN", "MCO"]
+
+
+def test_events_go_to_stdout(tmp_path, capsys):
+    with ResultSink(str(tmp_path / "run"), FIELDS, compress=False, events=True) as sink:
+        sink.write_route(_rows("DEN", 29), origin="SFO", dest="DEN", status="ok")
+    out = capsys.readouterr().out.splitlines()
+    route, done = (parse_event(l) for l in out)
+    assert (route["event"], route["dest"], route["rows"], route["status"]) == (
+        "route", "DEN", 1, "ok")
+    assert done["event"] == "done" and done["rows"] == 1
+    assert parse_event("[1/95] SFO → DEN ✅") is None
+    assert parse_event(EVENT_PREFIX + "{not json") is None
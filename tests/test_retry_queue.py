@@ -0,0 +1,95 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gowild_fast
+import roundtrip_fast
+from retry_queue import Coverage, RetryQueue
+
+
+def test_deferred_routes_come_back_with_doubling_waits():
+    waits = []
+    coverage = Coverage()
+    retry = RetryQueue(max_attempts=3, base_delay=60, sleep=waits.append,
+                       coverage=coverage, label="2026-03-02")
+    seen = []
+    for batch in retry.rounds({"DEN": "Denver", "LAS": "Las Vegas", "MCO": "Orlando"}):
+        seen.append(list(batch))
+        for code, name in batch.items():
+            # LAS clears on its second try; MCO never does.
+            if code == "MCO" or (code == "LAS" and retry.attempts[code] < 2):
+                retry.defer(code, name)
+    assert seen == [["DEN", "LAS", "MCO"], ["LAS", "MCO"], ["MCO"]]
+    assert waits == [60, 120]
+    assert (retry.attempted, retry.succeeded, retry.retried) == (3, 2, 3)
+    assert retry.abandoned == {"MCO": "Orlando"}
+    assert coverage.abandoned == ["2026-03-02 MCO"]
+    assert retry.summary() == (
+        "Coverage: 2/3 routes succeeded, 3 retries, 1 abandoned (MCO)")
+
+
+def test_routes_no_longer_needed_are_neither_waited_for_nor_counted():
+    waits = []
+    retry = RetryQueue(max_attempts=3, base_delay=60, sleep=waits.append, coverage=None)
+    needed = {"DEN", "LAS"}
+    seen = []
+    for batch in retry.rounds({"DEN": 1, "LAS": 2, "MCO": 3}, keep=lambda k, v: k in needed):
+        seen.append(list(batch))
+        for code in batch:
+            if len(seen) == 1:
+                retry.defer(code)  # all three blocked; MCO is dropped by keep
+            elif code == "LAS":
+                retry.skip(code)   # DEN's result made LAS moot mid-round
+    assert seen == [["DEN", "LAS", "MCO"], ["DEN", "LAS"]]
+    assert (waits, retry.retried, retry.abandoned) == ([60], 1, {})
+
+    retry = RetryQueue(max_attempts=3, base_delay=60, sleep=waits.append, coverage=None)
+    for batch in retry.rounds({"DEN": 1}, keep=lambda k, v: False):
+        retry.defer("DEN")
+    assert (waits, retry.retried) == ([60], 0)  # no round left, so no wait
+
+
+def test_scan_routes_retries_rate_limited_routes(offline_scan):
+    calls = {}
+
+    def fake_fetch(origin, dest, date, session, base_url=None):
+        calls[dest] = calls.get(dest, 0) + 1
+        if dest == "LAS" and calls[dest] == 1:
+            return None, True
+        flight = {"isGoWildFareEnabled": True, "goWildFare": 29}
+        return {"journeys": [{"flights": [flight]}]}, False
+
+    offline_scan(fake_fetch)
+
+    dests = {"DEN": "Denver", "LAS": "Las Vegas", "MCO": "Orlando"}
+    results = gowild_fast.scan_routes("SFO", dests, "Mar%2002,%202026")
+    assert list(results) == ["DEN", "LAS", "MCO"]
+    assert calls == {"DEN": 1, "LAS": 2, "MCO": 1}
+
+
+def test_top_k_return_search_retries_rate_limited_legs(offline_scan, capsys):
+    calls = {}
+
+    def fake_fetch(origin, dest, date, session, base_url=None):
+        roundtrip_fast.ROUTE_CACHE.get(origin, dest, date, base_url)  # a page load
+        calls[origin] = calls.get(origin, 0) + 1
+        if origin == "DEN" and calls[origin] == 1:
+            return None, True
+        flight = {"isGoWildFareEnabled": True, "goWildFare": 19 if origin == "DEN" else 99}
+        return {"journeys": [{"flights": [flight]}]}, False
+
+    offline_scan(fake_fetch, roundtrip_fast)
+
+    outbound = {"2026-03-02": {
+        "DEN": {"name": "Denver", "best_price": 29.0, "count": 1},
+        "LAS": {"name": "Las Vegas", "best_price": 29.0, "count": 1},
+        "SFO": {"name": "San Francisco", "best_price": 19.0, "count": 1},
+    }}
+    names = {code: info["name"] for code, info in outbound["2026-03-02"].items()}
+    found = roundtrip_fast.search_return_top_k(outbound, ["2026-03-06"], names, None, 1)
+    assert found["2026-03-06"]["DEN"]["best_price"] == 19.0
+    assert calls == {"DEN": 2, "LAS": 1}  # SFO -> SFO is never a page load
+    out = capsys.readouterr().out
+    assert "Checked 3 of 3 return routes with 3 page loads" in out
+    assert "may be incomplete" not in out
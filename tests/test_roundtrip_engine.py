@@ -0,0 +1,162 @@
+import math
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import roundtrip_engine
+from roundtrip_engine import _top_k_pairs_py, top_roundtrips
+
+FIRST = date(2026, 3, 1)
+
+
+def results(rng, dests, days, density=0.5):
+    by_date = {}
+    for d in range(days):
+        day = (FIRST + timedelta(days=d)).isoformat()
+        by_date[day] = {
+            code: {"name": code, "best_price": float(rng.randint(19, 99)), "count": 1}
+            for code in dests
+            if rng.random() < density
+        }
+    return by_date
+
+
+def brute_force(out, ret, min_stay, max_stay):
+    trips = []
+    for od, odests in out.items():
+        for rd, rdests in ret.items():
+            stay = (date.fromisoformat(rd) - date.fromisoformat(od)).days
+            if stay < min_stay or (max_stay is not None and stay > max_stay):
+                continue
+            for code in odests:
+                if code in rdests:
+                    trips.append(odests[code]["best_price"] + rdests[code]["best_price"])
+    return sorted(trips)
+
+
+def test_matches_brute_force_with_stay_bounds():
+    rng = random.Random(1)
+    dests = [f"D{i}" for i in range(12)]
+    out, ret = results(rng, dests, 20), results(rng, dests, 20)
+    for k, lo, hi in ((None, 0, None), (10, 2, 5), (3, 1, 1)):
+        got = [t.total_price for t in top_roundtrips(out, ret, k, lo, hi)]
+        want = brute_force(out, ret, lo, hi)
+        assert got == (want if k is None else want[:k])
+
+
+def test_trip_fields_and_no_negative_stays():
+    out = {"2026-03-05": {"DEN": {"name": "Denver", "best_price": 19.0, "count": 2}}}
+    ret = {
+        "2026-03-01": {"DEN": {"name": "Denver", "best_price": 1.0, "count": 1}},
+        "2026-03-08": {"DEN": {"name": "Denver", "best_price": 29.0, "count": 1}},
+    }
+    (trip,) = top_roundtrips(out, ret)
+    assert trip == ("DEN", "2026-03-05", "2026-03-08", 19.0, 29.0, 48.0)
+
+
+def test_python_fallback_agrees_with_numpy():
+    if roundtrip_engine.np is None:
+        return
+    rng = random.Random(2)
+    grid = lambda: [[rng.choice([math.inf, rng.randint(19, 99)]) for _ in range(30)] for _ in range(8)]
+    out, ret = grid(), grid()
+    np = roundtrip_engine.np
+    fast = roundtrip_engine.top_k_pairs(np.array(out, dtype=float), np.array(ret, dtype=float), 7, 1, 9)
+    assert [t[0] for t in fast] == [t[0] for t in _top_k_pairs_py(out, ret, 7, 1, 9)]
+
+
+def test_ties_at_the_kth_total_break_by_row_day_stay():
+    if roundtrip_engine.np is None:
+        return
+    np = roundtrip_engine.np
+    rng = random.Random(5)
+    # Few distinct fares, so k cuts through a long run of equal totals.
+    out = [[rng.choice([19, 29]) for _ in range(12)] for _ in range(40)]
+    ret = [[rng.choice([19, 29]) for _ in range(12)] for _ in range(40)]
+    for k in (1, 5, 37, 200):
+        fast = roundtrip_engine.top_k_pairs(
+            np.array(out, dtype=float), np.array(ret, dtype=float), k, 1, 4)
+        assert fast == _top_k_pairs_py(out, ret, k, 1, 4)
+
+
+def test_lazy_return_search_keeps_top_k_with_fewer_fetches():
+    rng = random.Random(3)
+    dests = [f"D{i}" for i in range(30)]
+    out, ret = results(rng, dests, 4), results(rng, dests, 10)
+    calls = []
+
+    def fetch(code, day):
+        calls.append((code, day))
+        return ret[day].get(code)
+
+    lazy, fetched, candidates, unresolved = roundtrip_engine.lazy_return_search(
+        out, list(ret), fetch, 5, floor=19.0)
+    assert fetched == len(calls) < candidates and unresolved == []
+    assert top_roundtrips(out, lazy, 5) == top_roundtrips(out, ret, 5)
+
+
+def test_rate_limited_leg_is_unresolved_not_pruned():
+    rng = random.Random(4)
+    dests = [f"D{i}" for i in range(30)]
+    out, ret = results(rng, dests, 4), results(rng, dests, 10)
+    (best,) = top_roundtrips(out, ret, 1)
+    blocked = (best.dest, best.return_date)
+
+    def fetch(code, day):
+        return roundtrip_engine.DEFERRED if (code, day) == blocked else ret[day].get(code)
+
+    lazy, _, _, unresolved = roundtrip_engine.lazy_return_search(
+        out, list(ret), fetch, 5, floor=19.0)
+    assert blocked in unresolved
+    assert best.dest not in lazy[best.return_date]
+
+
+def test_deferred_legs_are_retried_in_retry_rounds():
+    from retry_queue import RetryQueue
+
+    rng = random.Random(4)
+    dests = [f"D{i}" for i in range(30)]
+    out, ret = results(rng, dests, 4), results(rng, dests, 10)
+    (best,) = top_roundtrips(out, ret, 1)
+    blocked = (best.dest, best.return_date)
+    tries = []
+
+    def fetch(code, day):
+        if (code, day) == blocked:
+            tries.append(day)
+            if len(tries) == 1:  # the captcha clears after one round
+                return roundtrip_engine.DEFERRED
+        return ret[day].get(code)
+
+    waits = []
+    retry = RetryQueue(max_attempts=3, base_delay=60, sleep=waits.append, coverage=None)
+    lazy, _, _, unresolved = roundtrip_engine.lazy_return_search(
+        out, list(ret), fetch, 5, floor=19.0, retry=retry)
+    assert (len(tries), waits, unresolved) == (2, [60], [])
+    assert top_roundtrips(out, lazy, 5) == top_roundtrips(out, ret, 5)
+    assert retry.abandoned == {}
+
+
+def test_retry_rounds_count_only_legs_fetched_again():
+    from retry_queue import RetryQueue
+
+    out = {"2026-03-02": {c: {"best_price": p} for c, p in (("X", 10.0), ("Y", 20.0), ("Z", 90.0))}}
+    fares = {"X": 11.0, "Z": 110.0}
+    tries = []
+
+    def fetch(code, day):
+        tries.append(code)
+        if code in ("X", "Y") and tries.count(code) == 1:
+            return roundtrip_engine.DEFERRED
+        return {"best_price": fares[code]}
+
+    waits = []
+    retry = RetryQueue(max_attempts=3, base_delay=60, sleep=waits.append, coverage=None)
+    _, _, _, unresolved = roundtrip_engine.lazy_return_search(
+        out, ["2026-03-06"], fetch, 1, floor=10.0, retry=retry)
+    # X's retry (21) rules out Y (bound 30) before Y is loaded again.
+    assert tries == ["X", "Y", "Z", "X"]
+    assert (waits, retry.retried, unresolved) == ([60], 1, [])
@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roundtrip_match import Leg, match_legs, match_roundtrips
+
+START = datetime(2026, 3, 1)
+
+
+def legs(rng, n):
+    out = []
+    for _ in range(n):
+        departs = START + timedelta(minutes=rng.randrange(0, 14 * 24 * 60, 15))
+        out.append(Leg(departs, departs + timedelta(hours=3), float(rng.randint(19, 99)), {}))
+    return out
+
+
+def brute_force(outs, ins, lo, hi):
+    best = {}
+    for back in ins:
+        fits = [o.price for o in outs
+                if lo <= back.departs - o.arrives and (hi is None or back.departs - o.arrives <= hi)]
+        if fits:
+            best[back.departs, back.price] = min(fits)
+    return sorted(best.items())
+
+
+def test_sweep_matches_brute_force():
+    rng = random.Random(4)
+    outs, ins = legs(rng, 200), legs(rng, 200)
+    for lo, hi in ((timedelta(0), None), (timedelta(hours=36), timedelta(days=4)),
+                   (timedelta(hours=2), timedelta(hours=10))):
+        got = sorted(((b.departs, b.price), o.price) for o, b in match_legs(outs, ins, lo, hi))
+        assert got == brute_force(outs, ins, lo, hi)
+
+
+def flight(dep, arr, price):
+    return {"isGoWildFareEnabled": True, "goWildFare": price,
+            "legs": [{"departureDate": dep, "arrivalDate": arr}]}
+
+
+def test_match_roundtrips_enforces_ground_time():
+    out = {"2026-03-06": {"DEN": {"flights": [
+        flight("2026-03-06T06:00:00", "2026-03-06T09:30:00", 29.0),
+        flight("2026-03-06T20:00:00", "2026-03-06T23:30:00", 19.0),
+    ]}}}
+    ret = {"2026-03-08": {"DEN": {"flights": [
+        flight("2026-03-08T07:00:00", "2026-03-08T08:30:00", 39.0),
+        flight("2026-03-08T18:00:00", "2026-03-08T19:30:00", 49.0),
+    ]}}}
+    trips = match_roundtrips(out, ret, min_ground=timedelta(hours=36))
+    assert [(t.outbound.price, t.inbound.price, t.ground) for t in trips] == [
+        (29.0, 39.0, timedelta(hours=45, minutes=30)),
+        (19.0, 49.0, timedelta(hours=42, minutes=30)),
+    ]
+    assert match_roundtrips(out, ret, min_ground=timedelta(hours=60)) == []
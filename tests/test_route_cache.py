@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_cache import RouteCache
+
+DATA = {"journeys": [{"flights": [{"isGoWildFareEnabled": True}]}]}
+
+
+def test_round_trip_and_date_forms_share_a_key(tmp_path):
+    cache = RouteCache(str(tmp_path), ttl=60, max_bytes=10**6, enabled=True)
+    assert cache.get("SFO", "DEN", "2026-03-02") is None
+    cache.put("SFO", "DEN", "Mar%2002,%202026", DATA)
+    assert cache.contains("sfo", "den", "Mar 2, 2026")
+    assert cache.get("SFO", "DEN", "2026-03-02") == DATA
+    assert (cache.hits, cache.misses) == (1, 1)
+    # A different booking host is a different entry.
+    assert cache.get("SFO", "DEN", "2026-03-02", base_url="http://127.0.0.1:1") is None
+
+
+def test_stale_entries_miss(tmp_path):
+    cache = RouteCache(str(tmp_path), ttl=60, max_bytes=10**6, enabled=True)
+    cache.put("SFO", "DEN", "2026-03-02", DATA)
+    path = cache._path(cache.key("SFO", "DEN", "2026-03-02"))
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert not cache.contains("SFO", "DEN", "2026-03-02")
+    assert cache.get("SFO", "DEN", "2026-03-02") is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = RouteCache(str(tmp_path), ttl=3600, max_bytes=10**6, enabled=True)
+    for i, dest in enumerate(("DEN", "LAS", "MCO")):
+        cache.put("SFO", dest, "2026-03-02", DATA)
+        path = cache._path(cache.key("SFO", dest, "2026-03-02"))
+        os.utime(path, (time.time() - 100 + i, time.time()))
+    size = os.path.getsize(path)
+    cache.max_bytes = size * 2.5
+    cache.evict()
+    assert not cache.contains("SFO", "DEN", "2026-03-02")
+    assert cache.contains("SFO", "MCO", "2026-03-02")
+
+
+def test_disabled_cache_never_stores(tmp_path):
+    cache = RouteCache(str(tmp_path), ttl=60, max_bytes=10**6, enabled=False)
+    cache.put("SFO", "DEN", "2026-03-02", DATA)
+    assert cache.get("SFO", "DEN", "2026-03-02") is None
+    assert cache.summary() == "Route cache: disabled"
@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_index import RouteIndex, has_flights
+
+SERVED = {"journeys": [{"flights": [{"isGoWildFareEnabled": False}]}]}
+EMPTY = {"journeys": [{"flights": []}]}
+DESTS = {"SFO": "San Francisco", "DEN": "Denver", "BQN": "Aguadilla"}
+
+
+def _index(path, **kw):
+    return RouteIndex(path=str(path), enabled=True, dead_runs=3, reprobe_days=7, **kw)
+
+
+def _run(path, outcomes):
+    """One scanner process: observe each route, save at exit."""
+    index = _index(path)
+    for dest, data in outcomes:
+        index.observe("SFO", dest, data)
+    index.save()
+
+
+def test_self_routes_are_always_pruned(tmp_path, capsys):
+    index = RouteIndex(path=str(tmp_path / "idx.json"), enabled=False)
+    assert list(index.plan("SFO", DESTS)) == ["DEN", "BQN"]
+    assert "3 planned, 1 pruned (1 self, 0 no service) → 2 to scan" in capsys.readouterr().out
+
+
+def test_streak_of_empty_runs_prunes_until_reprobe(tmp_path):
+    path = tmp_path / "idx.json"
+    for _ in range(2):
+        _run(path, [("DEN", SERVED), ("BQN", EMPTY), ("BQN", None)])
+    assert list(_index(path).plan("SFO", DESTS, quiet=True)) == ["DEN", "BQN"]
+
+    _run(path, [("BQN", EMPTY)])
+    index = _index(path)
+    assert list(index.plan("SFO", DESTS, quiet=True)) == ["DEN"]
+    assert index.summary() == "Route index: 3 routes planned, 2 pruned (1 self, 1 no service)"
+    assert index.pruned_routes() == ["SFO>BQN"]
+    # The same direction only: BQN -> SFO return legs are still planned.
+    assert list(index.plan("SFO", {"BQN": "Aguadilla"}, inbound=True, quiet=True)) == ["BQN"]
+    # Due for a re-probe a week after it was last looked at.
+    assert not index.dead("SFO", "BQN", now=time.time() + 8 * 86400)
+
+
+def test_service_on_any_date_resets_the_streak(tmp_path):
+    path = tmp_path / "idx.json"
+    for _ in range(2):
+        _run(path, [("BQN", EMPTY)])
+    # A range scan: empty on most dates, served on one.
+    _run(path, [("BQN", EMPTY), ("BQN", SERVED), ("BQN", EMPTY)])
+    _run(path, [("BQN", EMPTY)])
+    assert not _index(path).dead("SFO", "BQN")
+
+
+def test_has_flights():
+    assert has_flights(SERVED) is True
+    assert has_flights(EMPTY) is False
+    assert has_flights(None) is None and has_flights({"journeys": []}) is None
+
+
+def test_other_hosts_neither_feed_nor_use_the_index(tmp_path):
+    path = tmp_path / "idx.json"
+    for _ in range(3):
+        _run(path, [("BQN", EMPTY)])
+    standin = "http://127.0.0.1:8765"
+    index = _index(path)
+    assert list(index.plan("SFO", DESTS, quiet=True)) == ["DEN"]
+    assert list(index.plan("SFO", DESTS, quiet=True, base_url=standin)) == ["DEN", "BQN"]
+    assert not index.skip("SFO", "BQN", standin)
+
+    index.observe("SFO", "BQN", SERVED, standin)
+    index.observe("SFO", "DEN", EMPTY, standin)
+    index.save()
+    assert _index(path).pruned_routes() == ["SFO>BQN"]
+    assert "SFO>DEN" not in json.loads(path.read_text())
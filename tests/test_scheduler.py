@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fare_store import FareStore
+from scheduler import Scheduler, deadline_from_env, route_values
+
+Task = namedtuple("Task", "origin dest")
+
+
+def _flight(price, fare="goWildFare"):
+    return {fare: price, "isGoWildFareEnabled": fare == "goWildFare", "legs": [{}]}
+
+
+def test_history_ranks_routes_by_expected_value(tmp_path):
+    store = FareStore(str(tmp_path / "fares.sqlite3"), enabled=True, scanner="report")
+    for run in range(4):
+        store.record("SFO", "DEN", "2026-03-02", [_flight(29)])           # every run, cheap
+        if run == 0:
+            store.record("SFO", "MCO", "2026-03-02", [_flight(19)])       # once, cheaper
+        store.record("SFO", "ATL", "2026-03-02", [_flight(89, "discountDenFare")])
+        store.close()
+    runs, stats = store.route_stats()
+    assert runs == 4
+    assert stats[("SFO", "DEN")] == (4, 29.0)
+    assert stats[("SFO", "ATL")] == (0, None)
+
+    sched = Scheduler(route_values(stats, runs))
+    tasks = [Task("SFO", d) for d in ("ATL", "LAS", "MCO", "DEN")]
+    assert [t.dest for t in sched.order(tasks)] == ["DEN", "LAS", "MCO", "ATL"]
+
+
+def test_routes_scanned_without_fares_rank_below_proven_ones(tmp_path):
+    store = FareStore(str(tmp_path / "fares.sqlite3"), enabled=True, scanner="report")
+    for run in range(10):
+        if run == 0:
+            store.record("SFO", "MCO", "2026-03-02", [_flight(149)])   # rare, dear hit
+        else:
+            store.record("SFO", "MCO", "2026-03-02", [])
+        store.record("SFO", "BQN", "2026-03-02", [])                    # never any fare
+        store.close()
+    runs, stats = store.route_stats()
+    assert stats[("SFO", "BQN")] == (0, None)
+
+    values = route_values(stats, runs)
+    assert values[("SFO", "BQN")] < values[("SFO", "MCO")] < values[None]
+    tasks = [Task("SFO", d) for d in ("BQN", "MCO", "LAS")]
+    assert [t.dest for t in Scheduler(values).order(tasks)] == ["LAS", "MCO", "BQN"]
+
+
+def test_deadline_stops_new_routes():
+    sched = Scheduler(deadline=time.time() + 60, reserve=120)
+    sched.order([Task("SFO", "DEN"), Task("SFO", "LAS")])
+    assert not sched.take() and sched.expired
+    assert sched.coverage().endswith("0/2 routes checked by "
+                                     f"{datetime.fromtimestamp(sched.deadline):%H:%M}, "
+                                     "2 lowest-value routes skipped at the deadline")
+
+    open_ended = Scheduler()
+    open_ended.order([Task("SFO", "DEN")])
+    assert open_ended.take()
+    assert open_ended.coverage() == "Coverage: 1/1 routes checked"
+
+
+def test_deadline_from_env(monkeypatch):
+    monkeypatch.setenv("DEAL_DEADLINE", "06:00")
+    at = deadline_from_env(datetime(2026, 3, 3, 0, 1))
+    assert datetime.fromtimestamp(at) == datetime(2026, 3, 3, 6, 0)
+    at = deadline_from_env(datetime(2026, 3, 3, 7, 0))
+    assert datetime.fromtimestamp(at) == datetime(2026, 3, 4, 6, 0)
+    monkeypatch.delenv("DEAL_DEADLINE")
+    monkeypatch.setenv("DEAL_BUDGET_MIN", "90")
+    at = deadline_from_env(datetime(2026, 3, 3, 0, 1))
+    assert datetime.fromtimestamp(at) == datetime(2026, 3, 3, 1, 31)
@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gowild_fast
+from sessions import WarmSessions
+
+
+def test_warm_up_happens_once_and_reuse_is_reported():
+    ticks = iter([0.0, 9.0, 100.0, 104.0])
+    sessions = WarmSessions(clock=lambda: next(ticks))
+    built = []
+
+    def factory():
+        built.append(object())
+        return built[-1]
+
+    first = sessions.get(factory)
+    assert sessions.get(factory) is first and sessions.get(factory) is first
+    sessions.reset(factory)
+    assert sessions.get(factory) is not first
+    assert (len(built), sessions.warmups, sessions.reused) == (2, 2, 2)
+    assert sessions.summary() == (
+        "Sessions: 2 warm-up(s) in 13s, 2 reused (~13s of warm-up saved)")
+
+
+def test_multi_date_scan_warms_up_one_session(offline_scan, monkeypatch):
+    created, used = [], set()
+
+    def fake_session():
+        created.append(object())
+        return created[-1]
+
+    def fake_fetch(origin, dest, date, session, base_url=None):
+        used.add(id(session))
+        return {"journeys": [{"flights": []}]}, False
+
+    sessions = WarmSessions()
+    monkeypatch.setattr(gowild_fast, "SESSIONS", sessions)
+    monkeypatch.setattr(gowild_fast, "create_session", fake_session)
+    offline_scan(fake_fetch)
+
+    for date in ("Mar%2002,%202026", "Mar%2003,%202026", "Mar%2004,%202026"):
+        gowild_fast.scan_routes("SFO", {"DEN": "Denver", "LAS": "Las Vegas"}, date)
+    assert len(created) == 1 and used == {id(created[0])}
+    assert (sessions.warmups, sessions.reused) == (1, 2)